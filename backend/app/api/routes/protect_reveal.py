@@ -1,11 +1,33 @@
 """Protect/Reveal API routes."""
+import asyncio
 import logging
-from fastapi import APIRouter, Depends
+from functools import lru_cache
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import List, Optional, Any, Dict
-from app.services.protect_reveal.client import ProtectRevealClient, APIError
+from typing import List, Optional, Any, Dict, Tuple
+from app.services.protect_reveal.async_client import AsyncProtectRevealClient
+from app.services.protect_reveal.cache import ProtectCacheSet
+from app.services.protect_reveal.bulk import ChunkOutcome, fan_out_bulk, merge_values
+from app.services.protect_reveal.client import APIError
+from app.services.protect_reveal.coalescer import BulkCoalescer
+from app.services.protect_reveal.endpoints import EndpointPool, parse_endpoints
+from app.services.protect_reveal.cli import Config as LoadConfig
+from app.services.protect_reveal.health import HealthProber, check_health
+from app.services.protect_reveal.jobs import JobLimitError, JobManager, LoadJob
+from app.services.protect_reveal.jsoncodec import dumps
+from app.services.protect_reveal.filestream import (
+    FILE_FORMATS,
+    FileTransformError,
+    format_from_filename,
+    open_file_transform,
+)
+from app.services.protect_reveal.registry import AsyncClientRegistry
+from app.services.protect_reveal.resilience import BreakerSet, CircuitOpenError, RetryPolicy
 from app.core.config import get_settings
-from app.core.exceptions import CRDPConnectionError, CRDPAPIError, CRDPTimeoutError
+from app.core.metrics import CRDP_ERRORS, UpstreamMetrics
+from app.core.tracing import span, timed, traced_endpoint
+from app.core.exceptions import CRDPConnectionError, CRDPAPIError, CRDPTimeoutError, ValidationError
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -61,34 +83,130 @@ class RevealResponse(BaseModel):
     debug: Optional[Dict[str, Any]] = None
 
 
+class BulkChunkError(BaseModel):
+    """Failure of one upstream chunk of a bulk request."""
+    chunk: int
+    offset: int
+    count: int
+    status_code: Optional[int] = None
+    error: str
+
+
 class ProtectBulkResponse(BaseModel):
     """Bulk protect response."""
     status_code: int
-    protected_data_array: Optional[List[str]] = None
+    # items of failed chunks are null when other chunks succeeded
+    protected_data_array: Optional[List[Optional[str]]] = None
     error: Optional[str] = None
+    errors: Optional[List[BulkChunkError]] = None
     debug: Optional[Dict[str, Any]] = None
 
 
 class RevealBulkResponse(BaseModel):
     """Bulk reveal response."""
     status_code: int
-    data_array: Optional[List[str]] = None
+    data_array: Optional[List[Optional[str]]] = None
     error: Optional[str] = None
+    errors: Optional[List[BulkChunkError]] = None
     debug: Optional[Dict[str, Any]] = None
 
 
-def get_client(policy: Optional[str] = None, host: Optional[str] = None, port: Optional[int] = None) -> ProtectRevealClient:
-    """Create ProtectRevealClient with settings."""
+@lru_cache
+def get_protect_caches() -> Optional[ProtectCacheSet]:
+    """Process-wide protect result caches, or None when CRDP_PROTECT_CACHE_ENABLED is off."""
+    settings = get_settings()
+    if not settings.CRDP_PROTECT_CACHE_ENABLED:
+        return None
+    return ProtectCacheSet(
+        max_entries=settings.CRDP_PROTECT_CACHE_MAX_ENTRIES,
+        ttl=settings.CRDP_PROTECT_CACHE_TTL,
+        secret=settings.CRDP_PROTECT_CACHE_KEY.encode("utf-8") or None,
+    )
+
+
+@lru_cache
+def get_breakers() -> Optional[BreakerSet]:
+    """Process-wide per-endpoint circuit breakers, or None when CRDP_BREAKER_ENABLED is off."""
+    settings = get_settings()
+    if not settings.CRDP_BREAKER_ENABLED:
+        return None
+    return BreakerSet(
+        failure_threshold=settings.CRDP_BREAKER_FAILURE_THRESHOLD,
+        reset_timeout=settings.CRDP_BREAKER_RESET_TIMEOUT,
+    )
+
+
+@lru_cache
+def get_endpoint_pool() -> Optional[EndpointPool]:
+    """Process-wide CRDP node pool, or None when CRDP_API_ENDPOINTS is empty."""
+    settings = get_settings()
+    endpoints = parse_endpoints(settings.CRDP_API_ENDPOINTS, settings.CRDP_API_PORT)
+    if not endpoints:
+        return None
+    return EndpointPool(
+        endpoints,
+        strategy=settings.CRDP_LB_STRATEGY,
+        eject_after=settings.CRDP_LB_EJECT_AFTER,
+        eject_seconds=settings.CRDP_LB_EJECT_SECONDS,
+        aliases=[(settings.CRDP_API_HOST, settings.CRDP_API_PORT)],
+    )
+
+
+@lru_cache
+def get_client_registry() -> AsyncClientRegistry:
+    """Process-wide registry of pooled async CRDP clients."""
+    settings = get_settings()
+    return AsyncClientRegistry(
+        max_clients=settings.CRDP_CLIENT_MAX_CLIENTS,
+        idle_ttl=settings.CRDP_CLIENT_IDLE_TTL,
+        pool_maxsize=settings.CRDP_POOL_MAXSIZE,
+        protect_caches=get_protect_caches(),
+        breakers=get_breakers(),
+        retry=RetryPolicy(
+            max_retries=settings.CRDP_RETRY_MAX,
+            base_delay=settings.CRDP_RETRY_BASE_DELAY,
+            max_delay=settings.CRDP_RETRY_MAX_DELAY,
+            retry_unsafe=settings.CRDP_RETRY_UNSAFE,
+        ) if settings.CRDP_RETRY_MAX > 0 else None,
+        endpoint_pool=get_endpoint_pool(),
+        metrics=UpstreamMetrics() if settings.CRDP_METRICS_ENABLED else None,
+    )
+
+
+@lru_cache
+def get_coalescer() -> Optional[BulkCoalescer]:
+    """Process-wide micro-batcher for single-item calls, or None when CRDP_COALESCE_ENABLED is off."""
     settings = get_settings()
-    return ProtectRevealClient(
+    if not settings.CRDP_COALESCE_ENABLED:
+        return None
+    return BulkCoalescer(
+        max_batch=settings.CRDP_COALESCE_MAX_BATCH,
+        window_s=settings.CRDP_COALESCE_WINDOW_MS / 1000.0,
+    )
+
+
+def debug_requested(
+    http_request: Request,
+    debug: bool = Query(False, description="Echo upstream URL/payload/response/headers in the debug field"),
+) -> bool:
+    """Whether the caller asked for the debug echo (``?debug=true`` or an ``X-CRDP-Debug: 1`` header)."""
+    if debug:
+        return True
+    return http_request.headers.get("x-crdp-debug", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def get_client(policy: Optional[str] = None, host: Optional[str] = None, port: Optional[int] = None) -> AsyncProtectRevealClient:
+    """Return a pooled AsyncProtectRevealClient for the given (or default) settings."""
+    settings = get_settings()
+    return get_client_registry().get(
         host=host or settings.CRDP_API_HOST,
         port=port or settings.CRDP_API_PORT,
         policy=policy or settings.CRDP_PROTECTION_POLICY,
-        timeout=10
+        timeout=10,
     )
 
 
-def _build_client(policy: Optional[str], host: Optional[str], port: Optional[int]) -> ProtectRevealClient:
+def _build_client(policy: Optional[str], host: Optional[str], port: Optional[int]) -> AsyncProtectRevealClient:
     """Helper to preserve call signature used in tests: when host/port are not provided,
     call get_client with only the policy positional argument (so mocks expecting
     get_client('CUSTOM_POLICY') still pass)."""
@@ -98,13 +216,15 @@ def _build_client(policy: Optional[str], host: Optional[str], port: Optional[int
 
 
 @router.post("/protect", response_model=ProtectResponse, tags=["Protect/Reveal"])
-async def protect_data(request: ProtectRequest):
+@traced_endpoint
+async def protect_data(request: ProtectRequest, debug_echo: bool = Depends(debug_requested)):
     """
     Protect a single data item.
     
-    Returns a protected token that can be later revealed.
+    Returns a protected token that can be later revealed. The ``debug`` echo is only
+    included when requested (``?debug=true`` or ``X-CRDP-Debug: 1``).
     """
-    logger.info(f"Protect request received for data length: {len(request.data)}")
+    logger.info("Protect request received for data length: %d", len(request.data))
     client = _build_client(request.policy, request.host, request.port)
     
     payload = {
@@ -113,26 +233,29 @@ async def protect_data(request: ProtectRequest):
     }
     
     try:
-        response = client.post_json(client.protect_url, payload)
+        # a debug call goes out on its own so the echo shows its own request, not a shared batch
+        coalescer = None if debug_echo else get_coalescer()
+        with span("upstream"):
+            if coalescer is not None:
+                response = await coalescer.protect(client, request.data)
+            elif get_protect_caches() is not None:
+                response = await client.protect(request.data, trace=debug_echo)
+            else:
+                response = await client.post_json(client.protect_url, payload, trace=debug_echo)
         
-        debug = {
-            "url": response.request_url,
-            "request": payload,
-            "status_code": response.status_code,
-            "response": response.body,
-            "headers": response.request_headers,
-        }
+        debug = _call_debug(response, payload) if debug_echo else None
 
         if not response.is_success:
-            logger.warning(f"Protect failed: {response.status_code} - {response.body}")
+            logger.warning("Protect failed: %s - %s", response.status_code, response.body)
             return ProtectResponse(
                 status_code=response.status_code or 500,
                 error=str(response.body) if response.body else "Protect failed",
                 debug=debug,
             )
         
-        protected_token = client.extract_protected_from_protect_response(response)
-        logger.info(f"Protect successful: {protected_token[:20]}...")
+        with span("parse"):
+            protected_token = client.extract_protected_from_protect_response(response)
+        logger.debug("Protect successful: token length %d", len(protected_token or ""))
         
         return ProtectResponse(
             status_code=response.status_code or 200,
@@ -140,8 +263,11 @@ async def protect_data(request: ProtectRequest):
             debug=debug,
         )
         
+    except CircuitOpenError as e:
+        logger.warning("CRDP circuit open during protect: %s", e)
+        raise CRDPConnectionError(str(e))
     except APIError as e:
-        logger.error(f"CRDP API error during protect: {str(e)}")
+        logger.error("CRDP API error during protect: %s", e)
         if "connection" in str(e).lower() or "refused" in str(e).lower():
             raise CRDPConnectionError(f"Failed to connect to CRDP server: {str(e)}")
         elif "timeout" in str(e).lower():
@@ -149,18 +275,19 @@ async def protect_data(request: ProtectRequest):
         else:
             raise CRDPAPIError(str(e), status_code=e.status_code or 500)
     except Exception as e:
-        logger.exception(f"Unexpected error during protect: {str(e)}")
+        logger.exception("Unexpected error during protect: %s", e)
         raise CRDPAPIError(f"Unexpected error: {str(e)}")
 
 
 @router.post("/reveal", response_model=RevealResponse, tags=["Protect/Reveal"])
-async def reveal_data(request: RevealRequest):
+@traced_endpoint
+async def reveal_data(request: RevealRequest, debug_echo: bool = Depends(debug_requested)):
     """
     Reveal a protected token back to original data.
     
-    Optionally include username for audit trail.
+    Optionally include username for audit trail. The ``debug`` echo is opt-in as for /protect.
     """
-    logger.info(f"Reveal request received for protected_data length: {len(request.protected_data)}")
+    logger.info("Reveal request received for protected_data length: %d", len(request.protected_data))
     client = _build_client(request.policy, request.host, request.port)
     
     payload = {
@@ -171,26 +298,27 @@ async def reveal_data(request: RevealRequest):
         payload["username"] = request.username
     
     try:
-        response = client.post_json(client.reveal_url, payload)
+        # a debug call goes out on its own so the echo shows its own request, not a shared batch
+        coalescer = None if debug_echo else get_coalescer()
+        with span("upstream"):
+            if coalescer is not None:
+                response = await coalescer.reveal(client, request.protected_data, username=request.username)
+            else:
+                response = await client.post_json(client.reveal_url, payload, trace=debug_echo)
         
-        debug = {
-            "url": response.request_url,
-            "request": payload,
-            "status_code": response.status_code,
-            "response": response.body,
-            "headers": response.request_headers,
-        }
+        debug = _call_debug(response, payload) if debug_echo else None
 
         if not response.is_success:
-            logger.warning(f"Reveal failed: {response.status_code} - {response.body}")
+            logger.warning("Reveal failed: %s - %s", response.status_code, response.body)
             return RevealResponse(
                 status_code=response.status_code or 500,
                 error=str(response.body) if response.body else "Reveal failed",
                 debug=debug,
             )
         
-        restored = client.extract_restored_from_reveal_response(response)
-        logger.info(f"Reveal successful: {restored[:20]}...")
+        with span("parse"):
+            restored = client.extract_restored_from_reveal_response(response)
+        logger.debug("Reveal successful: data length %d", len(restored or ""))
         
         return RevealResponse(
             status_code=response.status_code or 200,
@@ -198,8 +326,11 @@ async def reveal_data(request: RevealRequest):
             debug=debug,
         )
         
+    except CircuitOpenError as e:
+        logger.warning("CRDP circuit open during reveal: %s", e)
+        raise CRDPConnectionError(str(e))
     except APIError as e:
-        logger.error(f"CRDP API error during reveal: {str(e)}")
+        logger.error("CRDP API error during reveal: %s", e)
         if "connection" in str(e).lower() or "refused" in str(e).lower():
             raise CRDPConnectionError(f"Failed to connect to CRDP server: {str(e)}")
         elif "timeout" in str(e).lower():
@@ -207,151 +338,353 @@ async def reveal_data(request: RevealRequest):
         else:
             raise CRDPAPIError(str(e), status_code=e.status_code or 500)
     except Exception as e:
-        logger.exception(f"Unexpected error during reveal: {str(e)}")
+        logger.exception("Unexpected error during reveal: %s", e)
         raise CRDPAPIError(f"Unexpected error: {str(e)}")
 
 
+def _call_debug(response: Any, payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "url": response.request_url,
+        "request": payload,
+        "status_code": response.status_code,
+        "response": response.body,
+        "headers": response.request_headers,
+    }
+
+
+def _chunk_debug(outcome: ChunkOutcome, request: Dict[str, Any]) -> Dict[str, Any]:
+    response = outcome.response
+    return {
+        "url": response.request_url if response is not None else None,
+        "request": request,
+        "status_code": outcome.status_code,
+        "response": response.body if response is not None else outcome.error,
+        "headers": response.request_headers if response is not None else None,
+    }
+
+
+def _bulk_outcome(
+    outcomes: List[ChunkOutcome],
+    chunk_request: Any,
+    debug: bool = False,
+) -> Dict[str, Any]:
+    """Merge chunk outcomes into the bulk response fields (status_code, values, error(s), debug).
+
+    The per-chunk debug echo is only built when ``debug`` is set.
+
+    Raises the chunk's APIError when every chunk failed that way, as a single call did.
+    """
+    failed = [o for o in outcomes if not o.ok]
+    if failed and all(o.exception is not None for o in outcomes):
+        raise failed[0].exception
+
+    result: Dict[str, Any] = {"debug": None}
+    if debug:
+        chunk_debugs = [_chunk_debug(o, chunk_request(o.items)) for o in outcomes]
+        result["debug"] = chunk_debugs[0] if len(outcomes) == 1 else {
+            "chunk_size": len(outcomes[0].items),
+            "chunks": chunk_debugs,
+        }
+    if not failed:
+        result["status_code"] = outcomes[0].status_code or 200
+        result["values"] = merge_values(outcomes)
+        return result
+
+    # failed chunks are CRDP errors the client sees even when the response is a 207
+    CRDP_ERRORS.labels("BulkChunkError").inc(len(failed))
+    result["errors"] = [
+        BulkChunkError(chunk=o.index, offset=o.offset, count=len(o.items), status_code=o.status_code, error=o.error)
+        for o in failed
+    ]
+    if len(failed) == len(outcomes):
+        first = failed[0]
+        result["status_code"] = first.status_code or 500
+        result["error"] = first.error
+    else:
+        # partial success: keep the values of the chunks that worked
+        result["status_code"] = 207
+        result["error"] = f"{len(failed)} of {len(outcomes)} chunks failed"
+        result["values"] = merge_values(outcomes)
+    return result
+
+
 @router.post("/protect-bulk", response_model=ProtectBulkResponse, tags=["Protect/Reveal"])
-async def protect_bulk(request: ProtectBulkRequest):
+@traced_endpoint
+async def protect_bulk(request: ProtectBulkRequest, debug_echo: bool = Depends(debug_requested)):
     """
     Protect multiple data items in a single request.
     
-    More efficient than multiple individual protect calls.
+    More efficient than multiple individual protect calls. Large arrays are split into
+    CRDP_BULK_CHUNK_SIZE chunks sent with up to CRDP_BULK_CONCURRENCY calls in flight;
+    results keep the input order and failed chunks are listed in ``errors``.
+    The ``debug`` echo is opt-in as for /protect.
     """
     client = _build_client(request.policy, request.host, request.port)
+    settings = get_settings()
     
     try:
-        response = client.protect_bulk(request.data_array)
-        
-        debug = {
-            "url": response.request_url,
-            "request": {"protection_policy_name": client.policy, "data_array": request.data_array},
-            "status_code": response.status_code,
-            "response": response.body,
-            "headers": response.request_headers,
-        }
-
-        if not response.is_success:
-            return ProtectBulkResponse(
-                status_code=response.status_code or 500,
-                error=str(response.body) if response.body else "Bulk protect failed",
-                debug=debug,
+        # upstream is the fan-out's wall time minus the per-chunk parse time recorded inside it
+        with span("upstream"):
+            outcomes = await fan_out_bulk(
+                request.data_array,
+                lambda items: client.protect_bulk(items, trace=debug_echo),
+                timed(client.extract_protected_list_from_protect_response, "parse"),
+                chunk_size=settings.CRDP_BULK_CHUNK_SIZE,
+                concurrency=settings.CRDP_BULK_CONCURRENCY,
             )
-        
-        protected_tokens = client.extract_protected_list_from_protect_response(response)
+        result = _bulk_outcome(
+            outcomes,
+            lambda items: {"protection_policy_name": client.policy, "data_array": items},
+            debug=debug_echo,
+        )
         
         return ProtectBulkResponse(
-            status_code=response.status_code or 200,
-            protected_data_array=protected_tokens,
-            debug=debug,
+            status_code=result["status_code"],
+            protected_data_array=result.get("values"),
+            error=result.get("error"),
+            errors=result.get("errors"),
+            debug=result["debug"],
         )
         
     except APIError as e:
+        CRDP_ERRORS.labels("APIError").inc()
         raise HTTPException(status_code=e.status_code or 500, detail=str(e))
     except Exception as e:
+        CRDP_ERRORS.labels(type(e).__name__).inc()
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 
 @router.post("/reveal-bulk", response_model=RevealBulkResponse, tags=["Protect/Reveal"])
-async def reveal_bulk(request: RevealBulkRequest):
+@traced_endpoint
+async def reveal_bulk(request: RevealBulkRequest, debug_echo: bool = Depends(debug_requested)):
     """
     Reveal multiple protected tokens in a single request.
     
-    More efficient than multiple individual reveal calls.
-    Optionally include username for audit trail.
+    More efficient than multiple individual reveal calls. Chunked and fanned out
+    like /protect-bulk. Optionally include username for audit trail.
     """
     client = _build_client(request.policy, request.host, request.port)
+    settings = get_settings()
     
     try:
-        response = client.reveal_bulk(request.protected_data_array, username=request.username)
-        
-        debug = {
-            "url": response.request_url,
-            "request": {"protection_policy_name": client.policy, "protected_data_array": request.protected_data_array, **({"username": request.username} if request.username else {})},
-            "status_code": response.status_code,
-            "response": response.body,
-            "headers": response.request_headers,
-        }
-
-        if not response.is_success:
-            return RevealBulkResponse(
-                status_code=response.status_code or 500,
-                error=str(response.body) if response.body else "Bulk reveal failed",
-                debug=debug,
+        with span("upstream"):
+            outcomes = await fan_out_bulk(
+                request.protected_data_array,
+                lambda items: client.reveal_bulk(items, username=request.username, trace=debug_echo),
+                timed(client.extract_restored_list_from_reveal_response, "parse"),
+                chunk_size=settings.CRDP_BULK_CHUNK_SIZE,
+                concurrency=settings.CRDP_BULK_CONCURRENCY,
             )
-        
-        restored_data = client.extract_restored_list_from_reveal_response(response)
+        result = _bulk_outcome(
+            outcomes,
+            lambda items: {"protection_policy_name": client.policy, "protected_data_array": items, **({"username": request.username} if request.username else {})},
+            debug=debug_echo,
+        )
         
         return RevealBulkResponse(
-            status_code=response.status_code or 200,
-            data_array=restored_data,
-            debug=debug,
+            status_code=result["status_code"],
+            data_array=result.get("values"),
+            error=result.get("error"),
+            errors=result.get("errors"),
+            debug=result["debug"],
         )
         
     except APIError as e:
+        CRDP_ERRORS.labels("APIError").inc()
         raise HTTPException(status_code=e.status_code or 500, detail=str(e))
     except Exception as e:
+        CRDP_ERRORS.labels(type(e).__name__).inc()
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 
-@router.get("/health", tags=["Protect/Reveal"])
-async def health_check(policy: Optional[str] = None, host: Optional[str] = None, port: Optional[int] = None, healthz_port: Optional[int] = None):
-    """
-    Health check endpoint.
+class DuplexStreamingResponse(StreamingResponse):
+    """StreamingResponse that leaves ``receive`` to the body iterator.
 
-    - Attempts a lightweight CRDP call (protect with sample data) to verify connectivity.
-    - Returns debug steps so the UI can show a progress log.
-    - Accepts optional overrides via query params: policy, host, port.
+    The stock class listens for client disconnects on ``receive`` while streaming,
+    which would swallow request body chunks still being read by the iterator.
     """
-    settings = get_settings()
 
-    # Build client with possible overrides
-    client = ProtectRevealClient(
-        host=host or settings.CRDP_API_HOST,
-        port=port or settings.CRDP_API_PORT,  # protect/reveal port
-        policy=policy or settings.CRDP_PROTECTION_POLICY,
-        timeout=5,
-        healthz_port=healthz_port or getattr(settings, "CRDP_HEALTHZ_PORT", None),  # healthz port (defaults to settings)
-    )
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
 
-    steps: list[dict] = []
+_FILE_MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
 
-    # Step 1: CRDP healthz (GET)
+
+async def _counting_errors(body):
+    """Pass the file stream through, counting an upstream failure that cuts it short."""
     try:
-        resp = client.healthz()
-        steps.append({
-            "stage": "healthz",
-            "method": "GET",
-            "url": resp.request_url,
-            "status_code": resp.status_code,
-            "response": resp.body,
-            "headers": resp.request_headers,
-        })
-        ok_get = resp.is_success
-    except Exception as e:
-        steps.append({"stage": "healthz", "method": "GET", "error": str(e)})
-        ok_get = False
+        async for part in body:
+            yield part
+    except FileTransformError:
+        CRDP_ERRORS.labels("FileTransformError").inc()
+        raise
+
+
+@router.post("/transform-file", tags=["Protect/Reveal"])
+async def transform_file(
+    request: Request,
+    columns: str = Query(..., description="Comma-separated CSV header names / NDJSON field names to transform"),
+    operation: str = Query("protect", description="protect or reveal"),
+    format: Optional[str] = Query(None, description="csv or ndjson (defaults to the filename extension or Content-Type)"),
+    filename: Optional[str] = Query(None, description="Original file name, used for the format and download name"),
+    policy: Optional[str] = Query(None, description="Protection policy name (overrides default)"),
+    username: Optional[str] = Query(None, description="Username for audit trail (reveal)"),
+    host: Optional[str] = Query(None, description="CRDP server host (overrides default)"),
+    port: Optional[int] = Query(None, description="CRDP server port (overrides default)"),
+):
+    """
+    Protect or reveal columns of a CSV / NDJSON file sent as the raw request body.
 
-    # Step 2: minimal protect sample (POST) for additional verification
-    sample = getattr(settings, "CRDP_SAMPLE_DATA", "1234567890123")
-    payload = {"protection_policy_name": client.policy, "data": sample}
+    The body is read and the transformed file written back as a stream, in chunks of
+    CRDP_FILE_CHUNK_SIZE values with at most CRDP_FILE_CONCURRENCY bulk calls in flight,
+    so memory use does not depend on the file size.
+    """
+    settings = get_settings()
+    content_type = request.headers.get("content-type", "")
+    fmt = format or format_from_filename(filename)
+    if fmt is None:
+        fmt = "ndjson" if "ndjson" in content_type or "jsonl" in content_type else "csv"
+    if fmt not in FILE_FORMATS:
+        raise ValidationError(f"format must be one of: {', '.join(FILE_FORMATS)}")
+    wanted = [c.strip() for c in columns.split(",") if c.strip()]
+
+    client = _build_client(policy, host, port)
     try:
-        resp2 = client.post_json(client.protect_url, payload)
-        steps.append({
-            "stage": "protect_sample",
-            "method": "POST",
-            "url": resp2.request_url,
-            "request": payload,
-            "status_code": resp2.status_code,
-            "response": resp2.body,
-            "headers": resp2.request_headers,
-        })
-        ok_post = resp2.is_success
-    except Exception as e:
-        steps.append({"stage": "protect_sample", "method": "POST", "error": str(e)})
-        ok_post = False
+        body = await open_file_transform(
+            client,
+            request.stream(),
+            fmt,
+            wanted,
+            operation=operation,
+            username=username,
+            chunk_size=max(1, settings.CRDP_FILE_CHUNK_SIZE),
+            concurrency=max(1, settings.CRDP_FILE_CONCURRENCY),
+        )
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValidationError(str(e))
+
+    logger.info("Streaming %s of %s file, columns=%s", operation, fmt, wanted)
+    stem = (filename or "data").rsplit(".", 1)[0].replace('"', "")
+    ext = "csv" if fmt == "csv" else "ndjson"
+    return DuplexStreamingResponse(
+        _counting_errors(body),
+        media_type=_FILE_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{stem}.{operation}ed.{ext}"'},
+    )
+
+
+@router.get("/cache/stats", tags=["Protect/Reveal"])
+async def protect_cache_stats():
+    """Hit/miss counters of the protect result caches, per endpoint and policy."""
+    caches = get_protect_caches()
+    return {
+        "enabled": caches is not None,
+        "caches": caches.stats() if caches is not None else {},
+    }
+
+
+def _health_target(
+    policy: Optional[str] = None,
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    healthz_port: Optional[int] = None,
+) -> Tuple[Tuple[Any, ...], AsyncProtectRevealClient]:
+    """Resolve health check overrides against settings: (probe key, pooled client)."""
+    settings = get_settings()
+    host = host or settings.CRDP_API_HOST
+    port = port or settings.CRDP_API_PORT  # protect/reveal port
+    policy = policy or settings.CRDP_PROTECTION_POLICY
+    healthz_port = healthz_port or getattr(settings, "CRDP_HEALTHZ_PORT", None)  # healthz port (defaults to settings)
+    client = get_client_registry().get(host=host, port=port, policy=policy, timeout=5, healthz_port=healthz_port)
+    return (host, port, policy, healthz_port), client
+
+
+def _node_targets(policy: Optional[str] = None) -> List[Tuple[Tuple[Any, ...], AsyncProtectRevealClient]]:
+    """(probe key, client pinned to that node) for each CRDP_API_ENDPOINTS node."""
+    settings = get_settings()
+    policy = policy or settings.CRDP_PROTECTION_POLICY
+    healthz_port = getattr(settings, "CRDP_HEALTHZ_PORT", None)
+    registry = get_client_registry()
+    return [
+        (
+            (host, port, policy, healthz_port),
+            # not pooled: the protect sample must go to this node, not wherever the pool sends it
+            registry.get(host=host, port=port, policy=policy, timeout=5, healthz_port=healthz_port, pooled=False),
+        )
+        for host, port in parse_endpoints(settings.CRDP_API_ENDPOINTS, settings.CRDP_API_PORT)
+    ]
+
+
+async def _node_health(prober: HealthProber, policy: str, refresh: bool) -> List[Dict[str, Any]]:
+    """Latest health of every pool node, checking live the ones not probed yet (or all on refresh)."""
+    settings = get_settings()
+    targets = _node_targets(policy)
+
+    async def one(key: Tuple[Any, ...], client: AsyncProtectRevealClient) -> Dict[str, Any]:
+        snapshot = None if refresh else prober.snapshot(key)
+        if snapshot is None:
+            result = await check_health(client, getattr(settings, "CRDP_SAMPLE_DATA", "1234567890123"))
+            snapshot = prober.record(key, result)
+        return {
+            "endpoint": f"{client.host}:{client.port}",
+            "status": "healthy" if snapshot.result["healthy"] else "unhealthy",
+            "latency_ms": snapshot.result["latency_ms"],
+            "checked_at": snapshot.checked_at,
+        }
+
+    return list(await asyncio.gather(*(one(key, client) for key, client in targets)))
+
+
+@lru_cache
+def get_health_prober() -> HealthProber:
+    """Process-wide background prober of the configured CRDP endpoint and each pool node."""
+    settings = get_settings()
+    return HealthProber(
+        lambda: [_health_target(), *_node_targets()],
+        sample=getattr(settings, "CRDP_SAMPLE_DATA", "1234567890123"),
+        interval=settings.CRDP_HEALTH_PROBE_INTERVAL,
+        history=settings.CRDP_HEALTH_HISTORY,
+    )
+
 
-    status = "healthy" if ok_get else "unhealthy"
+@router.get("/health", tags=["Protect/Reveal"])
+async def health_check(
+    policy: Optional[str] = None,
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    healthz_port: Optional[int] = None,
+    refresh: bool = False,
+):
+    """
+    Health check endpoint.
+
+    - Returns the latest snapshot from the background prober (healthz GET plus a
+      protect sample POST) without calling CRDP.
+    - ``refresh=true``, or a target the prober has not checked yet, runs the check live.
+    - Returns debug steps so the UI can show a progress log.
+    - Accepts optional overrides via query params: policy, host, port.
+    - When the target is served by the CRDP node pool, ``nodes`` lists each node's
+      own health and the status is ``degraded`` if any node is down.
+    """
+    settings = get_settings()
+    key, client = _health_target(policy, host, port, healthz_port)
+    prober = get_health_prober()
+
+    snapshot = None if refresh else prober.snapshot(key)
+    cached = snapshot is not None
+    if snapshot is None:
+        result = await check_health(client, getattr(settings, "CRDP_SAMPLE_DATA", "1234567890123"))
+        snapshot = prober.record(key, result)
+
+    nodes = None
+    status = "healthy" if snapshot.result["healthy"] else "unhealthy"
+    if getattr(client, "pool", None) is not None:
+        nodes = await _node_health(prober, client.policy, refresh)
+        if status == "healthy" and any(node["status"] != "healthy" for node in nodes):
+            status = "degraded"
 
     return {
         "status": status,
@@ -359,5 +692,146 @@ async def health_check(policy: Optional[str] = None, host: Optional[str] = None,
         "crdp_api_port": port or settings.CRDP_API_PORT,
         "healthz_port": healthz_port or getattr(settings, "CRDP_HEALTHZ_PORT", None),
         "protection_policy": client.policy,
-        "steps": steps,
+        "cached": cached,
+        # breaker state is live, not part of the snapshot
+        "circuit": client.breaker.snapshot() if getattr(client, "breaker", None) is not None else None,
+        # per-node load balancing state when the target is served by the CRDP node pool
+        "endpoints": client.pool.snapshot() if getattr(client, "pool", None) is not None else None,
+        # per-node probe results (healthz + protect sample sent to that node only)
+        "nodes": nodes,
+        "latency_ms": snapshot.result["latency_ms"],
+        **snapshot.to_dict(),
+        "steps": snapshot.result["steps"],
     }
+
+
+class LoadJobRequest(BaseModel):
+    """Parameters of a background load test (the CLI's closed-loop mode)."""
+    bulk: bool = Field(False, description="Use protect_bulk/reveal_bulk in batches instead of single calls")
+    iterations: int = Field(100, ge=1, description="Number of values to protect and reveal")
+    batch_size: int = Field(25, ge=1, le=10000, description="Values per bulk call (bulk only)")
+    concurrency: int = Field(1, ge=1, description="Concurrent request threads")
+    start_data: Optional[str] = Field(None, description="Numeric value to start from (defaults to CRDP_SAMPLE_DATA)")
+    username: Optional[str] = Field(None, description="Username for audit trail (reveal)")
+    policy: Optional[str] = Field(None, description="Protection policy name (overrides default)")
+    host: Optional[str] = Field(None, description="CRDP server host (overrides default)")
+    port: Optional[int] = Field(None, description="CRDP server port (overrides default)")
+
+
+@lru_cache
+def get_job_manager() -> JobManager:
+    """Process-wide manager of background load-test jobs."""
+    settings = get_settings()
+    return JobManager(max_running=settings.CRDP_JOBS_MAX_RUNNING, keep_finished=settings.CRDP_JOBS_KEEP_FINISHED)
+
+
+def _job_targets() -> set:
+    """(host, port) pairs a load job may target: the default CRDP node and the CRDP_API_ENDPOINTS pool."""
+    settings = get_settings()
+    targets = {(settings.CRDP_API_HOST, settings.CRDP_API_PORT)}
+    targets.update(parse_endpoints(settings.CRDP_API_ENDPOINTS, settings.CRDP_API_PORT))
+    return targets
+
+
+def _get_job(job_id: str) -> LoadJob:
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Load job {job_id} not found")
+    return job
+
+
+@router.post("/jobs", status_code=202, tags=["Load jobs"])
+async def start_job(request: LoadJobRequest):
+    """
+    Start a protect/reveal load test in the background and return its first snapshot.
+
+    The run uses the same load generator as the CLI on its own threads, so it does not
+    occupy request workers; follow it with GET /jobs/{id} or the /jobs/{id}/events stream.
+    """
+    settings = get_settings()
+    if not settings.CRDP_JOBS_ENABLED:
+        raise HTTPException(status_code=403, detail="Load jobs are disabled (CRDP_JOBS_ENABLED=false)")
+    if request.iterations > settings.CRDP_JOBS_MAX_ITERATIONS:
+        raise ValidationError(f"iterations must be at most {settings.CRDP_JOBS_MAX_ITERATIONS}")
+    if request.concurrency > settings.CRDP_JOBS_MAX_CONCURRENCY:
+        raise ValidationError(f"concurrency must be at most {settings.CRDP_JOBS_MAX_CONCURRENCY}")
+    start_data = request.start_data or getattr(settings, "CRDP_SAMPLE_DATA", "1234567890123")
+    if not start_data.isdigit():
+        raise ValidationError("start_data must be numeric")
+    host = request.host or settings.CRDP_API_HOST
+    port = request.port or settings.CRDP_API_PORT
+    if (host, port) not in _job_targets():
+        # jobs generate sustained load, so they may only hit the configured CRDP nodes
+        raise HTTPException(
+            status_code=403,
+            detail=f"{host}:{port} is not a configured CRDP endpoint (CRDP_API_HOST/PORT or CRDP_API_ENDPOINTS)",
+        )
+
+    config = LoadConfig(
+        host=host,
+        port=port,
+        policy=request.policy or settings.CRDP_PROTECTION_POLICY,
+        start_data=start_data,
+        iterations=request.iterations,
+        bulk=request.bulk,
+        batch_size=request.batch_size,
+        concurrency=request.concurrency,
+        username=request.username,
+        no_history=True,
+    )
+    try:
+        job = get_job_manager().start(config)
+    except JobLimitError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return job.snapshot()
+
+
+@router.get("/jobs", tags=["Load jobs"])
+async def list_jobs():
+    """Running and recently finished load jobs, newest first."""
+    return {"jobs": [job.snapshot() for job in get_job_manager().list()]}
+
+
+@router.get("/jobs/{job_id}", tags=["Load jobs"])
+async def get_job(job_id: str):
+    """Current snapshot of a load job: state, counts, throughput and per-phase latency percentiles."""
+    return _get_job(job_id).snapshot()
+
+
+@router.post("/jobs/{job_id}/cancel", tags=["Load jobs"])
+async def cancel_job(job_id: str):
+    """Ask a running job to stop; lanes stop after their in-flight request, so the state turns to cancelled shortly."""
+    job = _get_job(job_id)
+    job.cancel()
+    return job.snapshot()
+
+
+@router.get("/jobs/{job_id}/events", tags=["Load jobs"])
+async def job_events(
+    job_id: str,
+    request: Request,
+    interval: float = Query(1.0, ge=0.1, le=10.0, description="Seconds between progress events"),
+):
+    """
+    Server-Sent Events stream of job snapshots.
+
+    Sends a ``progress`` event every ``interval`` seconds while the job runs and a final
+    ``done`` event with the last snapshot, then closes the stream.
+    """
+    job = _get_job(job_id)
+
+    async def events():
+        while True:
+            snapshot = job.snapshot()
+            event = "done" if job.done else "progress"
+            yield f"event: {event}\ndata: {dumps(snapshot).decode('utf-8')}\n\n"
+            if job.done or await request.is_disconnected():
+                return
+            await asyncio.sleep(interval)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -7,7 +7,7 @@ import os
 
 class Settings(BaseSettings):
     APP_NAME: str = "FastAPI Starter"
-    DEBUG: bool = True
+    DEBUG: bool = False
     SECRET_KEY: str = "change_me"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     ALGORITHM: str = "HS256"
@@ -16,6 +16,10 @@ class Settings(BaseSettings):
     DEMO_USERNAME: str = "demo"
     DEMO_PASSWORD: str = "demo"
 
+    # INFO 이하 로그의 로거별 초당 허용 개수(0이면 제한 없음)와 burst; WARNING 이상은 항상 기록
+    LOG_RATE_LIMIT: float = 20.0
+    LOG_RATE_BURST: int = 50
+
     # CRDP defaults
     CRDP_API_HOST: str = "192.168.0.231"
     # Protect/Reveal API 포트 (v1 API)
@@ -24,6 +28,58 @@ class Settings(BaseSettings):
     CRDP_HEALTHZ_PORT: int = 32080
     CRDP_PROTECTION_POLICY: str = "P03"
     CRDP_SAMPLE_DATA: str = "1234567890123"
+    # 재사용 클라이언트 레지스트리 (keep-alive 커넥션 풀)
+    CRDP_CLIENT_MAX_CLIENTS: int = 32
+    CRDP_CLIENT_IDLE_TTL: float = 300.0
+    CRDP_POOL_MAXSIZE: int = 10
+    # /protect-bulk, /reveal-bulk: upstream 호출당 최대 항목 수와 동시 호출 수
+    CRDP_BULK_CHUNK_SIZE: int = 500
+    CRDP_BULK_CONCURRENCY: int = 4
+    # 단건 /protect, /reveal 요청을 bulk 호출로 모으는 micro-batching (기본 꺼짐, debug 요청은 제외)
+    CRDP_COALESCE_ENABLED: bool = False
+    CRDP_COALESCE_MAX_BATCH: int = 100
+    CRDP_COALESCE_WINDOW_MS: float = 2.0
+    # 결정적 protect 결과 캐시 (HMAC 키, 엔드포인트/정책별 LRU+TTL, 기본 꺼짐)
+    # CRDP_PROTECT_CACHE_KEY가 비어 있으면 프로세스마다 임의의 HMAC 키를 사용
+    CRDP_PROTECT_CACHE_ENABLED: bool = False
+    CRDP_PROTECT_CACHE_MAX_ENTRIES: int = 10000
+    CRDP_PROTECT_CACHE_TTL: float = 600.0
+    CRDP_PROTECT_CACHE_KEY: str = ""
+    # 엔드포인트별 circuit breaker: 연속 실패 임계값과 open 유지 시간(초)
+    CRDP_BREAKER_ENABLED: bool = True
+    CRDP_BREAKER_FAILURE_THRESHOLD: int = 5
+    CRDP_BREAKER_RESET_TIMEOUT: float = 30.0
+    # 지수 백오프 + jitter 재시도 (0이면 재시도 안 함). POST는 연결 실패만 재시도,
+    # CRDP_RETRY_UNSAFE=true이면 502/503/504와 타임아웃도 재시도
+    CRDP_RETRY_MAX: int = 0
+    CRDP_RETRY_BASE_DELAY: float = 0.05
+    CRDP_RETRY_MAX_DELAY: float = 1.0
+    CRDP_RETRY_UNSAFE: bool = False
+    # 백그라운드 health 프로버: 점검 주기(초, 0이면 끔)와 보관할 이력 개수
+    CRDP_HEALTH_PROBE_INTERVAL: float = 15.0
+    CRDP_HEALTH_HISTORY: int = 20
+    # CRDP 노드 풀: "host:port" 목록 (JSON 배열, 예: ["10.0.0.1:32082","10.0.0.2:32082"]). 비어 있으면 CRDP_API_HOST/PORT 단일 노드.
+    # 기본 CRDP_API_HOST/PORT 또는 목록에 포함된 host/port로 들어온 요청은 모든 노드로 분산 (ewma 또는 least_outstanding),
+    # 연속 실패한 노드는 CRDP_LB_EJECT_SECONDS 동안 제외 후 자동 재투입
+    CRDP_API_ENDPOINTS: List[str] = []
+    CRDP_LB_STRATEGY: str = "ewma"
+    CRDP_LB_EJECT_AFTER: int = 3
+    CRDP_LB_EJECT_SECONDS: float = 30.0
+    # /metrics (Prometheus 텍스트 형식): upstream 호출 지연/진행 중 요청/bulk 크기 기록 여부
+    CRDP_METRICS_ENABLED: bool = True
+    # 요청 trace: Server-Timing 헤더를 붙일 요청 비율(0~1)과 구조화된 trace 로그(app.trace) 기록 여부
+    CRDP_TRACE_SAMPLE_RATE: float = 1.0
+    CRDP_TRACE_LOG: bool = False
+    # 파일 스트리밍 토큰화 (/transform-file): bulk 호출당 값 개수와 동시 upstream 호출 수
+    CRDP_FILE_CHUNK_SIZE: int = 500
+    CRDP_FILE_CONCURRENCY: int = 4
+    # 웹 UI 백그라운드 부하 테스트 작업 (/jobs, 기본 꺼짐): 동시 실행 작업 수, 보관할 완료 작업 수, 작업당 반복/동시성 상한
+    # 대상은 CRDP_API_HOST/PORT 또는 CRDP_API_ENDPOINTS에 설정된 노드로만 제한
+    CRDP_JOBS_ENABLED: bool = False
+    CRDP_JOBS_MAX_RUNNING: int = 1
+    CRDP_JOBS_KEEP_FINISHED: int = 20
+    CRDP_JOBS_MAX_ITERATIONS: int = 100000
+    CRDP_JOBS_MAX_CONCURRENCY: int = 16
     # Accept JSON array or comma-separated string for CORS_ORIGINS
     @field_validator("CORS_ORIGINS", mode="before")
     @classmethod
@@ -1,44 +1,137 @@
+import atexit
 import logging
+import queue
 import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, Optional, Tuple
 from app.core.config import settings
 
+# background listener that owns the file/stdout handlers (None until setup_logging runs)
+_listener: Optional[QueueListener] = None
+_atexit_registered = False
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread.
+
+    The stock ``prepare`` formats the message (and any traceback) in the calling
+    thread so records can be pickled; this queue never leaves the process, so the
+    record is enqueued as is and ``%`` formatting happens off the request path.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class RateLimitFilter(logging.Filter):
+    """Per-logger token bucket for INFO-and-below records; WARNING and above always pass.
+
+    Each logger may emit ``rate`` low-severity records per second with bursts of
+    ``burst``; records over the limit are dropped and counted, and the next record
+    that gets through notes how many were suppressed. Loggers in ``exempt`` (and their
+    children) are never throttled: the sampled trace log already has its own rate.
+    """
+
+    def __init__(self, rate: float, burst: int, exempt: Tuple[str, ...] = ("app.trace",)):
+        super().__init__()
+        self.rate = rate
+        self.burst = max(1.0, float(burst))
+        self.exempt = tuple(exempt)
+        self._buckets: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def _is_exempt(self, name: str) -> bool:
+        return any(name == prefix or name.startswith(prefix + ".") for prefix in self.exempt)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate <= 0 or record.levelno >= logging.WARNING or self._is_exempt(record.name):
+            return True
+        now = time.monotonic()
+        with self._lock:
+            # [tokens, last refill time, suppressed since last emitted record]
+            bucket = self._buckets.get(record.name)
+            if bucket is None:
+                bucket = self._buckets[record.name] = [self.burst, now, 0]
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] < 1.0:
+                bucket[2] += 1
+                return False
+            bucket[0] -= 1.0
+            suppressed, bucket[2] = bucket[2], 0
+        if suppressed:
+            record.msg = f"{record.msg} [{suppressed} similar records suppressed]"
+        return True
+
+
 def setup_logging():
     """Configure application logging"""
-    
+    global _listener, _atexit_registered
+
     # Create logs directory if it doesn't exist
     log_dir = Path(__file__).parent.parent.parent / "logs"
     log_dir.mkdir(exist_ok=True)
-    
+
     # Log file path with date
     log_file = log_dir / f"app_{datetime.now():%Y%m%d}.log"
-    
+
     # Format
     log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     date_format = '%Y-%m-%d %H:%M:%S'
-    
+
     # Set log level based on DEBUG setting
     log_level = logging.DEBUG if settings.DEBUG else logging.INFO
-    
+
+    # File and stdout writes happen on the listener thread; request handlers only enqueue records
+    formatter = logging.Formatter(log_format, datefmt=date_format)
+    handlers = [logging.FileHandler(log_file, encoding='utf-8'), logging.StreamHandler(sys.stdout)]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    # calling again (tests, reload) replaces the previous listener; it is stopped below once
+    # the root logger no longer feeds its queue
+    previous = _listener
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    if not _atexit_registered:
+        atexit.register(shutdown_logging)
+        _atexit_registered = True
+
+    queue_handler = _DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter(settings.LOG_RATE_LIMIT, settings.LOG_RATE_BURST))
+
     # Configure root logger
-    logging.basicConfig(
-        level=log_level,
-        format=log_format,
-        datefmt=date_format,
-        handlers=[
-            logging.FileHandler(log_file, encoding='utf-8'),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
-    
+    logging.basicConfig(level=log_level, handlers=[queue_handler], force=True)
+    if previous is not None:
+        _stop_listener(previous)
+
     # Set specific loggers
     logging.getLogger("uvicorn").setLevel(logging.INFO)
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
     logging.getLogger("httpx").setLevel(logging.WARNING)
-    
+
     logger = logging.getLogger(__name__)
-    logger.info(f"Logging initialized. Log file: {log_file}")
-    logger.info(f"Debug mode: {settings.DEBUG}")
-    
+    logger.info("Logging initialized. Log file: %s", log_file)
+    logger.info("Debug mode: %s", settings.DEBUG)
+
     return logger
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread (safe to call more than once)."""
+    global _listener
+    if _listener is None:
+        return
+    _stop_listener(_listener)
+    _listener = None
+
+
+def _stop_listener(listener: QueueListener) -> None:
+    # drains the queue, joins the thread, then closes the file/stdout handlers
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
@@ -0,0 +1,223 @@
+"""Prometheus 텍스트 형식 메트릭.
+
+외부 라이브러리 없이 카운터/게이지/히스토그램을 메모리에 누적하고 `/metrics`에서
+text exposition format(0.0.4)으로 내보냅니다. 기록은 레이블 튜플 dict 조회와 고정 버킷 bisect뿐이라
+요청 경로(hot path)에서 호출해도 비용이 작습니다.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# upstream CRDP latency (seconds) and bulk batch size bucket boundaries
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BATCH_SIZE_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> Any:
+        """Child for one label combination (created on first use)."""
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._children[values] = self._new_child()
+        return child
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        # snapshot under the lock: labels() may add a child while a scrape is rendering
+        with self._lock:
+            items = list(self._children.items())
+        for values, child in sorted(items):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values: Tuple[str, ...], child: Any) -> List[str]:
+        return [f"{self.name}{_format_labels(self.label_names, values)} {_format_value(child.value)}"]
+
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+
+class _Buckets:
+    __slots__ = ("bounds", "counts", "sum", "count", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        # one slot per bound plus the +Inf overflow; cumulated only when rendering
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _Buckets:
+        return _Buckets(self.buckets)
+
+    def _render_child(self, values: Tuple[str, ...], child: _Buckets) -> List[str]:
+        with child._lock:
+            counts, total, count = list(child.counts), child.sum, child.count
+        lines = []
+        cumulative = 0
+        for bound, n in zip(self.buckets + (float("inf"),), counts):
+            cumulative += n
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.label_names, values, le)} {cumulative}")
+        labels = _format_labels(self.label_names, values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Ordered set of metrics rendered together by :meth:`render`."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help, labels))
+
+    def histogram(
+        self, name: str, help: str, labels: Sequence[str] = (), buckets: Iterable[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, help, labels, buckets))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+UPSTREAM_LATENCY = REGISTRY.histogram(
+    "crdp_upstream_request_duration_seconds",
+    "Latency of upstream CRDP calls by operation and status class.",
+    ("operation", "status_class"),
+)
+UPSTREAM_IN_FLIGHT = REGISTRY.gauge(
+    "crdp_upstream_requests_in_flight",
+    "Upstream CRDP calls currently in flight by operation.",
+    ("operation",),
+)
+BULK_BATCH_SIZE = REGISTRY.histogram(
+    "crdp_bulk_batch_size",
+    "Number of items per upstream bulk CRDP call.",
+    ("operation",),
+    buckets=BATCH_SIZE_BUCKETS,
+)
+CRDP_ERRORS = REGISTRY.counter(
+    "crdp_errors_total",
+    "CRDP errors returned to API clients by exception type.",
+    ("type",),
+)
+
+
+def status_class(status: Optional[int]) -> str:
+    """``2xx``..``5xx`` for HTTP statuses, ``error`` when no response was received."""
+    if status is None:
+        return "error"
+    return f"{status // 100}xx"
+
+
+class UpstreamMetrics:
+    """Client-side hook recording upstream CRDP calls into the module metrics."""
+
+    def started(self, operation: str, batch_size: Optional[int] = None) -> None:
+        UPSTREAM_IN_FLIGHT.labels(operation).inc()
+        if batch_size is not None:
+            BULK_BATCH_SIZE.labels(operation).observe(batch_size)
+
+    def finished(self, operation: str, status: Optional[int], elapsed_s: Optional[float]) -> None:
+        """``elapsed_s`` None means the call was abandoned (e.g. cancelled) and is not timed."""
+        UPSTREAM_IN_FLIGHT.labels(operation).dec()
+        if elapsed_s is not None:
+            UPSTREAM_LATENCY.labels(operation, status_class(status)).observe(elapsed_s)
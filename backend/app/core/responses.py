@@ -0,0 +1,13 @@
+"""응답 클래스: 라우트 응답을 빠른 JSON 백엔드(orjson, 없으면 표준 json)로 직렬화합니다."""
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from app.services.protect_reveal.jsoncodec import dumps
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered through the fast JSON codec (compact UTF-8 output)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
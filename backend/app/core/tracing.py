@@ -0,0 +1,147 @@
+"""요청 단위 구간(span) 타이밍과 Server-Timing 헤더.
+
+`TracingMiddleware`가 샘플링된 요청마다 `RequestTrace`를 contextvar에 두고, 라우트는
+`span("upstream")`/`span("parse")`처럼 구간을 기록합니다. 응답 시작 시 구간별 시간
+(validate: 본문 읽기+Pydantic 검증, upstream, parse, serialize: 응답 모델 직렬화, app: 나머지)을
+`Server-Timing` 헤더로 붙이고, 설정 시 구조화된 trace 로그 한 줄을 남깁니다.
+샘플링되지 않은 요청에서 `span()`은 contextvar 조회 한 번으로 끝납니다.
+"""
+
+import functools
+import json
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional
+
+trace_logger = logging.getLogger("app.trace")
+
+_current: ContextVar[Optional["RequestTrace"]] = ContextVar("crdp_request_trace", default=None)
+
+
+class RequestTrace:
+    """Exclusive span durations (seconds) of one request."""
+
+    __slots__ = ("method", "path", "start", "spans", "spanned", "handler_start", "handler_end")
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.start = time.perf_counter()
+        self.spans: Dict[str, float] = {}
+        # total of all recorded spans, used to make nested spans exclusive
+        self.spanned = 0.0
+        self.handler_start: Optional[float] = None
+        self.handler_end: Optional[float] = None
+
+    def add(self, name: str, seconds: float) -> None:
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+        self.spanned += seconds
+
+    def finish(self, now: Optional[float] = None) -> Dict[str, float]:
+        """Stage durations in milliseconds, with ``app`` as the unaccounted remainder and ``total``."""
+        now = time.perf_counter() if now is None else now
+        stages = dict(self.spans)
+        if self.handler_start is not None:
+            stages["validate"] = self.handler_start - self.start
+        if self.handler_end is not None:
+            stages["serialize"] = now - self.handler_end
+        total = now - self.start
+        out = {name: seconds * 1000.0 for name, seconds in stages.items()}
+        out["app"] = max(0.0, total - sum(stages.values())) * 1000.0
+        out["total"] = total * 1000.0
+        return out
+
+
+def current_trace() -> Optional[RequestTrace]:
+    return _current.get()
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time a block as ``name``, excluding spans recorded inside it (no-op when not sampled)."""
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    inner = trace.spanned
+    try:
+        yield
+    finally:
+        trace.add(name, time.perf_counter() - t0 - (trace.spanned - inner))
+
+
+def timed(fn: Callable[..., Any], name: str) -> Callable[..., Any]:
+    """Wrap a synchronous callable so each call is recorded as ``name``."""
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with span(name):
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def traced_endpoint(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Mark where an async route handler starts and ends, splitting validate/serialize from handler time."""
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        trace = _current.get()
+        if trace is None:
+            return await fn(*args, **kwargs)
+        trace.handler_start = time.perf_counter()
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            trace.handler_end = time.perf_counter()
+
+    return wrapper
+
+
+def server_timing(stages: Dict[str, float]) -> str:
+    return ", ".join(f"{name};dur={ms:.3f}" for name, ms in stages.items())
+
+
+class TracingMiddleware:
+    """Pure ASGI middleware: samples requests, adds ``Server-Timing`` and optionally logs a trace record."""
+
+    def __init__(self, app: Any, sample_rate: float = 1.0, log: bool = False):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.log = log
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        trace = RequestTrace(scope.get("method", ""), scope.get("path", ""))
+        token = _current.set(trace)
+        status = {"code": None}
+
+        async def send_with_timing(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                stages = trace.finish()
+                status["code"] = message.get("status")
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(stages).encode("latin-1")))
+                message = {**message, "headers": headers}
+                if self.log:
+                    trace_logger.info(
+                        json.dumps({
+                            "method": trace.method,
+                            "path": trace.path,
+                            "status": status["code"],
+                            "stages_ms": {k: round(v, 3) for k, v in stages.items()},
+                        })
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
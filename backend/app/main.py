@@ -1,17 +1,21 @@
+import asyncio
 import logging
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from app.core.config import settings
 from app.core.logging import setup_logging
 from app.core.exceptions import CRDPConnectionError, CRDPAPIError, CRDPTimeoutError
-from app.api.routes.protect_reveal import router as protect_reveal_router
+from app.core.responses import FastJSONResponse
+from app.core.tracing import TracingMiddleware
+from app.core.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, CRDP_ERRORS, REGISTRY as METRICS
+from app.api.routes.protect_reveal import router as protect_reveal_router, get_client_registry, get_health_prober, get_job_manager
 
 # Setup logging
 setup_logging()
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title=settings.APP_NAME)
+app = FastAPI(title=settings.APP_NAME, default_response_class=FastJSONResponse)
 
 # CORS
 app.add_middleware(
@@ -20,12 +24,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # let browser code read the stage timings of cross-origin responses
+    expose_headers=["Server-Timing"],
+)
+
+# Per-request stage timings (Server-Timing header, optional trace log); outermost so it times everything
+app.add_middleware(
+    TracingMiddleware,
+    sample_rate=settings.CRDP_TRACE_SAMPLE_RATE,
+    log=settings.CRDP_TRACE_LOG,
 )
 
 # Exception handlers
 @app.exception_handler(CRDPConnectionError)
 async def crdp_connection_error_handler(request: Request, exc: CRDPConnectionError):
-    logger.error(f"CRDP connection error: {exc.detail}")
+    CRDP_ERRORS.labels("CRDPConnectionError").inc()
+    logger.error("CRDP connection error: %s", exc.detail)
     return JSONResponse(
         status_code=exc.status_code,
         content={"error": "CRDP Connection Error", "detail": exc.detail}
@@ -33,7 +47,8 @@ async def crdp_connection_error_handler(request: Request, exc: CRDPConnectionErr
 
 @app.exception_handler(CRDPAPIError)
 async def crdp_api_error_handler(request: Request, exc: CRDPAPIError):
-    logger.error(f"CRDP API error: {exc.detail}")
+    CRDP_ERRORS.labels("CRDPAPIError").inc()
+    logger.error("CRDP API error: %s", exc.detail)
     return JSONResponse(
         status_code=exc.status_code,
         content={"error": "CRDP API Error", "detail": exc.detail}
@@ -41,7 +56,8 @@ async def crdp_api_error_handler(request: Request, exc: CRDPAPIError):
 
 @app.exception_handler(CRDPTimeoutError)
 async def crdp_timeout_error_handler(request: Request, exc: CRDPTimeoutError):
-    logger.error(f"CRDP timeout error: {exc.detail}")
+    CRDP_ERRORS.labels("CRDPTimeoutError").inc()
+    logger.error("CRDP timeout error: %s", exc.detail)
     return JSONResponse(
         status_code=exc.status_code,
         content={"error": "CRDP Timeout Error", "detail": exc.detail}
@@ -49,7 +65,7 @@ async def crdp_timeout_error_handler(request: Request, exc: CRDPTimeoutError):
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
-    logger.exception(f"Unhandled exception: {str(exc)}")
+    logger.exception("Unhandled exception: %s", exc)
     return JSONResponse(
         status_code=500,
         content={"error": "Internal Server Error", "detail": "An unexpected error occurred"}
@@ -57,18 +73,28 @@ async def general_exception_handler(request: Request, exc: Exception):
 
 @app.on_event("startup")
 async def startup_event():
-    logger.info(f"Starting {settings.APP_NAME}")
-    logger.info(f"CORS origins: {settings.CORS_ORIGINS}")
-    logger.info(f"CRDP API: {settings.CRDP_API_HOST}:{settings.CRDP_API_PORT}")
+    logger.info("Starting %s", settings.APP_NAME)
+    logger.info("CORS origins: %s", settings.CORS_ORIGINS)
+    logger.info("CRDP API: %s:%s", settings.CRDP_API_HOST, settings.CRDP_API_PORT)
+    get_health_prober().start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    logger.info(f"Shutting down {settings.APP_NAME}")
+    logger.info("Shutting down %s", settings.APP_NAME)
+    await get_health_prober().stop()
+    # stop background load jobs before their CRDP connections go away
+    await asyncio.to_thread(get_job_manager().cancel_all, 5.0)
+    await get_client_registry().aclose_all()
 
 @app.get("/health")
 async def health():
     logger.debug("Health check requested")
     return {"status": "ok"}
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint."""
+    return Response(METRICS.render(), media_type=METRICS_CONTENT_TYPE)
+
 # Routers (only Protect/Reveal)
 app.include_router(protect_reveal_router, prefix="/api/crdp", tags=["protect-reveal"])
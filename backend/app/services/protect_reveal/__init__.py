@@ -1,15 +1,29 @@
 """protect_reveal package exports."""
+from .async_client import AsyncProtectRevealClient
 from .client import APIError, APIResponse, ProtectRevealClient
-from .runner import BulkIterationResult, IterationResult, run_bulk_iteration, run_iteration
+from .registry import AsyncClientRegistry, ClientRegistry
+from .runner import (
+    BulkIterationResult,
+    IterationResult,
+    iter_bulk_iteration,
+    run_bulk_batch,
+    run_bulk_iteration,
+    run_iteration,
+)
 from .utils import increment_numeric_string
 
 __all__ = [
     "ProtectRevealClient",
+    "AsyncProtectRevealClient",
     "APIResponse",
     "APIError",
+    "ClientRegistry",
+    "AsyncClientRegistry",
     "increment_numeric_string",
     "IterationResult",
     "run_iteration",
     "BulkIterationResult",
     "run_bulk_iteration",
+    "run_bulk_batch",
+    "iter_bulk_iteration",
 ]
@@ -0,0 +1,182 @@
+"""asyncio 기반 CRDP 클라이언트.
+
+`ProtectRevealClient`와 동일한 URL/페이로드/응답 파싱 헬퍼와 `APIResponse` 형태를 유지하면서
+httpx.AsyncClient로 요청을 보내므로 FastAPI 이벤트 루프를 블로킹하지 않습니다.
+"""
+
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Iterator, Optional, Tuple
+
+import httpx
+
+from .client import APIResponse, BaseProtectRevealClient
+
+if TYPE_CHECKING:
+    from .cache import ProtectCache
+    from .endpoints import EndpointPool
+    from .resilience import CircuitBreaker, RetryPolicy
+
+
+class AsyncProtectRevealClient(BaseProtectRevealClient):
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        policy: str,
+        timeout: int = 10,
+        healthz_port: Optional[int] = None,
+        pool_maxsize: int = 10,
+        keepalive_expiry: float = 30.0,
+        trace: bool = True,
+        protect_cache: Optional["ProtectCache"] = None,
+        breaker: Optional["CircuitBreaker"] = None,
+        retry: Optional["RetryPolicy"] = None,
+        pool: Optional["EndpointPool"] = None,
+        metrics: Optional[Any] = None,
+    ):
+        super().__init__(
+            host,
+            port,
+            policy,
+            timeout=timeout,
+            healthz_port=healthz_port,
+            trace=trace,
+            protect_cache=protect_cache,
+            breaker=breaker,
+            retry=retry,
+            pool=pool,
+            metrics=metrics,
+        )
+        # httpx limits are per client, so a node pool gets pool_maxsize connections per node
+        max_connections = pool_maxsize * (len(pool.endpoints) if pool is not None else 1)
+        self.http = httpx.AsyncClient(
+            headers={"Content-Type": "application/json"},
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+        )
+        # calls in progress (including retry back-off), so an evicted client can wait for them
+        self._in_flight = 0
+        self._idle: Optional[asyncio.Event] = None
+
+    async def aclose(self) -> None:
+        """Close the underlying httpx client and its pooled connections."""
+        await self.http.aclose()
+
+    async def aclose_when_idle(self) -> None:
+        """Close once no call is in flight, so closing never cuts a request short."""
+        while self._in_flight:
+            self._idle = asyncio.Event()
+            await self._idle.wait()
+        await self.aclose()
+
+    @contextmanager
+    def _in_use(self) -> Iterator[None]:
+        self._in_flight += 1
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            if not self._in_flight and self._idle is not None:
+                self._idle.set()
+
+    async def _send(self, method: str, url: str, payload: Any, trace: Optional[bool]) -> Tuple[APIResponse, bool]:
+        # one attempt: (response, whether the connection never opened)
+        operation = self._begin(url, payload)
+        url, endpoint = self._route(method, url)
+        response = None
+        try:
+            response, connect_failed = await self._attempt(method, url, payload, trace)
+            return response, connect_failed
+        finally:
+            self._report(endpoint, response)
+            self._end(operation, response)
+
+    async def _attempt(self, method: str, url: str, payload: Any, trace: Optional[bool]) -> Tuple[APIResponse, bool]:
+        t0 = time.perf_counter()
+        try:
+            if method == "GET":
+                resp = await self.http.get(url)
+            else:
+                resp = await self.http.post(url, content=self._encode(payload))
+        except httpx.HTTPError as exc:
+            # network-level error (connect/read timeout etc.): no response to parse
+            connect_failed = isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout))
+            return APIResponse(None, str(exc), elapsed_s=time.perf_counter() - t0), connect_failed
+
+        body = self._decode(resp.content, lambda: resp.text)
+
+        return self._response(resp.status_code, body, time.perf_counter() - t0, url, payload, self.http.headers, trace), False
+
+    async def get_json(self, url: str, trace: Optional[bool] = None) -> APIResponse:
+        """GET with retries; not gated by the breaker so health probes keep reporting during an outage."""
+        attempt = 0
+        with self._in_use():
+            while True:
+                response, _ = await self._send("GET", url, None, trace)
+                delay = self._settle(response, attempt, safe=True, guarded=False)
+                if delay is None:
+                    return response
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def post_json(self, url: str, payload: Any, trace: Optional[bool] = None) -> APIResponse:
+        trial = self._admit()
+        attempt = 0
+        with self._in_use():
+            try:
+                while True:
+                    response, connect_failed = await self._send("POST", url, payload, trace)
+                    delay = self._settle(response, attempt, safe=connect_failed)
+                    if delay is None:
+                        return response
+                    await asyncio.sleep(delay)
+                    attempt += 1
+            except BaseException:
+                # cancellation (client disconnect, sibling chunk failed, shutdown) or an unexpected error
+                self._abandon(trial)
+                raise
+
+    async def protect(self, data: str, trace: Optional[bool] = None) -> APIResponse:
+        """Protect a single value (served from the protect cache when possible)."""
+        cached = self._cached_protect(data, trace)
+        if cached is not None:
+            return cached
+        response = await self.post_json(self.protect_url, self.build_protect_payload(data), trace=trace)
+        self._remember_protect(data, response)
+        return response
+
+    # Bulk helpers
+    async def protect_bulk(self, items: list, trace: Optional[bool] = None) -> APIResponse:
+        """Send a bulk protect request. Payload: {protection_policy_name, data_array: [ ... ]}
+
+        With a protect cache only the missing values are sent and the hits merged back in.
+        """
+        if self.protect_cache is None:
+            return await self.post_json(self.protect_bulk_url, self.build_protect_bulk_payload(items), trace=trace)
+        cached, misses = self._split_cached_bulk(items)
+        response = None
+        if misses:
+            response = await self.post_json(self.protect_bulk_url, self.build_protect_bulk_payload(misses), trace=trace)
+        return self._merge_cached_bulk(items, cached, misses, response, trace)
+
+    async def reveal_bulk(
+        self,
+        protected_items: list,
+        username: Optional[str] = None,
+        trace: Optional[bool] = None,
+    ) -> APIResponse:
+        """Send a bulk reveal request (see `ProtectRevealClient.reveal_bulk`)."""
+        return await self.post_json(
+            self.reveal_bulk_url, self.reveal_bulk_payload(protected_items, username, trace), trace=trace
+        )
+
+    # Healthz helper
+    async def healthz(self) -> APIResponse:
+        """Call CRDP healthz endpoint (GET /healthz)."""
+        return await self.get_json(self.healthz_url)
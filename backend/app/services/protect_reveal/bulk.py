@@ -0,0 +1,86 @@
+"""큰 bulk 배열을 CRDP 크기 chunk로 나눠 동시에 호출하는 fan-out 헬퍼.
+
+chunk별 호출은 동시성 상한(semaphore) 안에서 병렬로 진행되고, 결과는 원래 입력 순서대로
+다시 합쳐집니다. 한 chunk가 실패해도 나머지 chunk 결과는 유지되며 실패는 chunk 단위로 보고됩니다.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Optional
+
+from .client import APIError, APIResponse
+
+
+@dataclass
+class ChunkOutcome:
+    index: int
+    # position of the chunk's first item in the request array
+    offset: int
+    items: list
+    response: Optional[APIResponse] = None
+    values: Optional[list] = None
+    error: Optional[str] = None
+    status_code: Optional[int] = None
+    exception: Optional[APIError] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+async def fan_out_bulk(
+    items: list,
+    call: Callable[[list], Awaitable[APIResponse]],
+    extract: Callable[[APIResponse], list],
+    chunk_size: int,
+    concurrency: int,
+) -> List[ChunkOutcome]:
+    """Run ``call`` on ``chunk_size`` slices of ``items`` with at most ``concurrency`` in flight.
+
+    Returns one ChunkOutcome per chunk, in input order. A chunk fails if the call
+    raises, returns a non-2xx status, or returns a different number of values;
+    only APIError is kept in ``exception``.
+    """
+    chunk_size = max(1, chunk_size)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    outcomes = [
+        ChunkOutcome(index=n, offset=i, items=items[i : i + chunk_size])
+        for n, i in enumerate(range(0, len(items), chunk_size))
+    ] or [ChunkOutcome(index=0, offset=0, items=[])]
+
+    async def run(outcome: ChunkOutcome) -> None:
+        try:
+            await settle(outcome)
+        except APIError as e:
+            outcome.exception = e
+            outcome.status_code = e.status_code
+            outcome.error = str(e)
+        except Exception as e:
+            # any other failure stays this chunk's error instead of aborting the gather
+            # while the sibling chunks keep calling upstream
+            outcome.error = f"Unexpected error: {e}"
+
+    async def settle(outcome: ChunkOutcome) -> None:
+        async with semaphore:
+            response = await call(outcome.items)
+        outcome.response = response
+        outcome.status_code = response.status_code
+        if not response.is_success:
+            outcome.error = str(response.body) if response.body else f"Bulk request failed (status {response.status_code})"
+            return
+        values = extract(response)
+        if len(values) != len(outcome.items):
+            outcome.error = f"expected {len(outcome.items)} values, got {len(values)}"
+            return
+        outcome.values = values
+
+    await asyncio.gather(*(run(o) for o in outcomes))
+    return outcomes
+
+
+def merge_values(outcomes: List[ChunkOutcome]) -> list:
+    """Concatenate chunk values in order; items of failed chunks become None."""
+    merged: list = []
+    for outcome in outcomes:
+        merged.extend(outcome.values if outcome.ok else [None] * len(outcome.items))
+    return merged
@@ -0,0 +1,110 @@
+"""결정적(deterministic) protect 결과 캐시.
+
+같은 정책으로 같은 값을 protect하면 항상 같은 토큰이 나오므로, 최근 결과를 보관해
+upstream 호출을 줄입니다. 평문은 메모리에 남기지 않고 프로세스 비밀키로 만든 HMAC-SHA256
+다이제스트를 키로 사용하며, CRDP 엔드포인트/정책별로 크기(LRU)와 수명(TTL)이 제한됩니다.
+"""
+
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+
+class ProtectCache:
+    """Bounded LRU/TTL map of HMAC(value) -> protected token for one endpoint/policy."""
+
+    def __init__(self, secret: bytes, max_entries: int = 10000, ttl: float = 600.0):
+        self._secret = secret
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self._entries: "OrderedDict[bytes, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        # upstream calls avoided entirely (single hits and fully cached bulk requests)
+        self.calls_saved = 0
+
+    def _key(self, value: str) -> bytes:
+        return hmac.new(self._secret, value.encode("utf-8"), hashlib.sha256).digest()
+
+    def get(self, value: str) -> Optional[str]:
+        return self.get_many([value])[0]
+
+    def get_many(self, values: List[str]) -> List[Optional[str]]:
+        """Cached tokens for ``values`` (None for misses), updating LRU order and counters."""
+        keys = [self._key(v) for v in values]
+        now = time.monotonic()
+        out: List[Optional[str]] = []
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and now - entry[1] >= self.ttl:
+                    del self._entries[key]
+                    entry = None
+                if entry is None:
+                    self.misses += 1
+                    out.append(None)
+                else:
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                    out.append(entry[0])
+        return out
+
+    def put(self, value: str, token: str) -> None:
+        self.put_many([value], [token])
+
+    def put_many(self, values: List[str], tokens: List[str]) -> None:
+        keys = [self._key(v) for v in values]
+        now = time.monotonic()
+        with self._lock:
+            for key, token in zip(keys, tokens):
+                self._entries[key] = (token, now)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def record_saved_call(self) -> None:
+        with self._lock:
+            self.calls_saved += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "upstream_calls_saved": self.calls_saved,
+        }
+
+
+class ProtectCacheSet:
+    """One ProtectCache per (host, port, policy), sharing a per-process HMAC secret."""
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 600.0, secret: Optional[bytes] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # random per-process secret unless one is configured
+        self._secret = secret or os.urandom(32)
+        self._caches: Dict[Tuple[Hashable, ...], ProtectCache] = {}
+        self._lock = threading.Lock()
+
+    def get(self, host: str, port: int, policy: str) -> ProtectCache:
+        key = (host, port, policy)
+        with self._lock:
+            cache = self._caches.get(key)
+            if cache is None:
+                cache = self._caches[key] = ProtectCache(self._secret, self.max_entries, self.ttl)
+            return cache
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            items = list(self._caches.items())
+        return {f"{host}:{port}/{policy}": cache.stats() for (host, port, policy), cache in items}
@@ -1,13 +1,19 @@
 import argparse
 import json
 import logging
+import sqlite3
+import sys
 import time
 from dataclasses import dataclass
 from typing import Optional
 
-from .client import APIError, APIResponse, ProtectRevealClient
-from .runner import IterationResult, run_bulk_iteration, run_iteration
-from .utils import increment_numeric_string
+from .endpoints import STRATEGIES
+from .history import DEFAULT_HISTORY_DB, RunHistory, compare_runs, config_differences
+from .inputs import INPUT_FORMATS, count_file_values
+from .load import ResultCollector, make_client, run_load
+from .openloop import run_open_loop
+from .sinks import open_sink
+from .summary import RunSummary
 
 
 @dataclass
@@ -23,16 +29,43 @@ class Config:
     show_progress: bool = False
     bulk: bool = False
     batch_size: int = 25
+    pipeline_depth: int = 1
+    concurrency: int = 1
+    workers: int = 1
+    rate: float = 0.0
+    summary_json: Optional[str] = None
+    output: Optional[str] = None
+    output_format: str = "jsonl"
+    input_file: Optional[str] = None
+    input_format: str = "lines"
+    csv_column: str = "0"
+    protect_cache_size: int = 0
+    retries: int = 0
+    breaker_threshold: int = 0
+    endpoints: Optional[str] = None
+    lb_strategy: str = "ewma"
     username: Optional[str] = None
+    history_db: str = DEFAULT_HISTORY_DB
+    no_history: bool = False
+    label: Optional[str] = None
 
     @classmethod
     def from_args(cls, argv: Optional[list] = None) -> 'Config':
-        parser = argparse.ArgumentParser(description="Loop protect/reveal calls and measure time")
+        parser = argparse.ArgumentParser(
+            description="Loop protect/reveal calls and measure time",
+            epilog="saved runs: `history` lists them, `compare BASELINE [CANDIDATE]` flags regressions "
+            "(see `history -h` / `compare -h`)",
+        )
         parser.add_argument("--host", default=cls.host, help="API host")
         parser.add_argument("--port", default=cls.port, type=int, help="API port")
         parser.add_argument("--policy", default=cls.policy, help="protection_policy_name")
         parser.add_argument("--start-data", default=cls.start_data, help="numeric data to start from")
-        parser.add_argument("--iterations", default=cls.iterations, type=int, help="number of iterations")
+        parser.add_argument(
+            "--iterations",
+            default=None,
+            type=int,
+            help=f"number of iterations (default {cls.iterations}, or every value of --input-file)",
+        )
         parser.add_argument("--timeout", default=cls.timeout, type=int, help="per-request timeout seconds")
         parser.add_argument("--verbose", action="store_true", help="enable debug logging")
         parser.add_argument("--show-bodies", action="store_true", help="print request and response JSON bodies")
@@ -44,176 +77,275 @@ class Config:
         )
         parser.add_argument("--bulk", action="store_true", help="use bulk protect/reveal endpoints")
         parser.add_argument("--batch-size", default=25, type=int, help="batch size for bulk operations (default 25)")
+        parser.add_argument(
+            "--pipeline-depth",
+            default=cls.pipeline_depth,
+            type=int,
+            help="number of bulk batches kept in flight at once (default 1 = sequential)",
+        )
+        parser.add_argument(
+            "--concurrency",
+            default=cls.concurrency,
+            type=int,
+            help="number of concurrent threads per worker sharing a pooled session (default 1)",
+        )
+        parser.add_argument(
+            "--workers",
+            default=cls.workers,
+            type=int,
+            help="number of worker processes, each running --concurrency threads (default 1)",
+        )
+        parser.add_argument(
+            "--rate",
+            default=cls.rate,
+            type=float,
+            help="open-loop mode: issue requests (or bulk batches) at this many per second regardless of completions; "
+            "latency is measured from the intended send time",
+        )
+        parser.add_argument(
+            "--summary-json",
+            default=None,
+            help="also write the summary (counts and per-phase latency percentiles) as JSON to this path ('-' for stdout)",
+        )
+        parser.add_argument(
+            "--output",
+            default=None,
+            help="stream every iteration/batch result to this file as it completes "
+            "(with --workers, each worker process writes <name>.w<N>.<ext>)",
+        )
+        parser.add_argument(
+            "--output-format",
+            default=cls.output_format,
+            choices=("jsonl", "csv"),
+            help="format for --output (default jsonl)",
+        )
+        parser.add_argument(
+            "--input-file",
+            default=None,
+            help="replay values from this file instead of the --start-data sequence (streamed, never loaded whole)",
+        )
+        parser.add_argument(
+            "--input-format",
+            default=cls.input_format,
+            choices=INPUT_FORMATS,
+            help="--input-file format: one value per line, or a column of a CSV with a header row (default lines)",
+        )
+        parser.add_argument(
+            "--csv-column",
+            default=cls.csv_column,
+            help="CSV header name or 0-based column index to read with --input-format csv (default 0)",
+        )
+        parser.add_argument(
+            "--protect-cache-size",
+            default=cls.protect_cache_size,
+            type=int,
+            help="memoize up to this many protect results per process, keyed by HMAC of the value (default 0 = off)",
+        )
+        parser.add_argument(
+            "--retries",
+            default=cls.retries,
+            type=int,
+            help="retry requests whose connection failed (and GETs on 502/503/504) up to N times "
+            "with jittered exponential backoff (default 0)",
+        )
+        parser.add_argument(
+            "--breaker-threshold",
+            default=cls.breaker_threshold,
+            type=int,
+            help="fail fast after N consecutive transport errors/5xx until CRDP recovers (default 0 = off)",
+        )
+        parser.add_argument(
+            "--endpoints",
+            default=None,
+            help="comma-separated host[:port] CRDP nodes to spread requests over "
+            "(failing nodes are ejected for a while and re-admitted automatically)",
+        )
+        parser.add_argument(
+            "--lb-strategy",
+            default=cls.lb_strategy,
+            choices=STRATEGIES,
+            help="node selection with --endpoints: EWMA latency x outstanding, or fewest outstanding (default ewma)",
+        )
         parser.add_argument("--username", default=None, help="username to include in reveal operations (optional)")
+        parser.add_argument(
+            "--history-db",
+            default=cls.history_db,
+            help=f"SQLite file the run's settings and results are saved to (default {cls.history_db})",
+        )
+        parser.add_argument("--no-history", action="store_true", help="do not save this run to --history-db")
+        parser.add_argument(
+            "--label",
+            default=None,
+            help="tag the saved run (e.g. 'baseline' or a CRDP version) so `compare` can refer to it by name",
+        )
         args = parser.parse_args(argv)
+        if args.iterations is None:
+            if args.input_file:
+                try:
+                    args.iterations = count_file_values(args.input_file, args.input_format, args.csv_column)
+                except (OSError, ValueError) as e:
+                    parser.error(f"--input-file: {e}")
+            else:
+                args.iterations = cls.iterations
+        if args.rate < 0:
+            parser.error("--rate must be positive")
+        if args.rate and args.workers > 1:
+            parser.error("--rate runs in a single process; use --concurrency for more outstanding requests")
         return cls(**vars(args))
 
 
+def history_main(argv: list) -> int:
+    """``history``: list saved runs, most recent first."""
+    parser = argparse.ArgumentParser(prog="protect_reveal history", description="List saved runs")
+    parser.add_argument("--history-db", default=DEFAULT_HISTORY_DB, help="run history SQLite file")
+    parser.add_argument("--limit", default=20, type=int, help="number of runs to show (default 20)")
+    parser.add_argument("--host", default=None, help="only runs against this host")
+    parser.add_argument("--policy", default=None, help="only runs with this policy")
+    args = parser.parse_args(argv)
+    with RunHistory(args.history_db) as history:
+        rows = history.list(limit=args.limit, host=args.host, policy=args.policy)
+    print(f"{'id':>5}  {'created':19}  {'label':12}  {'target':24}  {'policy':8}  {'mode':15}  {'conc':>5}  "
+          f"{'items':>8}  {'errors':>6}  {'items/s':>9}")
+    for row in rows:
+        mode = f"bulk x{row['batch_size']}" if row["bulk"] else "single"
+        if row["rate"]:
+            mode += f" @{row['rate']:g}/s"
+        print(
+            f"{row['id']:>5}  {row['created_at']:19}  {row['label'] or '-':12}  {row['host'] + ':' + str(row['port']):24}  "
+            f"{row['policy']:8}  {mode:15}  {row['concurrency'] * row['workers']:>5}  {row['attempted']:>8}  "
+            f"{row['attempted'] - row['successful']:>6}  {row['throughput_per_s']:>9.1f}"
+        )
+    return 0
+
+
+def compare_main(argv: list) -> int:
+    """``compare``: flag significant regressions of one saved run against another; exits 1 if any."""
+    parser = argparse.ArgumentParser(
+        prog="protect_reveal compare",
+        description="Compare two saved runs. A run is referred to by id, 'latest', or label (most recent with it).",
+    )
+    parser.add_argument("baseline", help="baseline run: id, 'latest' or label")
+    parser.add_argument("candidate", nargs="?", default="latest", help="run to check (default latest)")
+    parser.add_argument("--history-db", default=DEFAULT_HISTORY_DB, help="run history SQLite file")
+    parser.add_argument("--alpha", default=0.05, type=float, help="significance level of the tests (default 0.05)")
+    parser.add_argument(
+        "--min-change",
+        default=0.05,
+        type=float,
+        help="smallest relative increase of a mean latency counted as a regression (default 0.05)",
+    )
+    parser.add_argument(
+        "--throughput-drop",
+        default=0.10,
+        type=float,
+        help="relative throughput drop counted as a regression (default 0.10)",
+    )
+    parser.add_argument("--json", action="store_true", help="print the comparison as JSON")
+    args = parser.parse_args(argv)
+    with RunHistory(args.history_db) as history:
+        try:
+            baseline = history.get(args.baseline)
+            candidate = history.get(args.candidate)
+        except KeyError as e:
+            parser.error(str(e.args[0]))
+    findings = compare_runs(
+        baseline, candidate, alpha=args.alpha, min_change=args.min_change, throughput_drop=args.throughput_drop
+    )
+    differences = config_differences(baseline, candidate)
+    regressions = [f for f in findings if f.regression]
+
+    if args.json:
+        out = {
+            "baseline": baseline.id,
+            "candidate": candidate.id,
+            "config_differences": differences,
+            "findings": [vars(f) for f in findings],
+            "regressions": [f.metric for f in regressions],
+        }
+        print(json.dumps(out, ensure_ascii=False, indent=2))
+    else:
+        print(f"Baseline  #{baseline.id} {baseline.created_at} {baseline.label or ''}".rstrip())
+        print(f"Candidate #{candidate.id} {candidate.created_at} {candidate.label or ''}".rstrip())
+        for line in differences:
+            print(f"  warning: settings differ, {line}")
+        print(f"{'metric':24} {'baseline':>12} {'candidate':>12} {'change':>9} {'p-value':>9}")
+        for f in findings:
+            change = f"{f.change * 100:+.1f}%" if f.metric != "error_rate" else f"{f.change * 100:+.2f}pt"
+            p_value = f"{f.p_value:.4f}" if f.p_value is not None else "-"
+            flag = "  REGRESSION" if f.regression else ""
+            print(f"{f.metric:24} {f.baseline:>12.6g} {f.candidate:>12.6g} {change:>9} {p_value:>9}{flag}")
+        print(f"{len(regressions)} significant regression(s)" if regressions else "No significant regressions")
+    return 1 if regressions else 0
+
+
+SUBCOMMANDS = {"history": history_main, "compare": compare_main}
+
+
 def main(argv: Optional[list] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in SUBCOMMANDS:
+        return SUBCOMMANDS[argv[0]](argv[1:])
     config = Config.from_args(argv)
     logging.basicConfig(level=logging.DEBUG if config.verbose else logging.INFO, format="%(message)s")
     logger = logging.getLogger("protect_reveal")
 
-    client = ProtectRevealClient(host=config.host, port=config.port, policy=config.policy, timeout=config.timeout)
-
-    if config.bulk:
-        # build inputs
-        inputs = []
-        cur = config.start_data
-        for _ in range(config.iterations):
-            inputs.append(cur)
-            try:
-                cur = increment_numeric_string(cur)
-            except Exception:
-                break
-
-        t0 = time.perf_counter()
-        bulk_results = run_bulk_iteration(client, inputs, batch_size=config.batch_size, username=config.username)
-        t1 = time.perf_counter()
-
-        # detailed per-batch JSON only when requested
-        for idx, b in enumerate(bulk_results, start=1):
-            if config.show_bodies:
-                pbody = getattr(b.protect_response, 'body', {}) or {}
-                rbody = getattr(b.reveal_response, 'body', {}) or {}
-                preq = getattr(b.protect_response, 'request_payload', None)
-                rreq = getattr(b.reveal_response, 'request_payload', None)
-                purl = getattr(b.protect_response, 'request_url', None)
-                rurl = getattr(b.reveal_response, 'request_url', None)
-                pheaders = getattr(b.protect_response, 'request_headers', None)
-                rheaders = getattr(b.reveal_response, 'request_headers', None)
-                # Print raw server response bodies and include the request payloads for traceability
-                print(
-                    json.dumps(
-                        {
-                            "batch": idx,
-                            "protect": {"request": {"url": purl, "headers": pheaders, "body": preq}, "response": pbody},
-                            "reveal": {"request": {"url": rurl, "headers": rheaders, "body": rreq}, "response": rbody},
-                            "time_s": b.time_s,
-                        },
-                        ensure_ascii=False,
-                        indent=2,
-                    )
-                )
-
-        # overall summary aligned with non-bulk output
-        total_items = sum(len(b.inputs) for b in bulk_results)
-        # Count successful items: prefer exact full-batch success, otherwise fall back to restored count
-        successful_items = 0
-        matched = 0
-        for b in bulk_results:
-            # matches per item when restore equals input
-            try:
-                matched += sum(1 for m in b.matches if m)
-            except Exception:
-                pass
-            if (
-                getattr(b.protect_response, "is_success", False)
-                and getattr(b.reveal_response, "is_success", False)
-                and len(b.restored_values) == len(b.inputs)
-            ):
-                successful_items += len(b.inputs)
-            else:
-                successful_items += len(b.restored_values)
-
-        wall_total = t1 - t0
-        sum_batch_times = sum(getattr(b, 'time_s', 0.0) for b in bulk_results)
-
-        logger.info("\nSummary:")
-        logger.info("Iterations attempted: %d", total_items)
-        logger.info("Successful (both 2xx): %d", successful_items)
-        logger.info("Revealed matched original data: %d", matched)
-        logger.info("Total time: %.4fs", wall_total)
-        if total_items:
-            avg_per_iter = (sum_batch_times / total_items)
-            logger.info("Average per-iteration time: %.4fs", avg_per_iter)
-        return 0
-
-    # non-bulk iterative path
-    current = config.start_data
-    results = []
-    t_start = time.perf_counter()
-
-    for i in range(1, config.iterations + 1):
-        try:
-            result = run_iteration(client, current, username=config.username)
-            results.append(result)
-
-            if config.show_progress:
-                logger.info(
-                    "#%03d data=%s time=%.4fs protect_status=%s reveal_status=%s match=%s",
-                    i,
-                    current,
-                    result.time_s,
-                    result.protect_response.status_code,
-                    result.reveal_response.status_code,
-                    result.match,
-                )
-
-            # show_bodies: print raw server response bodies and include request payloads
-            if config.show_bodies:
-                pbody = getattr(result.protect_response, 'body', {}) or {}
-                rbody = getattr(result.reveal_response, 'body', {}) or {}
-                preq = getattr(result.protect_response, 'request_payload', None)
-                rreq = getattr(result.reveal_response, 'request_payload', None)
-                purl = getattr(result.protect_response, 'request_url', None)
-                rurl = getattr(result.reveal_response, 'request_url', None)
-                pheaders = getattr(result.protect_response, 'request_headers', None)
-                rheaders = getattr(result.reveal_response, 'request_headers', None)
-                print(
-                    json.dumps(
-                        {"batch": i,
-                         "protect": {"request": {"url": purl, "headers": pheaders, "body": preq}, "response": pbody},
-                         "reveal": {"request": {"url": rurl, "headers": rheaders, "body": rreq}, "response": rbody},
-                         "time_s": result.time_s},
-                        ensure_ascii=False,
-                        indent=2,
-                    )
-                )
-
-            try:
-                current = increment_numeric_string(current)
-            except ValueError:
-                logger.error("data '%s' is not numeric; stopping iterations", current)
-                break
-
-        except APIError as e:
-            logger.error("API error: %s (status=%s)", e, e.status_code)
-            if config.verbose:
-                logger.exception("Full traceback:")
-            results.append(
-                IterationResult(
-                    data=current,
-                    protect_response=e.response or APIResponse(None, None),
-                    reveal_response=e.response or APIResponse(None, None),
-                    protected_token=None,
-                    restored=None,
-                    time_s=0.0,
-                )
-            )
-            try:
-                current = increment_numeric_string(current)
-            except Exception:
-                break
-        except Exception as e:
-            logger.error("Unexpected error: %s", e)
-            if config.verbose:
-                logger.exception("Full traceback:")
-            break
-
-    t_end = time.perf_counter()
-    total = t_end - t_start
-
-    successful = sum(1 for r in results if getattr(r, 'success', False))
-    matched = sum(1 for r in results if getattr(r, 'match', False))
-
-    logger.info("\nSummary:")
-    logger.info("Iterations attempted: %d", len(results))
-    logger.info("Successful (both 2xx): %d", successful)
-    logger.info("Revealed matched original data: %d", matched)
-    logger.info("Total time: %.4fs", total)
-    if results:
-        avg = sum(getattr(r, 'time_s', 0.0) for r in results) / len(results)
-        logger.info("Average per-iteration time: %.4fs", avg)
+    client = make_client(config)
+    summary = RunSummary(mode=f"open-loop, target rate {config.rate:g} req/s" if config.rate else "closed-loop")
+    # results are streamed into the summary (and optional --output sink) as they complete;
+    # worker processes open their own per-worker sinks
+    sink = None
+    if config.workers <= 1 or config.rate:
+        sink = open_sink(config.output, config.output_format, bulk=config.bulk, scheduled=bool(config.rate))
+    collector = ResultCollector(config, summary, sink)
+
+    t0 = time.perf_counter()
+    try:
+        if config.rate:
+            run_open_loop(client, config, collector)
+        else:
+            run_load(config, collector, client=client)
+    finally:
+        collector.close()
+        client.close()
+    t1 = time.perf_counter()
+    summary.wall_time_s = t1 - t0
 
+    summary.log(logger)
+    if client.protect_cache is not None:
+        stats = client.protect_cache.stats()
+        logger.info(
+            "Protect cache:   hits=%d misses=%d hit_ratio=%.1f%% upstream_calls_saved=%d",
+            stats["hits"],
+            stats["misses"],
+            stats["hit_ratio"] * 100,
+            stats["upstream_calls_saved"],
+        )
+    if client.pool is not None:
+        for node in client.pool.snapshot():
+            logger.info(
+                "Endpoint %s: requests=%d failures=%d ejections=%d ewma=%s",
+                node["endpoint"],
+                node["requests"],
+                node["failures"],
+                node["ejections"],
+                f"{node['ewma_ms']:.2f}ms" if node["ewma_ms"] is not None else "-",
+            )
+    if not config.no_history:
+        try:
+            with RunHistory(config.history_db) as history:
+                run_id = history.save(config, summary, label=config.label)
+            logger.info("Run saved as #%d in %s", run_id, config.history_db)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("Could not save run history to %s: %s", config.history_db, e)
+    if config.summary_json:
+        text = json.dumps(summary.to_dict(), ensure_ascii=False, indent=2)
+        if config.summary_json == "-":
+            print(text)
+        else:
+            with open(config.summary_json, "w", encoding="utf-8") as fh:
+                fh.write(text + "\n")
     return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,8 +1,18 @@
+import time
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Tuple
 from urllib.parse import urljoin
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+from .jsoncodec import EncodedJSON, dumps, encode_object_array, loads
+
+if TYPE_CHECKING:
+    from .cache import ProtectCache
+    from .endpoints import Endpoint, EndpointPool
+    from .resilience import CircuitBreaker, RetryPolicy
 
 
 class ProtectRevealError(Exception):
@@ -16,23 +26,41 @@ class APIError(ProtectRevealError):
         self.response = response
 
 
-@dataclass
+@dataclass(slots=True)
 class APIResponse:
     status_code: Optional[int]
     body: Any
     # 보내었던 요청 페이로드를 보존해 --show-bodies에서 요청 본문도 함께 출력할 수 있게 함
+    # (trace가 꺼진 lean 모드에서는 아래 요청 메타데이터를 채우지 않음)
     request_payload: Any = None
     # 요청 메타데이터: 최종 URL과 헤더
     request_url: Optional[str] = None
     request_headers: Optional[Dict[str, Any]] = None
+    # 요청 송신부터 응답 파싱까지 걸린 시간(초)
+    elapsed_s: float = 0.0
 
     @property
     def is_success(self) -> bool:
         return bool(self.status_code and str(self.status_code).startswith("2"))
 
 
-class ProtectRevealClient:
-    def __init__(self, host: str, port: int, policy: str, timeout: int = 10, healthz_port: Optional[int] = None):
+class BaseProtectRevealClient:
+    """Endpoint URLs, payload builders and response parsers shared by the sync and async clients."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        policy: str,
+        timeout: int = 10,
+        healthz_port: Optional[int] = None,
+        trace: bool = True,
+        protect_cache: Optional["ProtectCache"] = None,
+        breaker: Optional["CircuitBreaker"] = None,
+        retry: Optional["RetryPolicy"] = None,
+        pool: Optional["EndpointPool"] = None,
+        metrics: Optional[Any] = None,
+    ):
         # Main API (protect/reveal) base URL
         self.host = host
         self.port = port
@@ -46,73 +74,231 @@ class ProtectRevealClient:
         self.healthz_url = f"http://{host}:{hz_port}/healthz"
         self.policy = policy
         self.timeout = timeout
-        self.session = requests.Session()
-        self.session.headers.update({"Content-Type": "application/json"})
+        # trace=False (lean mode): responses keep only status, parsed body and timing,
+        # not the request payload/URL/header copies used by --show-bodies and debug output
+        self.trace = trace
+        # optional memo of deterministic protect results (see cache.ProtectCache)
+        self.protect_cache = protect_cache
+        # optional fail-fast breaker for this endpoint and retry/backoff policy (see resilience)
+        self.breaker = breaker
+        self.retry = retry
+        # optional set of CRDP nodes: each POST attempt is sent to the node the pool picks,
+        # with base_url rewritten (healthz GETs stay on the configured host)
+        self.pool = pool
+        # optional upstream call recorder with started()/finished() (see app.core.metrics.UpstreamMetrics)
+        self.metrics = metrics
+        self._operations = {
+            self.protect_url: "protect",
+            self.protect_bulk_url: "protectbulk",
+            self.reveal_url: "reveal",
+            self.reveal_bulk_url: "revealbulk",
+            self.healthz_url: "healthz",
+        }
 
-    def get_json(self, url: str) -> APIResponse:
-        try:
-            resp = self.session.get(url, timeout=self.timeout)
-        except requests.RequestException as exc:
-            resp = getattr(exc, 'response', None)
-            if resp is None:
-                return APIResponse(None, str(exc))
+    def _begin(self, url: str, payload: Any) -> Optional[str]:
+        # operation label of a metered attempt (None when metrics are off)
+        if self.metrics is None:
+            return None
+        operation = self._operations.get(url, "other")
+        batch = None
+        if isinstance(payload, EncodedJSON):
+            batch = payload.items
+        elif isinstance(payload, dict):
+            items = payload.get("data_array", payload.get("protected_data_array"))
+            if isinstance(items, list):
+                batch = len(items)
+        self.metrics.started(operation, batch)
+        return operation
 
-        status = getattr(resp, 'status_code', None)
+    def _end(self, operation: Optional[str], response: Optional[APIResponse]) -> None:
+        if operation is None:
+            return
+        if response is None:
+            self.metrics.finished(operation, None, None)
+        else:
+            self.metrics.finished(operation, response.status_code, response.elapsed_s)
+
+    def _tracing(self, trace: Optional[bool]) -> bool:
+        return self.trace if trace is None else trace
+
+    @staticmethod
+    def _encode(payload: Any) -> bytes:
+        # pre-encoded bulk bodies go out as they are; everything else through the fast codec
+        return payload if isinstance(payload, EncodedJSON) else dumps(payload)
+
+    @staticmethod
+    def _decode(content: bytes, text: Any) -> Any:
+        # parsed JSON, or the raw text for non-JSON (e.g. empty or HTML error) bodies
         try:
-            body = resp.json()
+            return loads(content)
         except Exception:
-            body = getattr(resp, 'text', None)
+            return text() if callable(text) else text
+
+    def _route(self, method: str, url: str) -> Tuple[str, Optional["Endpoint"]]:
+        if self.pool is None or method != "POST":
+            return url, None
+        endpoint = self.pool.acquire()
+        return endpoint.rewrite(url, self.base_url), endpoint
+
+    def _report(self, endpoint: Optional["Endpoint"], response: Optional[APIResponse]) -> None:
+        # hand the attempt's outcome back to the pool (response None = abandoned attempt)
+        if endpoint is None:
+            return
+        if response is None:
+            self.pool.cancel(endpoint)
+            return
+        failed = response.status_code is None or response.status_code >= 500
+        self.pool.release(endpoint, response.elapsed_s, failed)
+
+    def _admit(self) -> bool:
+        # raises CircuitOpenError while the endpoint's breaker is open; True if this call is the half-open trial
+        if self.breaker is not None:
+            return self.breaker.before_call()
+        return False
+
+    def _abandon(self, trial: bool) -> None:
+        # the call ended without a recorded outcome: free the half-open trial so the next call can probe
+        if trial:
+            self.breaker.release_trial()
+
+    def _settle(self, response: APIResponse, attempt: int, safe: bool, guarded: bool = True) -> Optional[float]:
+        """Record an attempt's outcome; return the backoff before retrying, or None to return ``response``.
+
+        Transport errors and 5xx count as endpoint failures; ``safe`` marks attempts
+        that are always retryable (GETs, connections that never opened).
+        """
+        failed = response.status_code is None or response.status_code >= 500
+        if guarded and self.breaker is not None:
+            if failed:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+        if not failed or self.retry is None:
+            return None
+        if guarded and self.breaker is not None and self.breaker.is_open:
+            return None
+        return self.retry.delay(attempt, response.status_code, safe)
 
+    def _response(
+        self,
+        status: Optional[int],
+        body: Any,
+        elapsed_s: float,
+        url: str,
+        payload: Any,
+        headers: Mapping[str, Any],
+        trace: Optional[bool] = None,
+    ) -> APIResponse:
+        if not self._tracing(trace):
+            return APIResponse(status, body, elapsed_s=elapsed_s)
         return APIResponse(
             status,
             body,
-            request_payload=None,
+            request_payload=payload,
             request_url=url,
-            request_headers=dict(self.session.headers),
+            request_headers=dict(headers),
+            elapsed_s=elapsed_s,
         )
 
-    def post_json(self, url: str, payload: Dict[str, Any]) -> APIResponse:
-        try:
-            resp = self.session.post(url, json=payload, timeout=self.timeout)
-        except requests.RequestException as exc:
-            # network-level error, try to return any attached response, else error text
-            resp = getattr(exc, 'response', None)
-            if resp is None:
-                return APIResponse(None, str(exc))
+    def build_protect_payload(self, data: str) -> Dict[str, Any]:
+        return {
+            "protection_policy_name": self.policy,
+            "data": data,
+        }
 
-        # At this point we have a Response object (may have non-2xx status)
-        status = getattr(resp, 'status_code', None)
-        try:
-            body = resp.json()
-        except Exception:
-            body = getattr(resp, 'text', None)
+    # Protect cache helpers (no I/O; shared by the sync and async clients)
+    def _cached_protect(self, data: str, trace: Optional[bool] = None) -> Optional[APIResponse]:
+        if self.protect_cache is None:
+            return None
+        token = self.protect_cache.get(data)
+        if token is None:
+            return None
+        self.protect_cache.record_saved_call()
+        return APIResponse(200, {"protected_data": token}, request_url=self.protect_url if self._tracing(trace) else None)
+
+    def _remember_protect(self, data: str, response: APIResponse) -> None:
+        if self.protect_cache is None or not response.is_success:
+            return
+        token = self.extract_protected_from_protect_response(response)
+        if token is not None:
+            self.protect_cache.put(data, str(token))
 
+    def _split_cached_bulk(self, items: list) -> Tuple[List[Optional[str]], list]:
+        """Cached tokens per item (None = miss) and the distinct missing values to send upstream."""
+        cached = self.protect_cache.get_many(items)
+        misses = list(dict.fromkeys(v for v, t in zip(items, cached) if t is None))
+        return cached, misses
+
+    def _merge_cached_bulk(
+        self,
+        items: list,
+        cached: List[Optional[str]],
+        misses: list,
+        response: Optional[APIResponse],
+        trace: Optional[bool] = None,
+    ) -> APIResponse:
+        """Combine cache hits with the upstream result for ``misses`` into one bulk response."""
+        if response is None:
+            # every item was cached: no upstream call at all
+            self.protect_cache.record_saved_call()
+            url = self.protect_bulk_url if self._tracing(trace) else None
+            status, meta = 200, APIResponse(200, None, request_url=url)
+        else:
+            if not response.is_success:
+                return response
+            tokens = self.extract_protected_list_from_protect_response(response)
+            if len(tokens) != len(misses):
+                # never hand back a misses-only array: callers index it by the original items
+                return APIResponse(
+                    502,
+                    f"bulk protect returned {len(tokens)} values for {len(misses)} items",
+                    request_url=response.request_url,
+                    request_headers=response.request_headers,
+                )
+            self.protect_cache.put_many(misses, tokens)
+            by_value = dict(zip(misses, tokens))
+            cached = [t if t is not None else by_value[v] for v, t in zip(items, cached)]
+            status, meta = response.status_code, response
         return APIResponse(
             status,
-            body,
-            request_payload=payload,
-            request_url=url,
-            request_headers=dict(self.session.headers),
+            {"protected_data_array": [{"protected_data": t} for t in cached]},
+            request_payload=meta.request_payload,
+            request_url=meta.request_url,
+            request_headers=meta.request_headers,
+            elapsed_s=meta.elapsed_s,
         )
 
-    # Bulk helpers
-    def protect_bulk(self, items: list) -> APIResponse:
-        """Send a bulk protect request. Payload: {protection_policy_name, data_array: [ ... ]}"""
+    # Sync protect helpers built on post_json (the async client overrides them)
+    def protect(self, data: str, trace: Optional[bool] = None) -> APIResponse:
+        """Protect a single value (served from the protect cache when possible)."""
+        cached = self._cached_protect(data, trace)
+        if cached is not None:
+            return cached
+        response = self.post_json(self.protect_url, self.build_protect_payload(data), trace=trace)
+        self._remember_protect(data, response)
+        return response
+
+    def protect_bulk(self, items: list, trace: Optional[bool] = None) -> APIResponse:
+        """Send a bulk protect request. Payload: {protection_policy_name, data_array: [ ... ]}
+
+        With a protect cache only the missing values are sent and the hits merged back in.
+        """
+        if self.protect_cache is None:
+            return self.post_json(self.protect_bulk_url, self.build_protect_bulk_payload(items), trace=trace)
+        cached, misses = self._split_cached_bulk(items)
+        response = None
+        if misses:
+            response = self.post_json(self.protect_bulk_url, self.build_protect_bulk_payload(misses), trace=trace)
+        return self._merge_cached_bulk(items, cached, misses, response, trace)
+
+    def build_protect_bulk_payload(self, items: list) -> Dict[str, Any]:
         # According to Thales API docs, only data_array is used for bulk protect
-        payload = {
+        return {
             "protection_policy_name": self.policy,
             "data_array": items,
         }
-        return self.post_json(self.protect_bulk_url, payload)
-
-    def reveal_bulk(self, protected_items: list, username: Optional[str] = None) -> APIResponse:
-        """Send a bulk reveal request.
 
-        protected_items may be a list of strings (tokens) or a list of dicts
-        containing at least the key 'protected_data' and optionally keys like
-        'external_version'. The payload will include the Thales-style
-        'protected_data_array' as required by the API.
-        """
+    def build_reveal_bulk_payload(self, protected_items: list, username: Optional[str] = None) -> Dict[str, Any]:
         # Build protected_data_array preserving any extra fields per-item
         pda = []
         for p in protected_items:
@@ -129,13 +315,26 @@ class ProtectRevealClient:
         }
         if username:
             payload["username"] = username
+        return payload
 
-        return self.post_json(self.reveal_bulk_url, payload)
+    def encode_reveal_bulk_payload(self, protected_items: list, username: Optional[str] = None) -> EncodedJSON:
+        """`build_reveal_bulk_payload` as pre-encoded bytes, spliced from fragments instead of per-item dicts."""
+        parts = [
+            b'{"protection_policy_name":',
+            dumps(self.policy),
+            b',"protected_data_array":',
+            encode_object_array("protected_data", protected_items),
+        ]
+        if username:
+            parts += [b',"username":', dumps(username)]
+        parts.append(b"}")
+        return EncodedJSON(b"".join(parts), items=len(protected_items))
 
-    # Healthz helper
-    def healthz(self) -> APIResponse:
-        """Call CRDP healthz endpoint (GET /healthz)."""
-        return self.get_json(self.healthz_url)
+    def reveal_bulk_payload(self, protected_items: list, username: Optional[str], trace: Optional[bool]) -> Any:
+        # traced calls keep the dict so debug output and --show-bodies can echo it
+        if self._tracing(trace):
+            return self.build_reveal_bulk_payload(protected_items, username)
+        return self.encode_reveal_bulk_payload(protected_items, username)
 
     def extract_protected_list_from_protect_response(self, response: APIResponse) -> list:
         """Extract a list of protected tokens from a bulk protect response.
@@ -226,3 +425,134 @@ class ProtectRevealClient:
             if key in response.body:
                 return response.body.get(key)
         return None
+
+
+class ProtectRevealClient(BaseProtectRevealClient):
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        policy: str,
+        timeout: int = 10,
+        healthz_port: Optional[int] = None,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        trace: bool = True,
+        protect_cache: Optional["ProtectCache"] = None,
+        breaker: Optional["CircuitBreaker"] = None,
+        retry: Optional["RetryPolicy"] = None,
+        pool: Optional["EndpointPool"] = None,
+        metrics: Optional[Any] = None,
+    ):
+        super().__init__(
+            host,
+            port,
+            policy,
+            timeout=timeout,
+            healthz_port=healthz_port,
+            trace=trace,
+            protect_cache=protect_cache,
+            breaker=breaker,
+            retry=retry,
+            pool=pool,
+            metrics=metrics,
+        )
+        self.session = requests.Session()
+        self.session.headers.update({"Content-Type": "application/json"})
+        # keep-alive 연결을 재사용하도록 호스트당 커넥션 풀 크기를 제한 (노드 풀이면 노드마다 하나)
+        adapter = HTTPAdapter(pool_connections=len(pool.endpoints) if pool is not None else 1, pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self) -> None:
+        """Close the underlying session and its pooled connections."""
+        self.session.close()
+
+    def _send(self, method: str, url: str, payload: Any, trace: Optional[bool]) -> Tuple[APIResponse, bool]:
+        # one attempt: (response, whether the connection never opened)
+        operation = self._begin(url, payload)
+        url, endpoint = self._route(method, url)
+        response = None
+        try:
+            response, connect_failed = self._attempt(method, url, payload, trace)
+            return response, connect_failed
+        finally:
+            self._report(endpoint, response)
+            self._end(operation, response)
+
+    def _attempt(self, method: str, url: str, payload: Any, trace: Optional[bool]) -> Tuple[APIResponse, bool]:
+        t0 = time.perf_counter()
+        try:
+            if method == "GET":
+                resp = self.session.get(url, timeout=self.timeout)
+            else:
+                resp = self.session.post(url, data=self._encode(payload), timeout=self.timeout)
+        except requests.RequestException as exc:
+            # network-level error, try to return any attached response, else error text
+            resp = getattr(exc, 'response', None)
+            if resp is None:
+                return APIResponse(None, str(exc), elapsed_s=time.perf_counter() - t0), _connect_failed(exc)
+
+        # At this point we have a Response object (may have non-2xx status)
+        status = getattr(resp, 'status_code', None)
+        body = self._decode(resp.content, lambda: getattr(resp, 'text', None))
+
+        headers = self.session.headers
+        return self._response(status, body, time.perf_counter() - t0, url, payload, headers, trace), False
+
+    def get_json(self, url: str, trace: Optional[bool] = None) -> APIResponse:
+        """GET with retries; not gated by the breaker so health probes keep reporting during an outage."""
+        attempt = 0
+        while True:
+            response, _ = self._send("GET", url, None, trace)
+            delay = self._settle(response, attempt, safe=True, guarded=False)
+            if delay is None:
+                return response
+            time.sleep(delay)
+            attempt += 1
+
+    def post_json(self, url: str, payload: Any, trace: Optional[bool] = None) -> APIResponse:
+        trial = self._admit()
+        attempt = 0
+        try:
+            while True:
+                response, connect_failed = self._send("POST", url, payload, trace)
+                delay = self._settle(response, attempt, safe=connect_failed)
+                if delay is None:
+                    return response
+                time.sleep(delay)
+                attempt += 1
+        except BaseException:
+            self._abandon(trial)
+            raise
+
+    # Bulk helpers (protect_bulk is inherited from BaseProtectRevealClient)
+    def reveal_bulk(
+        self,
+        protected_items: list,
+        username: Optional[str] = None,
+        trace: Optional[bool] = None,
+    ) -> APIResponse:
+        """Send a bulk reveal request.
+
+        protected_items may be a list of strings (tokens) or a list of dicts
+        containing at least the key 'protected_data' and optionally keys like
+        'external_version'. The payload will include the Thales-style
+        'protected_data_array' as required by the API.
+        """
+        return self.post_json(
+            self.reveal_bulk_url, self.reveal_bulk_payload(protected_items, username, trace), trace=trace
+        )
+
+    # Healthz helper
+    def healthz(self) -> APIResponse:
+        """Call CRDP healthz endpoint (GET /healthz)."""
+        return self.get_json(self.healthz_url)
+
+
+def _connect_failed(exc: requests.RequestException) -> bool:
+    # the request never reached CRDP (connect timeout / refused), so it is safe to resend
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(exc.args[0], "reason", None) if exc.args else None
+    return isinstance(reason, NewConnectionError)
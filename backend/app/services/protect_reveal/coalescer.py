@@ -0,0 +1,167 @@
+"""단건 protect/reveal 요청의 서버 측 micro-batching.
+
+같은 (host, port, policy, username) 으로 짧은 시간 창(window) 안에 들어온 단건 요청을 모아
+`protect_bulk`/`reveal_bulk` 한 번으로 보내고, 각 호출자에게는 자기 값에 해당하는
+단건 형태의 `APIResponse`를 돌려줍니다. 부하가 높을 때 upstream 왕복 횟수를 줄이는 용도입니다.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from .async_client import AsyncProtectRevealClient
+from .client import APIError, APIResponse
+
+BatchKey = Tuple[Hashable, ...]
+
+# failures that say nothing about the values sent (no response, overload, node down):
+# these reach every caller instead of splitting the batch, which would only multiply load
+UNSPLIT_STATUSES = (None, 429, 503, 504)
+
+
+@dataclass
+class _PendingBatch:
+    client: AsyncProtectRevealClient
+    operation: str
+    username: Optional[str]
+    values: List[str] = field(default_factory=list)
+    futures: List[asyncio.Future] = field(default_factory=list)
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+class BulkCoalescer:
+    """Collects concurrent single-item calls into bulk upstream calls.
+
+    A batch is sent when it reaches ``max_batch`` items or ``window_s`` seconds
+    after its first item, whichever comes first. A failed or short bulk reply is
+    retried in halves so a bad value only fails its own caller; exceptions and
+    UNSPLIT_STATUSES failures are delivered to every caller in the batch.
+    """
+
+    def __init__(self, max_batch: int = 100, window_s: float = 0.002):
+        self.max_batch = max(1, max_batch)
+        self.window_s = max(0.0, window_s)
+        self.batches_sent = 0
+        self.items_sent = 0
+        self.splits = 0
+        self._pending: Dict[BatchKey, _PendingBatch] = {}
+        self._sending: set = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def protect(self, client: AsyncProtectRevealClient, data: str) -> APIResponse:
+        """Protect ``data`` as part of a coalesced protect_bulk call."""
+        return await self._submit(client, "protect", data, None)
+
+    async def reveal(self, client: AsyncProtectRevealClient, protected_data: str, username: Optional[str] = None) -> APIResponse:
+        """Reveal ``protected_data`` as part of a coalesced reveal_bulk call."""
+        return await self._submit(client, "reveal", protected_data, username)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "batches_sent": self.batches_sent,
+            "items_sent": self.items_sent,
+            "avg_batch_size": self.items_sent / self.batches_sent if self.batches_sent else 0.0,
+            "splits": self.splits,
+        }
+
+    async def _submit(self, client: AsyncProtectRevealClient, operation: str, value: str, username: Optional[str]) -> APIResponse:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # pending batches and timers belong to the loop that created them
+            self._pending.clear()
+            self._loop = loop
+        key: BatchKey = (client.host, client.port, client.policy, operation, username)
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = _PendingBatch(client, operation, username)
+            batch.timer = loop.call_later(self.window_s, self._flush, key)
+        future = loop.create_future()
+        batch.values.append(value)
+        batch.futures.append(future)
+        if len(batch.values) >= self.max_batch:
+            self._flush(key)
+        return await future
+
+    def _flush(self, key: BatchKey) -> None:
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.ensure_future(self._send(batch))
+        # keep a reference until the send finishes so the task is not garbage-collected
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    async def _send(self, batch: _PendingBatch) -> None:
+        self.batches_sent += 1
+        self.items_sent += len(batch.values)
+        try:
+            await self._resolve(batch, batch.values, batch.futures)
+        except asyncio.CancelledError:
+            # the send itself was cancelled (e.g. shutdown): callers must not wait forever
+            self._fail(batch.futures, APIError(f"coalesced bulk {batch.operation} was cancelled"))
+            raise
+        except Exception as e:
+            self._fail(batch.futures, e)
+        except BaseException as e:
+            self._fail(batch.futures, APIError(f"coalesced bulk {batch.operation} aborted: {type(e).__name__}"))
+            raise
+
+    @staticmethod
+    def _fail(futures: List[asyncio.Future], error: Exception) -> None:
+        for future in futures:
+            if not future.done():
+                future.set_exception(error)
+
+    async def _call(self, batch: _PendingBatch, values: List[str]) -> Tuple[APIResponse, List[Any]]:
+        # debug callers bypass the coalescer, so the shared call never needs request copies
+        client = batch.client
+        if batch.operation == "protect":
+            response = await client.protect_bulk(values, trace=False)
+            extract = client.extract_protected_list_from_protect_response
+        else:
+            response = await client.reveal_bulk(values, username=batch.username, trace=False)
+            extract = client.extract_restored_list_from_reveal_response
+        results = extract(response) if response.is_success else []
+        if response.is_success and len(results) != len(values):
+            response = APIResponse(
+                502,
+                f"bulk {batch.operation} returned {len(results)} values for {len(values)} items",
+                request_url=response.request_url,
+                request_headers=response.request_headers,
+            )
+        return response, results
+
+    async def _resolve(self, batch: _PendingBatch, values: List[str], futures: List[asyncio.Future]) -> None:
+        response, results = await self._call(batch, values)
+        if not response.is_success:
+            if len(values) > 1 and response.status_code not in UNSPLIT_STATUSES:
+                # one bad value (e.g. an invalid token) must not fail the unrelated callers
+                # merged with it: retry each half until the failure is isolated
+                self.splits += 1
+                mid = len(values) // 2
+                await asyncio.gather(
+                    self._resolve(batch, values[:mid], futures[:mid]),
+                    self._resolve(batch, values[mid:], futures[mid:]),
+                )
+                return
+            for future in futures:
+                if not future.done():
+                    future.set_result(response)
+            return
+        field_name = "protected_data" if batch.operation == "protect" else "data"
+        for future, result in zip(futures, results):
+            if future.done():
+                # caller went away (e.g. client disconnect)
+                continue
+            future.set_result(
+                APIResponse(
+                    response.status_code,
+                    {field_name: result},
+                    request_payload=response.request_payload,
+                    request_url=response.request_url,
+                    request_headers=response.request_headers,
+                    elapsed_s=response.elapsed_s,
+                )
+            )
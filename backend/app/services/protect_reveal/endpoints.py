@@ -0,0 +1,164 @@
+"""여러 CRDP 노드에 요청을 분산하는 엔드포인트 풀.
+
+요청마다 진행 중 요청 수(least-outstanding) 또는 EWMA 지연 시간 x 진행 중 요청 수(ewma)로
+노드를 고르고, 연속으로 실패한 노드는 일정 시간 제외(ejection)했다가 자동으로 다시 투입합니다.
+클라이언트는 기본 base URL을 선택된 노드의 base URL로 바꿔 보내므로 경로/페이로드는 그대로입니다.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+STRATEGIES = ("ewma", "least_outstanding")
+
+
+def parse_endpoints(values: Iterable[str], default_port: int) -> List[Tuple[str, int]]:
+    """Parse ``host[:port]`` strings into (host, port) pairs."""
+    out = []
+    for value in values:
+        value = value.strip()
+        if not value:
+            continue
+        host, sep, port = value.rpartition(":")
+        if sep and port.isdigit():
+            out.append((host, int(port)))
+        else:
+            out.append((value, default_port))
+    return out
+
+
+class Endpoint:
+    """One CRDP node and its passive health/latency statistics."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.base_url = f"http://{host}:{port}"
+        self.outstanding = 0
+        self.ewma_s: Optional[float] = None
+        self.measured_at = 0.0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.ejections = 0
+
+    def rewrite(self, url: str, base_url: str) -> str:
+        """Point ``url`` (built on ``base_url``) at this node."""
+        if url.startswith(base_url):
+            return self.base_url + url[len(base_url):]
+        return url
+
+
+class EndpointPool:
+    """Thread-safe pool of CRDP nodes with latency-aware selection and passive ejection."""
+
+    def __init__(
+        self,
+        endpoints: Iterable[Tuple[str, int]],
+        strategy: str = "ewma",
+        eject_after: int = 3,
+        eject_seconds: float = 30.0,
+        ewma_alpha: float = 0.3,
+        failure_penalty_s: float = 1.0,
+        aliases: Iterable[Tuple[str, int]] = (),
+        ewma_window_s: float = 10.0,
+    ):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"unsupported strategy: {strategy}")
+        self.endpoints = [Endpoint(host, port) for host, port in endpoints]
+        if not self.endpoints:
+            raise ValueError("endpoint pool needs at least one endpoint")
+        self.strategy = strategy
+        # extra addresses served by the pool (e.g. a default host that is a load balancer VIP)
+        self._addresses = {(ep.host, ep.port) for ep in self.endpoints} | {tuple(a) for a in aliases}
+        self.eject_after = max(1, eject_after)
+        self.eject_seconds = eject_seconds
+        self.ewma_alpha = ewma_alpha
+        # a failed call counts as at least this slow, so flaky nodes lose traffic before ejection
+        self.failure_penalty_s = failure_penalty_s
+        # a latency older than this is forgotten, so a node that was slow once gets traffic again
+        self.ewma_window_s = ewma_window_s
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def __contains__(self, address: Tuple[str, int]) -> bool:
+        return tuple(address) in self._addresses
+
+    def acquire(self) -> Endpoint:
+        """Pick a node for one request; must be paired with :meth:`release`."""
+        with self._lock:
+            now = time.monotonic()
+            candidates = [ep for ep in self.endpoints if ep.ejected_until <= now]
+            if not candidates:
+                # everything is ejected: try the node whose ejection ends first
+                candidates = [min(self.endpoints, key=lambda ep: ep.ejected_until)]
+            # rotate the starting point so ties spread evenly
+            start = self._next % len(candidates)
+            self._next += 1
+            ordered = candidates[start:] + candidates[:start]
+            endpoint = min(ordered, key=lambda ep: self._score(ep, now))
+            endpoint.outstanding += 1
+            endpoint.requests += 1
+            return endpoint
+
+    def release(self, endpoint: Endpoint, elapsed_s: float, failed: bool) -> None:
+        """Finish a request on ``endpoint``; ``failed`` means a transport error or 5xx."""
+        with self._lock:
+            endpoint.outstanding = max(0, endpoint.outstanding - 1)
+            if failed:
+                endpoint.failures += 1
+                endpoint.consecutive_failures += 1
+                if endpoint.consecutive_failures >= self.eject_after:
+                    endpoint.ejected_until = time.monotonic() + self.eject_seconds
+                    endpoint.ejections += 1
+                    endpoint.consecutive_failures = 0
+                    # re-admitted nodes start from the pool's typical latency, not their failure history
+                    endpoint.ewma_s = None
+                    return
+                elapsed_s = max(elapsed_s, self.failure_penalty_s)
+            else:
+                endpoint.consecutive_failures = 0
+            now = time.monotonic()
+            if self._latency(endpoint, now) is None:
+                endpoint.ewma_s = elapsed_s
+            else:
+                endpoint.ewma_s += self.ewma_alpha * (elapsed_s - endpoint.ewma_s)
+            endpoint.measured_at = now
+
+    def cancel(self, endpoint: Endpoint) -> None:
+        """Finish a request that was abandoned (e.g. cancelled) without judging the node."""
+        with self._lock:
+            endpoint.outstanding = max(0, endpoint.outstanding - 1)
+
+    def _latency(self, endpoint: Endpoint, now: float) -> Optional[float]:
+        if endpoint.ewma_s is None or now - endpoint.measured_at > self.ewma_window_s:
+            return None
+        return endpoint.ewma_s
+
+    def _score(self, endpoint: Endpoint, now: float) -> float:
+        if self.strategy == "least_outstanding":
+            return endpoint.outstanding
+        ewma = self._latency(endpoint, now)
+        if ewma is None:
+            # unmeasured (or stale) nodes look like the best measured one so they get traffic
+            known = [x for x in (self._latency(ep, now) for ep in self.endpoints) if x is not None]
+            ewma = min(known) if known else 0.0
+        return (ewma or 1e-6) * (endpoint.outstanding + 1)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "endpoint": ep.base_url,
+                    "ejected": ep.ejected_until > now,
+                    "ejected_for_s": max(0.0, ep.ejected_until - now),
+                    "outstanding": ep.outstanding,
+                    "ewma_ms": ep.ewma_s * 1000.0 if ep.ewma_s is not None else None,
+                    "requests": ep.requests,
+                    "failures": ep.failures,
+                    "ejections": ep.ejections,
+                }
+                for ep in self.endpoints
+            ]
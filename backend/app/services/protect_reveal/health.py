@@ -0,0 +1,139 @@
+"""CRDP 상태 점검과 백그라운드 프로버.
+
+`check_health`는 healthz GET과 protect 샘플 POST를 실행해 단계별 결과를 돌려주고,
+`HealthProber`는 설정된 CRDP 엔드포인트를 주기적으로 점검해 최신 상태와 지연 시간 이력을
+보관합니다. `/health` 요청은 이 스냅샷을 바로 반환하므로 UI 폴링이 CRDP에 부하를 주지 않습니다.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from .async_client import AsyncProtectRevealClient
+
+logger = logging.getLogger(__name__)
+
+ProbeKey = Tuple[Hashable, ...]
+
+
+async def check_health(client: AsyncProtectRevealClient, sample: str) -> Dict[str, Any]:
+    """Run the live healthz GET and protect sample POST; returns ``{"healthy", "latency_ms", "steps"}``."""
+    steps: List[Dict[str, Any]] = []
+    t0 = time.perf_counter()
+
+    # Step 1: CRDP healthz (GET)
+    try:
+        resp = await client.healthz()
+        steps.append({
+            "stage": "healthz",
+            "method": "GET",
+            "url": resp.request_url,
+            "status_code": resp.status_code,
+            "response": resp.body,
+            "headers": resp.request_headers,
+        })
+        ok_get = resp.is_success
+    except Exception as e:
+        steps.append({"stage": "healthz", "method": "GET", "error": str(e)})
+        ok_get = False
+
+    # Step 2: minimal protect sample (POST) for additional verification
+    payload = {"protection_policy_name": client.policy, "data": sample}
+    try:
+        resp2 = await client.post_json(client.protect_url, payload)
+        steps.append({
+            "stage": "protect_sample",
+            "method": "POST",
+            "url": resp2.request_url,
+            "request": payload,
+            "status_code": resp2.status_code,
+            "response": resp2.body,
+            "headers": resp2.request_headers,
+        })
+    except Exception as e:
+        steps.append({"stage": "protect_sample", "method": "POST", "error": str(e)})
+
+    return {"healthy": ok_get, "latency_ms": (time.perf_counter() - t0) * 1000.0, "steps": steps}
+
+
+@dataclass
+class HealthSnapshot:
+    result: Dict[str, Any]
+    checked_at: float
+    # (checked_at, healthy, latency_ms) of recent probes, oldest first
+    history: deque = field(default_factory=deque)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "checked_at": self.checked_at,
+            "age_s": max(0.0, time.time() - self.checked_at),
+            "history": [
+                {"checked_at": at, "healthy": healthy, "latency_ms": latency}
+                for at, healthy, latency in self.history
+            ],
+        }
+
+
+class HealthProber:
+    """Probes CRDP targets every ``interval`` seconds and keeps the latest snapshot per target.
+
+    ``targets`` returns ``(key, client)`` pairs on each round, so clients come from
+    the shared registry and follow its loop/eviction rules.
+    """
+
+    def __init__(
+        self,
+        targets: Callable[[], List[Tuple[ProbeKey, AsyncProtectRevealClient]]],
+        sample: str,
+        interval: float = 15.0,
+        history: int = 20,
+    ):
+        self._targets = targets
+        self.sample = sample
+        self.interval = interval
+        self.history = max(1, history)
+        self._snapshots: Dict[ProbeKey, HealthSnapshot] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def snapshot(self, key: ProbeKey) -> Optional[HealthSnapshot]:
+        return self._snapshots.get(key)
+
+    def record(self, key: ProbeKey, result: Dict[str, Any]) -> HealthSnapshot:
+        """Store a probe (or live check) result as the latest snapshot for ``key``."""
+        now = time.time()
+        snap = self._snapshots.get(key)
+        if snap is None:
+            snap = self._snapshots[key] = HealthSnapshot(result, now, deque(maxlen=self.history))
+        snap.result = result
+        snap.checked_at = now
+        snap.history.append((now, result["healthy"], round(result["latency_ms"], 3)))
+        return snap
+
+    async def probe_once(self) -> None:
+        for key, client in self._targets():
+            try:
+                self.record(key, await check_health(client, self.sample))
+            except Exception:
+                logger.exception("Health probe failed for %s", key)
+
+    async def _run(self) -> None:
+        while True:
+            await self.probe_once()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
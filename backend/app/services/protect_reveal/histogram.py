@@ -0,0 +1,110 @@
+"""고정 메모리 로그 버킷 지연 시간 히스토그램.
+
+값을 저장하지 않고 상대 오차(precision) 단위의 로그 버킷 카운트만 유지하므로
+반복 횟수와 관계없이 메모리 사용량이 일정하며, 프로세스/스레드별 히스토그램을 병합할 수 있습니다.
+"""
+
+import math
+from typing import Dict, List
+
+# percentiles reported in the CLI summary (text and JSON)
+SUMMARY_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram of durations in seconds.
+
+    Bucket boundaries grow by ``1 + precision``, so any reported percentile is
+    within ``precision`` (relative) of the true value. Values below ``lowest``
+    share the first bucket and values above ``highest`` the last one.
+    """
+
+    def __init__(self, lowest: float = 1e-6, highest: float = 3600.0, precision: float = 0.01):
+        if lowest <= 0 or highest <= lowest or precision <= 0:
+            raise ValueError("require 0 < lowest < highest and precision > 0")
+        self.lowest = lowest
+        self.highest = highest
+        self.precision = precision
+        self._log_base = math.log1p(precision)
+        self._buckets = int(math.ceil(math.log(highest / lowest) / self._log_base)) + 1
+        self.counts: List[int] = [0] * (self._buckets + 1)
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def _index(self, value: float) -> int:
+        if value <= self.lowest:
+            return 0
+        return min(self._buckets, int(math.log(value / self.lowest) / self._log_base) + 1)
+
+    def _upper_bound(self, index: int) -> float:
+        return self.lowest * (1.0 + self.precision) ** index
+
+    def record(self, value: float) -> None:
+        value = max(0.0, value)
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.total += value
+        self.total_sq += value * value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def stdev(self) -> float:
+        if self.count < 2:
+            return 0.0
+        var = (self.total_sq - self.total * self.total / self.count) / (self.count - 1)
+        return math.sqrt(max(0.0, var))
+
+    def percentile(self, pct: float) -> float:
+        """Return the value at percentile ``pct`` (0-100)."""
+        if not self.count:
+            return 0.0
+        target = max(1, int(math.ceil(pct / 100.0 * self.count)))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return min(self._upper_bound(index), self.max)
+        return self.max
+
+    def count_at_or_below(self, value: float) -> int:
+        """Number of recorded values in buckets up to the one holding ``value``."""
+        return sum(self.counts[: self._index(value) + 1])
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add another histogram with the same bucket layout into this one."""
+        if (other.lowest, other.highest, other.precision) != (self.lowest, self.highest, self.precision):
+            raise ValueError("cannot merge histograms with different bucket layouts")
+        for i, n in enumerate(other.counts):
+            if n:
+                self.counts[i] += n
+        self.count += other.count
+        self.total += other.total
+        self.total_sq += other.total_sq
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def to_dict(self) -> Dict[str, float]:
+        out: Dict[str, float] = {
+            "count": self.count,
+            "mean_s": self.mean,
+            "stdev_s": self.stdev,
+            "min_s": self.min if self.count else 0.0,
+        }
+        for pct in SUMMARY_PERCENTILES:
+            out[f"p{pct:g}_s"] = self.percentile(pct)
+        out["max_s"] = self.max
+        return out
+
+    def format(self) -> str:
+        parts = [f"p{pct:g}={self.percentile(pct):.4f}s" for pct in SUMMARY_PERCENTILES]
+        return " ".join(parts) + f" max={self.max:.4f}s (n={self.count})"
@@ -0,0 +1,330 @@
+"""CLI 실행 이력 저장소(SQLite)와 실행 간 회귀 비교.
+
+실행마다 설정(host, policy, 배치 크기, 동시성, 반복 횟수 등)과 결과(처리량, 단계별 지연
+백분위수, 오류 건수)를 로컬 SQLite 파일에 저장하고, 두 실행(또는 기준선 라벨)을 비교해
+통계적으로 유의한 지연/처리량/오류율 회귀를 표시합니다.
+
+지연 비교는 히스토그램의 건수·평균·표준편차로 Welch t-검정을, 오류율 비교는 두 비율 z-검정을
+사용합니다. 처리량은 실행당 값이 하나뿐이라 상대 변화량 기준으로만 판단합니다.
+"""
+
+import json
+import math
+import os
+import sqlite3
+import time
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from .summary import RunSummary
+
+if TYPE_CHECKING:
+    from .cli import Config
+
+DEFAULT_HISTORY_DB = os.path.join(os.path.expanduser("~"), ".crdp_webui", "protect_reveal_runs.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    label TEXT,
+    host TEXT NOT NULL,
+    port INTEGER NOT NULL,
+    policy TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    bulk INTEGER NOT NULL,
+    batch_size INTEGER NOT NULL,
+    concurrency INTEGER NOT NULL,
+    workers INTEGER NOT NULL,
+    rate REAL NOT NULL,
+    iterations INTEGER NOT NULL,
+    attempted INTEGER NOT NULL,
+    successful INTEGER NOT NULL,
+    matched INTEGER NOT NULL,
+    requests INTEGER NOT NULL,
+    wall_time_s REAL NOT NULL,
+    throughput_per_s REAL NOT NULL,
+    config TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_label ON runs (label, id);
+CREATE INDEX IF NOT EXISTS runs_target ON runs (host, policy, id);
+CREATE TABLE IF NOT EXISTS run_latency (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    phase TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    mean_s REAL NOT NULL,
+    stdev_s REAL NOT NULL,
+    p50_s REAL NOT NULL,
+    p90_s REAL NOT NULL,
+    p99_s REAL NOT NULL,
+    p999_s REAL NOT NULL,
+    max_s REAL NOT NULL,
+    PRIMARY KEY (run_id, phase)
+);
+"""
+
+# settings that make two runs comparable; a difference is reported as a warning
+_COMPARABLE = ("host", "policy", "bulk", "batch_size", "concurrency", "workers", "rate")
+
+
+@dataclass
+class PhaseStats:
+    count: int
+    mean_s: float
+    stdev_s: float
+    p50_s: float
+    p90_s: float
+    p99_s: float
+    p999_s: float
+    max_s: float
+
+
+@dataclass
+class StoredRun:
+    id: int
+    created_at: str
+    label: Optional[str]
+    config: Dict[str, Any]
+    attempted: int
+    successful: int
+    matched: int
+    requests: int
+    wall_time_s: float
+    throughput_per_s: float
+    latency: Dict[str, PhaseStats]
+
+    @property
+    def errors(self) -> int:
+        return self.attempted - self.successful
+
+
+class RunHistory:
+    """SQLite-backed store of CLI runs (one row per run, one row per latency phase)."""
+
+    def __init__(self, path: str = DEFAULT_HISTORY_DB):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "RunHistory":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def save(self, config: "Config", summary: RunSummary, label: Optional[str] = None) -> int:
+        """Store a finished run and return its id."""
+        data = summary.to_dict()
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO runs (created_at, label, host, port, policy, mode, bulk, batch_size, concurrency,"
+                " workers, rate, iterations, attempted, successful, matched, requests, wall_time_s,"
+                " throughput_per_s, config) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    time.strftime("%Y-%m-%d %H:%M:%S"),
+                    label,
+                    config.host,
+                    config.port,
+                    config.policy,
+                    summary.mode,
+                    int(config.bulk),
+                    config.batch_size,
+                    config.concurrency,
+                    config.workers,
+                    config.rate,
+                    config.iterations,
+                    summary.attempted,
+                    summary.successful,
+                    summary.matched,
+                    summary.requests,
+                    summary.wall_time_s,
+                    data["throughput_per_s"],
+                    json.dumps(asdict(config), ensure_ascii=False),
+                ),
+            )
+            run_id = cur.lastrowid
+            self.conn.executemany(
+                "INSERT INTO run_latency VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        run_id, phase, h["count"], h["mean_s"], h["stdev_s"],
+                        h["p50_s"], h["p90_s"], h["p99_s"], h["p99.9_s"], h["max_s"],
+                    )
+                    for phase, h in data["latency"].items()
+                    if h["count"]
+                ],
+            )
+        return run_id
+
+    def _load(self, row: Optional[tuple]) -> Optional[StoredRun]:
+        if row is None:
+            return None
+        run_id, created_at, label, attempted, successful, matched, requests, wall, tput, config = row
+        latency = {
+            phase: PhaseStats(*stats)
+            for phase, *stats in self.conn.execute(
+                "SELECT phase, count, mean_s, stdev_s, p50_s, p90_s, p99_s, p999_s, max_s"
+                " FROM run_latency WHERE run_id = ? ORDER BY phase",
+                (run_id,),
+            )
+        }
+        return StoredRun(
+            run_id, created_at, label, json.loads(config), attempted, successful, matched, requests, wall, tput, latency
+        )
+
+    _COLUMNS = "id, created_at, label, attempted, successful, matched, requests, wall_time_s, throughput_per_s, config"
+
+    def get(self, ref: str) -> StoredRun:
+        """Look up a run by id, ``latest``, or label (the most recent run with that label)."""
+        if ref == "latest":
+            row = self.conn.execute(f"SELECT {self._COLUMNS} FROM runs ORDER BY id DESC LIMIT 1").fetchone()
+        elif ref.isdigit():
+            row = self.conn.execute(f"SELECT {self._COLUMNS} FROM runs WHERE id = ?", (int(ref),)).fetchone()
+        else:
+            row = self.conn.execute(
+                f"SELECT {self._COLUMNS} FROM runs WHERE label = ? ORDER BY id DESC LIMIT 1", (ref,)
+            ).fetchone()
+        run = self._load(row)
+        if run is None:
+            raise KeyError(f"no run matching {ref!r} in {self.path}")
+        return run
+
+    def list(self, limit: int = 20, host: Optional[str] = None, policy: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Most recent runs first, as flat rows for display."""
+        where, params = [], []
+        if host:
+            where.append("host = ?")
+            params.append(host)
+        if policy:
+            where.append("policy = ?")
+            params.append(policy)
+        sql = (
+            "SELECT id, created_at, label, host, port, policy, bulk, batch_size, concurrency, workers, rate,"
+            " attempted, successful, throughput_per_s FROM runs"
+            + (" WHERE " + " AND ".join(where) if where else "")
+            + " ORDER BY id DESC LIMIT ?"
+        )
+        cur = self.conn.execute(sql, (*params, limit))
+        names = [d[0] for d in cur.description]
+        return [dict(zip(names, row)) for row in cur]
+
+
+def _betacf(a: float, b: float, x: float) -> float:
+    # continued fraction for the regularized incomplete beta function (modified Lentz)
+    tiny = 1e-300
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1.0)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 300):
+        m2 = 2 * m
+        even = m * (b - m) * x / ((a + m2 - 1.0) * (a + m2))
+        odd = -(a + m) * (a + b + m) * x / ((a + m2) * (a + m2 + 1.0))
+        for num in (even, odd):
+            d = 1.0 + num * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + num / c
+            c = c if abs(c) > tiny else tiny
+            h *= d * c
+        if abs(d * c - 1.0) < 1e-12:
+            break
+    return h
+
+
+def _betainc(a: float, b: float, x: float) -> float:
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    log_front = math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log1p(-x)
+    if x < (a + 1.0) / (a + b + 2.0):
+        return math.exp(log_front) * _betacf(a, b, x) / a
+    return 1.0 - math.exp(log_front) * _betacf(b, a, 1.0 - x) / b
+
+
+def welch_t_test(
+    n1: int, mean1: float, sd1: float, n2: int, mean2: float, sd2: float
+) -> Tuple[float, float]:
+    """Two-sided Welch t-test from summary statistics; returns (t, p-value)."""
+    if n1 < 2 or n2 < 2:
+        return 0.0, 1.0
+    v1, v2 = sd1 * sd1 / n1, sd2 * sd2 / n2
+    if v1 + v2 == 0.0:
+        return 0.0, 1.0 if mean1 == mean2 else 0.0
+    t = (mean2 - mean1) / math.sqrt(v1 + v2)
+    df = (v1 + v2) ** 2 / (v1 * v1 / (n1 - 1) + v2 * v2 / (n2 - 1))
+    return t, _betainc(df / 2.0, 0.5, df / (df + t * t))
+
+
+def two_proportion_z_test(k1: int, n1: int, k2: int, n2: int) -> Tuple[float, float]:
+    """Two-sided z-test for a difference between rates k1/n1 and k2/n2; returns (z, p-value)."""
+    if not n1 or not n2:
+        return 0.0, 1.0
+    pooled = (k1 + k2) / (n1 + n2)
+    se = math.sqrt(pooled * (1.0 - pooled) * (1.0 / n1 + 1.0 / n2))
+    if se == 0.0:
+        return 0.0, 1.0
+    z = (k2 / n2 - k1 / n1) / se
+    return z, math.erfc(abs(z) / math.sqrt(2.0))
+
+
+@dataclass
+class Finding:
+    metric: str
+    baseline: float
+    candidate: float
+    change: float
+    p_value: Optional[float]
+    regression: bool
+
+
+def _relative(before: float, after: float) -> float:
+    return (after - before) / before if before else 0.0
+
+
+def compare_runs(
+    baseline: StoredRun,
+    candidate: StoredRun,
+    alpha: float = 0.05,
+    min_change: float = 0.05,
+    throughput_drop: float = 0.10,
+) -> List[Finding]:
+    """Compare ``candidate`` against ``baseline``.
+
+    A latency phase regresses when its mean grew by more than ``min_change`` (relative)
+    and the Welch t-test rejects equal means at ``alpha``; the error rate regresses when
+    it rose significantly; throughput, a single number per run with no variance to test,
+    regresses when it fell by more than ``throughput_drop``.
+    """
+    findings = []
+    for phase in sorted(set(baseline.latency) & set(candidate.latency)):
+        a, b = baseline.latency[phase], candidate.latency[phase]
+        _, p = welch_t_test(a.count, a.mean_s, a.stdev_s, b.count, b.mean_s, b.stdev_s)
+        change = _relative(a.mean_s, b.mean_s)
+        findings.append(Finding(f"{phase}.mean_s", a.mean_s, b.mean_s, change, p, p < alpha and change > min_change))
+        findings.append(Finding(f"{phase}.p99_s", a.p99_s, b.p99_s, _relative(a.p99_s, b.p99_s), None, False))
+
+    change = _relative(baseline.throughput_per_s, candidate.throughput_per_s)
+    findings.append(
+        Finding("throughput_per_s", baseline.throughput_per_s, candidate.throughput_per_s, change, None, -change > throughput_drop)
+    )
+
+    _, p = two_proportion_z_test(baseline.errors, baseline.attempted, candidate.errors, candidate.attempted)
+    rate_a = baseline.errors / baseline.attempted if baseline.attempted else 0.0
+    rate_b = candidate.errors / candidate.attempted if candidate.attempted else 0.0
+    findings.append(Finding("error_rate", rate_a, rate_b, rate_b - rate_a, p, p < alpha and rate_b > rate_a))
+    return findings
+
+
+def config_differences(baseline: StoredRun, candidate: StoredRun) -> List[str]:
+    """Settings that differ between the two runs (which may explain a difference)."""
+    return [
+        f"{key}: {baseline.config.get(key)!r} -> {candidate.config.get(key)!r}"
+        for key in _COMPARABLE
+        if baseline.config.get(key) != candidate.config.get(key)
+    ]
@@ -0,0 +1,208 @@
+"""실행기 입력 값 소스.
+
+숫자 시퀀스(`--start-data`부터 1씩 증가), 줄 단위 파일, CSV 컬럼을 모두 지연(lazy) 이터레이터로
+제공합니다. 값을 미리 리스트로 만들지 않으므로 수백만 건의 실제 형식 데이터를 재생해도
+메모리 사용량이 입력 크기와 무관하게 일정합니다.
+"""
+
+import csv
+import logging
+import mmap
+import os
+from itertools import islice
+from typing import TYPE_CHECKING, BinaryIO, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .utils import increment_numeric_string
+
+if TYPE_CHECKING:
+    from .cli import Config
+
+logger = logging.getLogger("protect_reveal")
+
+INPUT_FORMATS = ("lines", "csv")
+
+
+def numeric_sequence(start: str, count: Optional[int] = None) -> Iterator[str]:
+    """Yield ``start``, ``start + 1``, ... (``count`` values, or forever), preserving zero padding.
+
+    A non-numeric ``start`` is yielded once and the sequence stops there.
+    """
+    cur = start
+    produced = 0
+    while count is None or produced < count:
+        yield cur
+        produced += 1
+        if count is not None and produced >= count:
+            return
+        try:
+            cur = increment_numeric_string(cur)
+        except ValueError:
+            logger.error("data '%s' is not numeric; stopping iterations", cur)
+            return
+
+
+def _lines_from(path: str, position: int = 0) -> Iterator[Tuple[int, str]]:
+    # (byte position where the line starts, stripped line) for the non-blank lines
+    with open(path, "rb") as fh:
+        try:
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            mm = None
+        if mm is None:
+            if position:
+                fh.seek(position)
+            pos = position
+            for raw in fh:
+                line = raw.decode("utf-8").strip()
+                if line:
+                    yield pos, line
+                pos += len(raw)
+            return
+        with mm:
+            mm.seek(position)
+            pos = position
+            for raw in iter(mm.readline, b""):
+                line = raw.decode("utf-8").strip()
+                if line:
+                    yield pos, line
+                pos += len(raw)
+
+
+def read_lines(path: str, position: int = 0) -> Iterator[str]:
+    """Yield the non-blank lines of ``path`` through a memory map.
+
+    Falls back to a buffered reader where the file cannot be mapped
+    (empty files, pipes, special files). ``position`` is a byte offset to
+    start from, as returned by :func:`value_positions`.
+    """
+    for _, line in _lines_from(path, position):
+        yield line
+
+
+class _TrackedLines:
+    """Decoded lines of a binary file that remember the byte position read so far."""
+
+    def __init__(self, fh: BinaryIO):
+        self.fh = fh
+        self.pos = fh.tell()
+
+    def __iter__(self) -> "_TrackedLines":
+        return self
+
+    def __next__(self) -> str:
+        raw = self.fh.readline()
+        if not raw:
+            raise StopIteration
+        self.pos += len(raw)
+        return raw.decode("utf-8")
+
+
+def _csv_column_from(path: str, column: Union[str, int] = 0, position: int = 0) -> Iterator[Tuple[int, str]]:
+    # (byte position where the row starts, value); csv.reader pulls exactly the lines of one
+    # record at a time, so the position read so far is where the next record starts
+    with open(path, "rb") as fh:
+        lines = _TrackedLines(fh)
+        reader = csv.reader(lines)
+        header = next(reader, None)
+        if header is None:
+            return
+        if isinstance(column, int) or column.isdigit():
+            idx = int(column)
+        else:
+            try:
+                idx = header.index(column)
+            except ValueError:
+                raise ValueError(f"CSV column '{column}' not found in header {header}") from None
+        if position > lines.pos:
+            fh.seek(position)
+            lines.pos = position
+        row_start = lines.pos
+        for row in reader:
+            if idx < len(row):
+                value = row[idx].strip()
+                if value:
+                    yield row_start, value
+            row_start = lines.pos
+
+
+def read_csv_column(path: str, column: Union[str, int] = 0, position: int = 0) -> Iterator[str]:
+    """Yield one column of a CSV file with a header row.
+
+    ``column`` is a header name or a 0-based index; rows missing the column
+    or holding an empty value there are skipped. The header is always read;
+    data rows start at byte ``position`` when it lies past the header.
+    """
+    for _, value in _csv_column_from(path, column, position):
+        yield value
+
+
+def _positioned_values(path: str, fmt: str, column: Union[str, int], position: int = 0) -> Iterator[Tuple[int, str]]:
+    if fmt == "lines":
+        return _lines_from(path, position)
+    if fmt == "csv":
+        return _csv_column_from(path, column, position)
+    raise ValueError(f"unsupported input format: {fmt}")
+
+
+def file_values(path: str, fmt: str = "lines", column: Union[str, int] = 0, position: int = 0) -> Iterator[str]:
+    """Lazy values from ``path`` in the given ``--input-format``, from byte ``position``."""
+    return (value for _, value in _positioned_values(path, fmt, column, position))
+
+
+def count_file_values(path: str, fmt: str = "lines", column: Union[str, int] = 0) -> int:
+    """Number of values ``file_values`` would yield (streams the file once)."""
+    return sum(1 for _ in file_values(path, fmt, column))
+
+
+def value_positions(path: str, fmt: str, column: Union[str, int], indexes: Iterable[int]) -> List[int]:
+    """Byte positions of the values numbered ``indexes``, found in a single pass over the file.
+
+    Passing a position to :func:`file_values` starts there directly instead of reading and
+    skipping every earlier value. Indexes past the last value map to the end of the file.
+    """
+    wanted = sorted(set(indexes))
+    found = {}
+    pending = iter(wanted)
+    target = next(pending, None)
+    if target is not None:
+        for n, (pos, _) in enumerate(_positioned_values(path, fmt, column)):
+            if n == target:
+                found[n] = pos
+                target = next(pending, None)
+                if target is None:
+                    break
+    end = os.path.getsize(path)
+    return [found.get(i, end) for i in indexes]
+
+
+def config_values(
+    config: "Config",
+    offset: int = 0,
+    count: Optional[int] = None,
+    start: Optional[str] = None,
+    position: Optional[int] = None,
+) -> Iterator[str]:
+    """Values ``offset .. offset + count`` of the run's input source.
+
+    Numeric sequences start directly at ``start`` (a lane's own start value);
+    files start at byte ``position`` when known (see :func:`value_positions`),
+    otherwise they are streamed and the first ``offset`` values skipped.
+    """
+    count = config.iterations if count is None else count
+    if config.input_file:
+        if position is not None:
+            values = file_values(config.input_file, config.input_format, config.csv_column, position)
+            return islice(values, count)
+        values = file_values(config.input_file, config.input_format, config.csv_column)
+        return islice(values, offset, offset + count)
+    return numeric_sequence(config.start_data if start is None else start, count)
+
+
+def batched(values: Iterable[str], size: int) -> Iterator[List[str]]:
+    """Split any iterable into lists of at most ``size`` values."""
+    it = iter(values)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
@@ -0,0 +1,192 @@
+"""웹 UI에서 실행하는 백그라운드 부하 테스트 작업.
+
+CLI와 같은 부하 생성기(`load.run_load`)를 요청 처리 이벤트 루프가 아닌 전용 스레드에서
+실행하고, 진행 상황(처리량, 단계별 지연 백분위수, 오류 건수)을 스냅샷으로 제공합니다.
+취소는 다음 결과가 들어오는 시점에 각 lane이 멈추는 방식이므로 요청 하나 이내로 반영됩니다.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional
+
+from .cli import Config
+from .load import ResultCollector, make_client, run_load
+from .summary import RunSummary
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATES = ("completed", "cancelled", "failed")
+
+# window over which the "current" throughput is measured, seconds
+RATE_WINDOW_S = 5.0
+
+
+class JobCancelled(Exception):
+    """Raised inside a lane thread to stop a cancelled job."""
+
+
+class JobLimitError(Exception):
+    """Too many jobs are already running."""
+
+
+class _JobCollector(ResultCollector):
+    """ResultCollector that stops the lane delivering a result once the job is cancelled."""
+
+    def __init__(self, config: Config, summary: RunSummary, cancelled: threading.Event):
+        super().__init__(config, summary)
+        self.cancelled = cancelled
+
+    def __call__(self, index: int, result: Any) -> None:
+        super().__call__(index, result)
+        if self.cancelled.is_set():
+            raise JobCancelled()
+
+
+class LoadJob:
+    """One background protect/reveal load run and its live summary."""
+
+    def __init__(self, config: Config):
+        self.id = uuid.uuid4().hex[:12]
+        self.config = config
+        self.state = "pending"
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.summary = RunSummary()
+        self._cancelled = threading.Event()
+        self.collector = _JobCollector(config, self.summary, self._cancelled)
+        # (monotonic time, attempted) samples for the windowed throughput; snapshot() runs on
+        # several request tasks at once (SSE streams, status polls), so guarded by _rate_lock
+        self._rate_samples: deque = deque()
+        self._rate_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=f"load-job-{self.id}", daemon=True)
+
+    @property
+    def done(self) -> bool:
+        return self.state in TERMINAL_STATES
+
+    def start(self) -> None:
+        self.state = "running"
+        self.started = time.monotonic()
+        self._thread.start()
+
+    def cancel(self) -> None:
+        if not self.done:
+            self._cancelled.set()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        client = None
+        try:
+            client = make_client(self.config)
+            run_load(self.config, self.collector, client=client)
+            self.state = "cancelled" if self._cancelled.is_set() else "completed"
+        except JobCancelled:
+            self.state = "cancelled"
+        except Exception as e:
+            logger.exception("Load job %s failed", self.id)
+            self.error = str(e)
+            self.state = "failed"
+        finally:
+            if client is not None:
+                client.close()
+            self.finished = time.monotonic()
+            self.summary.wall_time_s = self.finished - self.started
+            logger.info("Load job %s %s after %d items", self.id, self.state, self.summary.attempted)
+
+    def _current_rate(self, now: float, attempted: int) -> float:
+        with self._rate_lock:
+            samples = self._rate_samples
+            if samples and now < samples[-1][0]:
+                # a concurrent snapshot already recorded a later sample; keep the deque ordered
+                now, attempted = samples[-1]
+            else:
+                samples.append((now, attempted))
+            while len(samples) > 2 and now - samples[1][0] >= RATE_WINDOW_S:
+                samples.popleft()
+            t0, n0 = samples[0]
+        return (attempted - n0) / (now - t0) if now > t0 else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Progress so far: counts, overall and recent throughput, per-phase latency percentiles."""
+        now = self.finished or time.monotonic()
+        with self.collector._lock:
+            data = self.summary.to_dict()
+            attempted = self.summary.attempted
+        elapsed = now - self.started if self.started is not None else 0.0
+        data.update(
+            total_time_s=elapsed,
+            throughput_per_s=attempted / elapsed if elapsed > 0 else 0.0,
+            current_throughput_per_s=0.0 if self.done else self._current_rate(now, attempted),
+            errors=attempted - data["successful"],
+        )
+        return {
+            "id": self.id,
+            "state": self.state,
+            "error": self.error,
+            "created_at": self.created_at,
+            "params": {
+                "host": self.config.host,
+                "port": self.config.port,
+                "policy": self.config.policy,
+                "bulk": self.config.bulk,
+                "iterations": self.config.iterations,
+                "batch_size": self.config.batch_size,
+                "concurrency": self.config.concurrency,
+                "start_data": self.config.start_data,
+            },
+            "progress": min(1.0, attempted / self.config.iterations) if self.config.iterations else 1.0,
+            **data,
+        }
+
+
+class JobManager:
+    """Starts, tracks and cancels LoadJobs; keeps the most recent finished ones for inspection."""
+
+    def __init__(self, max_running: int = 2, keep_finished: int = 20):
+        self.max_running = max_running
+        self.keep_finished = keep_finished
+        self._jobs: "OrderedDict[str, LoadJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def start(self, config: Config) -> LoadJob:
+        """Start a job for ``config``; raises JobLimitError when ``max_running`` jobs are active."""
+        with self._lock:
+            running = sum(1 for job in self._jobs.values() if not job.done)
+            if running >= self.max_running:
+                raise JobLimitError(f"{running} load job(s) already running (limit {self.max_running})")
+            job = LoadJob(config)
+            self._jobs[job.id] = job
+            self._prune()
+        job.start()
+        logger.info(
+            "Load job %s started: %s:%s policy=%s bulk=%s iterations=%d concurrency=%d",
+            job.id, config.host, config.port, config.policy, config.bulk, config.iterations, config.concurrency,
+        )
+        return job
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[: max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[LoadJob]:
+        return self._jobs.get(job_id)
+
+    def list(self) -> List[LoadJob]:
+        """Jobs newest first."""
+        return list(reversed(self._jobs.values()))
+
+    def cancel_all(self, timeout: Optional[float] = None) -> None:
+        """Cancel every running job and wait up to ``timeout`` seconds for each to stop."""
+        jobs = [job for job in self._jobs.values() if not job.done]
+        for job in jobs:
+            job.cancel()
+        for job in jobs:
+            job.join(timeout)
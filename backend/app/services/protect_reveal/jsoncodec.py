@@ -0,0 +1,60 @@
+"""빠른 JSON 인코딩/디코딩 백엔드.
+
+orjson이 설치되어 있으면 사용하고, 없으면 표준 json 모듈로 같은 형식(compact, UTF-8 bytes)을
+만들어 냅니다. 클라이언트는 bytes를 그대로 보내고 받으며, bulk 페이로드는 항목마다 dict를 만들지
+않고 미리 인코딩된 조각(fragment)을 이어 붙여 만듭니다.
+"""
+
+import json
+from typing import Any, Iterable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+class EncodedJSON(bytes):
+    """An already-encoded JSON document; clients send it verbatim instead of encoding a payload.
+
+    ``items`` records the array length of a bulk body for metrics, which cannot read the bytes.
+    """
+
+    def __new__(cls, data: bytes, items: Optional[int] = None) -> "EncodedJSON":
+        obj = super().__new__(cls, data)
+        obj.items = items
+        return obj
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode ``obj`` as compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def encode_object_array(key: str, values: Iterable[Any]) -> bytes:
+    """Encode ``[{key: v}, ...]`` for string values without building the per-item dicts.
+
+    The string list is encoded once and the object wrappers are spliced in at the
+    ``","`` separators, which is only unambiguous when no value contains a quote or
+    backslash; other input (including dict items, kept as they are) takes the generic path.
+    """
+    values = list(values)
+    try:
+        joined = "".join(values)
+    except TypeError:
+        joined = None
+    if not values or joined is None or '"' in joined or "\\" in joined:
+        return dumps([v if isinstance(v, dict) else {key: v} for v in values])
+    prefix = b"{" + dumps(key) + b":"
+    encoded = dumps(values)
+    return b"[" + prefix + encoded[1:-1].replace(b'","', b'"},' + prefix + b'"') + b"}]"
@@ -0,0 +1,308 @@
+"""동시 부하 생성기.
+
+반복 횟수를 여러 lane으로 나누고 각 lane을 스레드(--concurrency)와 프로세스(--workers)에서
+실행합니다. lane마다 `--start-data`에서 파생된 고유한 숫자 구간(또는 `--input-file`의 고유한
+구간)을 사용하므로 값이 겹치지 않습니다.
+결과는 모아두지 않고 생성 즉시 `ResultCollector`로 전달되어 요약에 누적되고(선택적으로) sink에
+기록되며, 프로세스별 요약은 마지막에 병합됩니다.
+"""
+
+import json
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Iterable, List, Optional
+
+from .cache import ProtectCacheSet
+from .client import APIError, APIResponse, ProtectRevealClient
+from .endpoints import EndpointPool, parse_endpoints
+from .resilience import CircuitBreaker, RetryPolicy
+from .openloop import ScheduledResult, open_loop_concurrency
+from .inputs import config_values, value_positions
+from .runner import BulkIterationResult, IterationResult, iter_bulk_iteration, run_iteration
+from .sinks import ResultSink, open_sink, worker_path
+from .summary import RunSummary
+from .utils import offset_numeric_string
+
+if TYPE_CHECKING:
+    from .cli import Config
+
+logger = logging.getLogger("protect_reveal")
+
+# consumer signature: (index of the item/first batch item in the overall sequence, result)
+ResultConsumer = Callable[[int, Any], None]
+
+
+@dataclass
+class Lane:
+    index: int
+    # position of the lane's first value within the overall sequence
+    offset: int
+    # None when values come from --input-file (the lane reads its slice by offset)
+    start_data: Optional[str]
+    count: int
+    # byte position of the lane's first --input-file value (see locate_lanes)
+    position: Optional[int] = None
+
+
+def plan_lanes(start_data: Optional[str], iterations: int, lanes: int) -> List[Lane]:
+    """Split ``iterations`` into ``lanes`` contiguous, non-overlapping ranges.
+
+    ``start_data`` is the first value of a numeric sequence, or None for file input.
+    """
+    lanes = max(1, min(lanes, iterations)) if iterations > 0 else 1
+    if start_data is not None and not start_data.isdigit():
+        # non-numeric data cannot be partitioned; keep the original single-sequence behaviour
+        return [Lane(0, 0, start_data, iterations)]
+    base, extra = divmod(iterations, lanes)
+    out = []
+    offset = 0
+    for i in range(lanes):
+        count = base + (1 if i < extra else 0)
+        lane_start = None if start_data is None else offset_numeric_string(start_data, offset)
+        out.append(Lane(i, offset, lane_start, count))
+        offset += count
+    return out
+
+
+def make_client(config: "Config") -> ProtectRevealClient:
+    protect_cache = None
+    if config.protect_cache_size > 0:
+        protect_cache = ProtectCacheSet(max_entries=config.protect_cache_size, ttl=float("inf")).get(
+            config.host, config.port, config.policy
+        )
+    pool = None
+    if config.endpoints:
+        pool = EndpointPool(parse_endpoints(config.endpoints.split(","), config.port), strategy=config.lb_strategy)
+    # every thread (and pipelined batch) may hold a connection at the same time
+    if config.rate:
+        in_flight = open_loop_concurrency(config)
+    else:
+        in_flight = config.concurrency * config.pipeline_depth
+    return ProtectRevealClient(
+        host=config.host,
+        port=config.port,
+        policy=config.policy,
+        timeout=config.timeout,
+        pool_maxsize=max(10, in_flight),
+        # request payload/header copies and raw bodies are only needed for --show-bodies
+        trace=config.show_bodies,
+        protect_cache=protect_cache,
+        breaker=CircuitBreaker(f"http://{config.host}:{config.port}", config.breaker_threshold)
+        if config.breaker_threshold > 0
+        else None,
+        retry=RetryPolicy(max_retries=config.retries) if config.retries > 0 else None,
+        pool=pool,
+    )
+
+
+def _print_bodies(number: int, result: Any) -> None:
+    # Print raw server response bodies and include the request payloads for traceability
+    pbody = getattr(result.protect_response, 'body', {}) or {}
+    rbody = getattr(result.reveal_response, 'body', {}) or {}
+    preq = getattr(result.protect_response, 'request_payload', None)
+    rreq = getattr(result.reveal_response, 'request_payload', None)
+    purl = getattr(result.protect_response, 'request_url', None)
+    rurl = getattr(result.reveal_response, 'request_url', None)
+    pheaders = getattr(result.protect_response, 'request_headers', None)
+    rheaders = getattr(result.reveal_response, 'request_headers', None)
+    print(
+        json.dumps(
+            {
+                "batch": number,
+                "protect": {"request": {"url": purl, "headers": pheaders, "body": preq}, "response": pbody},
+                "reveal": {"request": {"url": rurl, "headers": rheaders, "body": rreq}, "response": rbody},
+                "time_s": result.time_s,
+            },
+            ensure_ascii=False,
+            indent=2,
+        )
+    )
+
+
+class ResultCollector:
+    """Thread-safe consumer feeding results into a RunSummary, an optional sink and progress output.
+
+    Results are not retained, so memory stays flat regardless of the number of iterations.
+    """
+
+    def __init__(self, config: "Config", summary: RunSummary, sink: Optional[ResultSink] = None):
+        self.config = config
+        self.summary = summary
+        self.sink = sink
+        self.seen = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, index: int, result: Any) -> None:
+        with self._lock:
+            self.seen += 1
+            self.summary.add(result)
+            if self.sink is not None:
+                self.sink.write(index, result)
+            self._report(index, result)
+
+    def _report(self, index: int, result: Any) -> None:
+        inner = result.result if isinstance(result, ScheduledResult) else result
+        if isinstance(inner, BulkIterationResult):
+            # detailed per-batch JSON only when requested
+            if self.config.show_bodies:
+                _print_bodies(self.seen, inner)
+            return
+        if self.config.show_progress:
+            logger.info(
+                "#%03d data=%s time=%.4fs protect_status=%s reveal_status=%s match=%s",
+                index + 1,
+                inner.data,
+                inner.time_s,
+                inner.protect_response.status_code,
+                inner.reveal_response.status_code,
+                inner.match,
+            )
+        # show_bodies: print raw server response bodies and include request payloads
+        if self.config.show_bodies:
+            _print_bodies(index + 1, inner)
+
+    def close(self) -> None:
+        if self.sink is not None:
+            self.sink.close()
+
+
+def locate_lanes(config: "Config", lanes: List[Lane]) -> None:
+    """Record where each lane's slice of ``--input-file`` starts, in one pass over the file.
+
+    Without it every lane would read and skip all values before its own slice.
+    """
+    positions = value_positions(
+        config.input_file, config.input_format, config.csv_column, [lane.offset for lane in lanes]
+    )
+    for lane, position in zip(lanes, positions):
+        lane.position = position
+
+
+def lane_values(config: "Config", lane: Lane):
+    """Lazy values for ``lane``: its numeric range or its slice of ``--input-file``."""
+    return config_values(config, offset=lane.offset, count=lane.count, start=lane.start_data, position=lane.position)
+
+
+def run_iteration_lane(
+    client: ProtectRevealClient,
+    values: Iterable[str],
+    offset: int,
+    on_result: ResultConsumer,
+    username: Optional[str] = None,
+    verbose: bool = False,
+) -> None:
+    """Run one protect/reveal iteration per value, numbering results from ``offset``."""
+    for k, current in enumerate(values):
+        try:
+            result = run_iteration(client, current, username=username)
+        except APIError as e:
+            logger.error("API error: %s (status=%s)", e, e.status_code)
+            if verbose:
+                logger.exception("Full traceback:")
+            result = IterationResult(
+                data=current,
+                protect_response=e.response or APIResponse(None, None),
+                reveal_response=e.response or APIResponse(None, None),
+                protected_token=None,
+                restored=None,
+                time_s=0.0,
+            )
+        except Exception as e:
+            logger.error("Unexpected error: %s", e)
+            if verbose:
+                logger.exception("Full traceback:")
+            break
+
+        on_result(offset + k, result)
+
+
+def run_bulk_lane(
+    client: ProtectRevealClient,
+    values: Iterable[str],
+    offset: int,
+    config: "Config",
+    on_result: ResultConsumer,
+) -> None:
+    """Run the values through protect_bulk/reveal_bulk in batches, streaming them lazily."""
+    batches = iter_bulk_iteration(
+        client,
+        values,
+        batch_size=config.batch_size,
+        username=config.username,
+        pipeline_depth=config.pipeline_depth,
+    )
+    for result in batches:
+        on_result(offset, result)
+        offset += len(result.inputs)
+
+
+def run_lanes(
+    config: "Config",
+    lanes: List[Lane],
+    on_result: ResultConsumer,
+    client: Optional[ProtectRevealClient] = None,
+) -> None:
+    """Run lanes on ``len(lanes)`` threads sharing one pooled client."""
+    own_client = client is None
+    client = client or make_client(config)
+
+    def run(lane: Lane) -> None:
+        values = lane_values(config, lane)
+        if config.bulk:
+            run_bulk_lane(client, values, lane.offset, config, on_result)
+        else:
+            run_iteration_lane(
+                client, values, lane.offset, on_result, username=config.username, verbose=config.verbose
+            )
+
+    try:
+        if len(lanes) == 1:
+            run(lanes[0])
+            return
+        with ThreadPoolExecutor(max_workers=len(lanes), thread_name_prefix="load-lane") as pool:
+            for _ in pool.map(run, lanes):
+                pass
+    finally:
+        if own_client:
+            client.close()
+
+
+def _run_worker(config: "Config", lanes: List[Lane], worker: int) -> RunSummary:
+    # runs in a child process: own client, own summary, own output file
+    summary = RunSummary()
+    collector = ResultCollector(
+        config,
+        summary,
+        open_sink(worker_path(config.output, worker), config.output_format, bulk=config.bulk),
+    )
+    try:
+        run_lanes(config, lanes, collector)
+    finally:
+        collector.close()
+    return summary
+
+
+def run_load(config: "Config", collector: ResultCollector, client: Optional[ProtectRevealClient] = None) -> None:
+    """Run ``config.iterations`` across ``config.workers`` processes x ``config.concurrency`` threads.
+
+    In-process results go to ``collector``; each worker process streams to its own
+    ``worker_path`` output file and its summary is merged into ``collector.summary``.
+    """
+    workers = max(1, config.workers)
+    concurrency = max(1, config.concurrency)
+    start = None if config.input_file else config.start_data
+    lanes = plan_lanes(start, config.iterations, workers * concurrency)
+    if config.input_file and len(lanes) > 1:
+        locate_lanes(config, lanes)
+    if workers == 1:
+        run_lanes(config, lanes, collector, client=client)
+        return
+
+    # each process gets `concurrency` consecutive lanes and builds its own client/connection pool
+    groups = [lanes[i : i + concurrency] for i in range(0, len(lanes), concurrency)]
+    with ProcessPoolExecutor(max_workers=len(groups)) as pool:
+        futures = [pool.submit(_run_worker, config, group, worker) for worker, group in enumerate(groups)]
+        for future in futures:
+            collector.summary.merge(future.result())
@@ -0,0 +1,113 @@
+"""고정 도착률(open-loop) 부하 스케줄러.
+
+이전 요청의 완료 여부와 관계없이 `--rate` 간격의 예정 시각마다 요청을 발행합니다.
+지연 시간은 실제 전송 시각이 아니라 예정 시각부터 측정하므로(coordinated omission 보정)
+CRDP가 느려질 때 쌓이는 대기 시간도 그대로 드러납니다.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Iterator, Union
+
+from .client import APIResponse, ProtectRevealClient
+from .inputs import batched, config_values
+from .runner import BulkIterationResult, IterationResult, run_bulk_batch, run_iteration
+
+if TYPE_CHECKING:
+    from .cli import Config
+
+logger = logging.getLogger("protect_reveal")
+
+# worker threads used for outstanding requests when --concurrency is left at 1
+DEFAULT_OPEN_LOOP_CONCURRENCY = 64
+
+
+def open_loop_concurrency(config: "Config") -> int:
+    """Worker threads (and so connections in use at once) of an open-loop run."""
+    return config.concurrency if config.concurrency > 1 else DEFAULT_OPEN_LOOP_CONCURRENCY
+
+
+def _failed_result(config: "Config", unit, error: Exception, elapsed_s: float):
+    # a request that raised still counts as attempted, and as failed
+    response = getattr(error, "response", None) or APIResponse(None, str(error))
+    if config.bulk:
+        return BulkIterationResult(list(unit), response, response, [], [], elapsed_s)
+    return IterationResult(unit, response, response, None, None, elapsed_s)
+
+
+@dataclass
+class ScheduledResult:
+    result: Union[IterationResult, BulkIterationResult]
+    # intended send time, seconds since the start of the run
+    scheduled_s: float
+    # how far the actual send fell behind the schedule
+    lag_s: float
+    # completion time minus intended send time (coordinated-omission corrected)
+    latency_s: float
+
+
+def run_open_loop(
+    client: ProtectRevealClient,
+    config: "Config",
+    on_result: Callable[[int, ScheduledResult], None],
+) -> int:
+    """Issue ``config.iterations`` requests at ``config.rate`` per second.
+
+    Each ScheduledResult is passed to ``on_result`` (with its position in the
+    overall sequence) as soon as it completes; results are not retained.
+    Returns the number of requests issued.
+
+    In bulk mode each scheduled request is one protect_bulk/reveal_bulk batch of
+    ``config.batch_size`` values. Requests run on a pool of ``config.concurrency``
+    threads (DEFAULT_OPEN_LOOP_CONCURRENCY if left at 1); when all threads are busy,
+    new requests wait in the queue and that wait shows up as lag and latency.
+    """
+    if config.rate <= 0:
+        raise ValueError("rate must be positive")
+    interval = 1.0 / config.rate
+    concurrency = open_loop_concurrency(config)
+
+    values = config_values(config)
+    if config.bulk:
+        units: Iterator = batched(values, config.batch_size)
+    else:
+        units = values
+
+    def execute(position: int, unit, intended: float, t_start: float) -> None:
+        sent = time.perf_counter()
+        try:
+            if config.bulk:
+                result = run_bulk_batch(client, unit, username=config.username)
+            else:
+                result = run_iteration(client, unit, username=config.username)
+        except Exception as e:
+            logger.error("Unexpected error: %s", e)
+            result = _failed_result(config, unit, e, time.perf_counter() - sent)
+        done = time.perf_counter()
+        on_result(
+            position,
+            ScheduledResult(
+                result=result,
+                scheduled_s=intended - t_start,
+                lag_s=max(0.0, sent - intended),
+                latency_s=done - intended,
+            ),
+        )
+
+    issued = 0
+    position = 0
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="open-loop") as pool:
+        t_start = time.perf_counter()
+        for n, unit in enumerate(units):
+            intended = t_start + n * interval
+            delay = intended - time.perf_counter()
+            # never wait for earlier requests; only wait for the next slot on the schedule
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(execute, position, unit, intended, t_start)
+            issued += 1
+            position += len(unit) if config.bulk else 1
+    return issued
+
@@ -0,0 +1,204 @@
+"""재사용 가능한 ProtectRevealClient 레지스트리.
+
+API 호출마다 새 클라이언트(및 새 세션/TCP 연결)를 만드는 대신
+(host, port, policy, timeout) 별로 오래 사는 클라이언트를 보관해 keep-alive 연결을 재사용합니다.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from .async_client import AsyncProtectRevealClient
+from .cache import ProtectCacheSet
+from .client import ProtectRevealClient
+from .endpoints import EndpointPool
+from .resilience import BreakerSet, RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+ClientKey = Tuple[Hashable, ...]
+
+
+class ClientRegistry:
+    """Bounded registry of long-lived clients with idle eviction.
+
+    - At most ``max_clients`` clients are kept; the least recently used one is
+      closed when a new key would exceed the limit.
+    - Clients unused for ``idle_ttl`` seconds are closed on the next lookup
+      (or explicitly via :meth:`evict_idle`).
+    - :meth:`close_all` closes everything, e.g. on application shutdown.
+    - With ``protect_caches`` every client gets the protect cache of its
+      (host, port, policy), which outlives client eviction.
+    - With ``breakers`` every client of an endpoint shares that endpoint's
+      circuit breaker; ``retry`` is handed to every client.
+    - With ``endpoint_pool`` clients whose (host, port) is one of the pool's
+      nodes spread their calls over every node of the pool, unless fetched
+      with ``pooled=False`` (e.g. to probe one node).
+    - ``metrics`` (an upstream call recorder) is handed to every client.
+    """
+
+    def __init__(
+        self,
+        factory: Optional[Callable[..., ProtectRevealClient]] = None,
+        max_clients: int = 32,
+        idle_ttl: float = 300.0,
+        pool_maxsize: int = 10,
+        protect_caches: Optional[ProtectCacheSet] = None,
+        breakers: Optional[BreakerSet] = None,
+        retry: Optional[RetryPolicy] = None,
+        endpoint_pool: Optional[EndpointPool] = None,
+        metrics: Optional[Any] = None,
+    ):
+        self._factory = factory or ProtectRevealClient
+        self.max_clients = max_clients
+        self.idle_ttl = idle_ttl
+        self.pool_maxsize = pool_maxsize
+        self.protect_caches = protect_caches
+        self.breakers = breakers
+        self.retry = retry
+        self.endpoint_pool = endpoint_pool
+        self.metrics = metrics
+        self._clients: "OrderedDict[ClientKey, Tuple[ProtectRevealClient, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        host: str,
+        port: int,
+        policy: str,
+        timeout: int = 10,
+        healthz_port: Optional[int] = None,
+        pooled: bool = True,
+    ) -> ProtectRevealClient:
+        """Return the pooled client for the key, creating it on first use."""
+        key: ClientKey = (host, port, policy, timeout, healthz_port, pooled)
+        now = time.monotonic()
+        stale = []
+        with self._lock:
+            stale.extend(self._pop_idle(now))
+            entry = self._clients.pop(key, None)
+            if entry is None:
+                extra = {}
+                if self.protect_caches is not None:
+                    extra["protect_cache"] = self.protect_caches.get(host, port, policy)
+                if self.breakers is not None:
+                    extra["breaker"] = self.breakers.get(f"http://{host}:{port}")
+                if self.retry is not None:
+                    extra["retry"] = self.retry
+                if pooled and self.endpoint_pool is not None and (host, port) in self.endpoint_pool:
+                    extra["pool"] = self.endpoint_pool
+                if self.metrics is not None:
+                    extra["metrics"] = self.metrics
+                client = self._factory(
+                    host=host,
+                    port=port,
+                    policy=policy,
+                    timeout=timeout,
+                    healthz_port=healthz_port,
+                    pool_maxsize=self.pool_maxsize,
+                    **extra,
+                )
+            else:
+                client = entry[0]
+            self._clients[key] = (client, now)
+            while len(self._clients) > self.max_clients:
+                _, (old, _) = self._clients.popitem(last=False)
+                stale.append(old)
+        # close outside the lock; closing a session may block on socket teardown
+        self._discard(stale)
+        return client
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """Close clients idle for longer than ``idle_ttl``. Returns the number closed."""
+        with self._lock:
+            stale = self._pop_idle(time.monotonic() if now is None else now)
+        self._discard(stale)
+        return len(stale)
+
+    def close_all(self) -> None:
+        """Close every pooled client and empty the registry."""
+        with self._lock:
+            clients = [c for c, _ in self._clients.values()]
+            self._clients.clear()
+        self._discard(clients)
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def _discard(self, clients: list) -> None:
+        for client in clients:
+            client.close()
+
+    def _pop_idle(self, now: float) -> list:
+        # OrderedDict is kept in last-used order, so idle entries are at the front
+        stale = []
+        while self._clients:
+            key, (client, last_used) = next(iter(self._clients.items()))
+            if now - last_used < self.idle_ttl:
+                break
+            del self._clients[key]
+            stale.append(client)
+        return stale
+
+
+class AsyncClientRegistry(ClientRegistry):
+    """Registry of :class:`AsyncProtectRevealClient` instances.
+
+    Evicted clients are closed with a task on their loop once their in-flight
+    calls finish, and :meth:`aclose_all` should be awaited on shutdown. Pooled
+    connections are bound to the event loop that opened them, so the registry
+    starts over if it is used from a different loop (e.g. per-request loops in
+    test clients), closing the previous clients on the loop that owns them.
+    """
+
+    def __init__(self, factory: Optional[Callable[..., AsyncProtectRevealClient]] = None, **kwargs: Any):
+        super().__init__(factory=factory or AsyncProtectRevealClient, **kwargs)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closing: set = set()
+
+    def get(self, *args: Any, **kwargs: Any) -> AsyncProtectRevealClient:
+        loop = _running_loop()
+        if loop is not self._loop:
+            with self._lock:
+                stale = [c for c, _ in self._clients.values()]
+                self._clients.clear()
+                old_loop, self._loop = self._loop, loop
+            self._close_on(old_loop, stale)
+        return super().get(*args, **kwargs)
+
+    async def aclose_all(self) -> None:
+        """Close every pooled client and empty the registry."""
+        with self._lock:
+            clients = [c for c, _ in self._clients.values()]
+            self._clients.clear()
+        for client in clients:
+            await client.aclose()
+
+    def _discard(self, clients: list) -> None:
+        self._close_on(self._loop, clients)
+
+    def _close_on(self, loop: Optional[asyncio.AbstractEventLoop], clients: list) -> None:
+        if not clients or loop is None:
+            return
+        if loop.is_closed():
+            # nothing can run on that loop any more; its connections went down with it
+            logger.debug("Dropping %d client(s) of a closed event loop", len(clients))
+            return
+        for client in clients:
+            if loop is _running_loop():
+                task = loop.create_task(client.aclose_when_idle())
+                # keep a reference until the close finishes so the task is not garbage-collected
+                self._closing.add(task)
+                task.add_done_callback(self._closing.discard)
+            else:
+                asyncio.run_coroutine_threadsafe(client.aclose_when_idle(), loop)
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
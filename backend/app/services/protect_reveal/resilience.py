@@ -0,0 +1,164 @@
+"""CRDP 엔드포인트별 circuit breaker와 지터(jitter) 재시도 정책.
+
+연속 실패가 임계값에 도달하면 breaker가 열려(open) 일정 시간 동안 요청을 즉시 실패시키고,
+이후 한 건의 시험 요청(half-open)으로 복구 여부를 확인합니다. 재시도는 안전한 경우
+(GET, 연결 자체가 실패한 요청, 또는 명시적으로 허용한 POST)에만 지수 백오프 + full jitter로 수행합니다.
+"""
+
+import random
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from .client import APIError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(APIError):
+    """Raised instead of calling CRDP while the endpoint's breaker is open."""
+
+    def __init__(self, endpoint: str, retry_in_s: float):
+        super().__init__(
+            f"CRDP circuit open for {endpoint}; failing fast (retry in {retry_in_s:.1f}s)",
+            status_code=503,
+        )
+        self.endpoint = endpoint
+        self.retry_in_s = retry_in_s
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker for one CRDP endpoint (closed -> open -> half-open -> closed)."""
+
+    def __init__(self, endpoint: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.endpoint = endpoint
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        self._trial_in_flight = False
+        self._trial_started = 0.0
+        self._lock = threading.Lock()
+
+    def before_call(self) -> bool:
+        """Admit a call or raise CircuitOpenError; after ``reset_timeout`` one trial call is let through.
+
+        Returns True when the admitted call is the half-open trial; its caller must end it
+        with `record_success`, `record_failure` or `release_trial`. A trial that has been
+        out for ``reset_timeout`` without an outcome is presumed lost and replaced.
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return False
+            now = time.monotonic()
+            if self.state == OPEN and now - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == HALF_OPEN and (
+                not self._trial_in_flight or now - self._trial_started >= self.reset_timeout
+            ):
+                self._trial_in_flight = True
+                self._trial_started = now
+                return True
+            self.rejected += 1
+            retry_in = max(0.0, self.reset_timeout - (now - self.opened_at))
+        raise CircuitOpenError(self.endpoint, retry_in)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Give back a half-open trial that ended without an outcome (cancelled, unexpected error)."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.times_opened += 1
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == OPEN
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "endpoint": self.endpoint,
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "failure_threshold": self.failure_threshold,
+                "times_opened": self.times_opened,
+                "rejected": self.rejected,
+                "open_for_s": time.monotonic() - self.opened_at if self.state != CLOSED else 0.0,
+            }
+
+
+class BreakerSet:
+    """One CircuitBreaker per endpoint base URL, shared by every client of that endpoint."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = self._breakers[endpoint] = CircuitBreaker(
+                    endpoint, self.failure_threshold, self.reset_timeout
+                )
+            return breaker
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {b.endpoint: b.snapshot() for b in breakers}
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter.
+
+    GETs and requests whose connection never opened are always safe to retry;
+    POSTs that may have reached CRDP are retried only with ``retry_unsafe``.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 0,
+        base_delay: float = 0.05,
+        max_delay: float = 1.0,
+        retry_unsafe: bool = False,
+        statuses: Iterable[int] = (502, 503, 504),
+    ):
+        self.max_retries = max(0, max_retries)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_unsafe = retry_unsafe
+        self.statuses = frozenset(statuses)
+
+    def delay(self, attempt: int, status: Optional[int], safe: bool) -> Optional[float]:
+        """Seconds to wait before retry number ``attempt + 1``, or None to give up."""
+        if attempt >= self.max_retries:
+            return None
+        if status is not None and status not in self.statuses:
+            return None
+        if not (safe or self.retry_unsafe):
+            return None
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
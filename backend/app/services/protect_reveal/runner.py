@@ -5,10 +5,13 @@ run_iteration은 제공된 `ProtectRevealClient`를 사용해 protect -> reveal
 """
 
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 from .client import APIError, APIResponse, ProtectRevealClient
+from .inputs import batched
 
 
 @dataclass
@@ -19,6 +22,8 @@ class IterationResult:
     protected_token: Optional[str]
     restored: Optional[str]
     time_s: float
+    protect_time_s: float = 0.0
+    reveal_time_s: float = 0.0
 
     @property
     def match(self) -> bool:
@@ -29,24 +34,33 @@ class IterationResult:
         return self.protect_response.is_success and self.reveal_response.is_success
 
 
+def _release_bodies(client: ProtectRevealClient, *responses: APIResponse) -> None:
+    # lean mode: the extracted token/restored values are all a result needs, so drop the
+    # parsed JSON of successful responses (error bodies are kept for diagnostics)
+    if client.trace:
+        return
+    for response in responses:
+        if response.is_success:
+            response.body = None
+
+
 def run_iteration(client: ProtectRevealClient, data: str, username: Optional[str] = None) -> IterationResult:
     t0 = time.perf_counter()
 
-    protect_payload = {
-        "protection_policy_name": client.policy,
-        "data": data,
-    }
-    protect_response = client.post_json(client.protect_url, protect_payload)
+    protect_response = client.protect(data)
+    t_protect = time.perf_counter()
 
     protected_token = client.extract_protected_from_protect_response(protect_response)
 
     reveal_payload = {"protection_policy_name": client.policy, "protected_data": protected_token or ""}
     if username:
         reveal_payload["username"] = username
+    t_reveal = time.perf_counter()
     reveal_response = client.post_json(client.reveal_url, reveal_payload)
 
     restored = client.extract_restored_from_reveal_response(reveal_response)
     t1 = time.perf_counter()
+    _release_bodies(client, protect_response, reveal_response)
 
     return IterationResult(
         data=data,
@@ -55,6 +69,8 @@ def run_iteration(client: ProtectRevealClient, data: str, username: Optional[str
         protected_token=protected_token,
         restored=restored,
         time_s=t1 - t0,
+        protect_time_s=t_protect - t0,
+        reveal_time_s=t1 - t_reveal,
     )
 
 
@@ -66,6 +82,8 @@ class BulkIterationResult:
     protected_tokens: list
     restored_values: list
     time_s: float
+    protect_time_s: float = 0.0
+    reveal_time_s: float = 0.0
 
     @property
     def matches(self) -> list:
@@ -74,90 +92,121 @@ class BulkIterationResult:
 
 def run_bulk_iteration(
     client: ProtectRevealClient,
-    inputs: list,
+    inputs: Iterable[str],
     batch_size: int = 25,
     username: Optional[str] = None,
+    pipeline_depth: int = 1,
 ) -> list:
-    """Process inputs in batches (default 25) using protect_bulk and reveal_bulk.
+    """Process inputs (any iterable of strings) in batches (default 25) using protect_bulk and reveal_bulk.
+
+    With ``pipeline_depth`` > 1 up to that many batches are in flight at once
+    (e.g. reveal of batch N overlaps protect of batch N+1) on a thread pool
+    sharing the client's connection pool.
 
-    Returns a list of BulkIterationResult, one per batch.
+    Returns a list of BulkIterationResult, one per batch, in input order.
     """
-    results = []
-    for i in range(0, len(inputs), batch_size):
-        batch = inputs[i : i + batch_size]
-        t0 = time.perf_counter()
-        # protect bulk: catch APIError and convert to APIResponse to continue processing
-        try:
-            protect_resp = client.protect_bulk(batch)
-        except APIError as err:
-            # try to extract body from response if available
-            resp = getattr(err, 'response', None)
-            body = None
-            status = getattr(err, 'status_code', None)
-            if resp is not None:
-                try:
-                    body = resp.json()
-                except Exception:
-                    body = getattr(resp, 'text', None)
-                status = getattr(resp, 'status_code', status)
-            # Use Thales-compliant payload keys for traceability
-            protect_resp = APIResponse(
-                status,
-                body,
-                request_payload={
-                    "protection_policy_name": client.policy,
-                    "data_array": batch,
-                },
-                request_url=client.protect_bulk_url,
-                request_headers=dict(client.session.headers),
-            )
-
-        protected_list = client.extract_protected_list_from_protect_response(protect_resp)
-
-        # reveal bulk expects list of protected tokens — handle APIError similarly
-        try:
-            if username is not None:
-                reveal_resp = client.reveal_bulk(protected_list, username=username)
-            else:
-                reveal_resp = client.reveal_bulk(protected_list)
-        except APIError as err:
-            resp = getattr(err, 'response', None)
-            body = None
-            status = getattr(err, 'status_code', None)
-            if resp is not None:
-                try:
-                    body = resp.json()
-                except Exception:
-                    body = getattr(resp, 'text', None)
-                status = getattr(resp, 'status_code', status)
-            # Use Thales-compliant payload keys for traceability; include username if present
-            pda = [p if isinstance(p, dict) else {"protected_data": p} for p in protected_list]
-            req_payload = {
-                "protection_policy_name": client.policy,
-                "protected_data_array": pda,
-            }
-            if username:
-                req_payload["username"] = username
-            reveal_resp = APIResponse(
-                status,
-                body,
-                request_payload=req_payload,
-                request_url=client.reveal_bulk_url,
-                request_headers=dict(client.session.headers),
-            )
-
-        restored_list = client.extract_restored_list_from_reveal_response(reveal_resp)
-        t1 = time.perf_counter()
-
-        results.append(
-            BulkIterationResult(
-                inputs=batch,
-                protect_response=protect_resp,
-                reveal_response=reveal_resp,
-                protected_tokens=protected_list,
-                restored_values=restored_list,
-                time_s=t1 - t0,
-            )
-        )
+    return list(iter_bulk_iteration(client, inputs, batch_size, username=username, pipeline_depth=pipeline_depth))
+
+
+def iter_bulk_iteration(
+    client: ProtectRevealClient,
+    inputs: Iterable[str],
+    batch_size: int = 25,
+    username: Optional[str] = None,
+    pipeline_depth: int = 1,
+) -> Iterator[BulkIterationResult]:
+    """Like `run_bulk_iteration`, but yields each BulkIterationResult as soon as it (and all earlier ones) finish.
 
-    return results
+    ``inputs`` is consumed lazily, one batch at a time, so generators and file readers work without materializing.
+    """
+    batches = batched(inputs, batch_size)
+    if pipeline_depth <= 1:
+        for batch in batches:
+            yield run_bulk_batch(client, batch, username=username)
+        return
+
+    pending: deque = deque()
+    with ThreadPoolExecutor(max_workers=pipeline_depth, thread_name_prefix="bulk-pipeline") as pool:
+        for batch in batches:
+            # keep at most pipeline_depth batches outstanding; collect the oldest first to preserve order
+            if len(pending) >= pipeline_depth:
+                yield pending.popleft().result()
+            pending.append(pool.submit(run_bulk_batch, client, batch, username))
+        while pending:
+            yield pending.popleft().result()
+
+
+def run_bulk_batch(
+    client: ProtectRevealClient,
+    batch: list,
+    username: Optional[str] = None,
+) -> BulkIterationResult:
+    """Run protect_bulk then reveal_bulk for a single batch."""
+    t0 = time.perf_counter()
+    # protect bulk: catch APIError and convert to APIResponse to continue processing
+    try:
+        protect_resp = client.protect_bulk(batch)
+    except APIError as err:
+        # try to extract body from response if available
+        resp = getattr(err, 'response', None)
+        body = None
+        status = getattr(err, 'status_code', None)
+        if resp is not None:
+            try:
+                body = resp.json()
+            except Exception:
+                body = getattr(resp, 'text', None)
+            status = getattr(resp, 'status_code', status)
+        # Use Thales-compliant payload keys for traceability (lean clients skip the copies)
+        protect_resp = client._response(
+            status,
+            body,
+            0.0,
+            client.protect_bulk_url,
+            client.build_protect_bulk_payload(batch) if client.trace else None,
+            client.session.headers,
+        )
+    t_protect = time.perf_counter()
+
+    protected_list = client.extract_protected_list_from_protect_response(protect_resp)
+
+    # reveal bulk expects list of protected tokens — handle APIError similarly
+    t_reveal = time.perf_counter()
+    try:
+        if username is not None:
+            reveal_resp = client.reveal_bulk(protected_list, username=username)
+        else:
+            reveal_resp = client.reveal_bulk(protected_list)
+    except APIError as err:
+        resp = getattr(err, 'response', None)
+        body = None
+        status = getattr(err, 'status_code', None)
+        if resp is not None:
+            try:
+                body = resp.json()
+            except Exception:
+                body = getattr(resp, 'text', None)
+            status = getattr(resp, 'status_code', status)
+        # Use Thales-compliant payload keys for traceability; include username if present
+        reveal_resp = client._response(
+            status,
+            body,
+            0.0,
+            client.reveal_bulk_url,
+            client.build_reveal_bulk_payload(protected_list, username) if client.trace else None,
+            client.session.headers,
+        )
+    restored_list = client.extract_restored_list_from_reveal_response(reveal_resp)
+    t1 = time.perf_counter()
+    _release_bodies(client, protect_resp, reveal_resp)
+
+    return BulkIterationResult(
+        inputs=batch,
+        protect_response=protect_resp,
+        reveal_response=reveal_resp,
+        protected_tokens=protected_list,
+        restored_values=restored_list,
+        time_s=t1 - t0,
+        protect_time_s=t_protect - t0,
+        reveal_time_s=t1 - t_reveal,
+    )
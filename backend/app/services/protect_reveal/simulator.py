@@ -0,0 +1,329 @@
+"""로컬 CRDP 시뮬레이터.
+
+실제 어플라이언스 없이 벤치마크/오프라인 테스트를 할 수 있도록 `/v1/protect`, `/v1/protectbulk`,
+`/v1/reveal`, `/v1/revealbulk`, `/healthz`를 Thales 응답 형태 그대로 제공합니다.
+토큰화는 정책별 키로 결정적이고 되돌릴 수 있으며(숫자는 자릿수 보존), 지연 시간 분포·오류율·
+페이로드 한도·처리량 상한을 설정할 수 있습니다.
+
+    python -m app.services.protect_reveal.simulator --port 32082 --healthz-port 32080 --latency exp:5
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import math
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from .jsoncodec import dumps, loads
+
+# non-numeric values are tokenized as this prefix + base64url of the value
+TEXT_TOKEN_PREFIX = "~"
+LATENCY_KINDS = ("fixed", "uniform", "exp", "lognormal")
+
+
+class Tokenizer:
+    """Deterministic, reversible stand-in for CRDP tokenization.
+
+    Digit strings keep their length and alphabet (each digit is shifted by a
+    keystream derived from the policy), so tokens look like format-preserving
+    CRDP output; any other value becomes ``~`` + base64url of a keyed XOR.
+    """
+
+    def __init__(self, secret: str = "crdp-simulator"):
+        self._secret = secret.encode("utf-8")
+
+    def _keystream(self, policy: str, length: int) -> bytes:
+        out = b""
+        counter = 0
+        while len(out) < length:
+            out += hashlib.sha256(self._secret + policy.encode("utf-8") + counter.to_bytes(4, "big")).digest()
+            counter += 1
+        return out[:length]
+
+    def protect(self, policy: str, value: str) -> str:
+        if value.isdigit() and value.isascii():
+            ks = self._keystream(policy, len(value))
+            return "".join(str((int(c) + k) % 10) for c, k in zip(value, ks))
+        raw = value.encode("utf-8")
+        ks = self._keystream(policy, len(raw))
+        return TEXT_TOKEN_PREFIX + base64.urlsafe_b64encode(bytes(a ^ b for a, b in zip(raw, ks))).decode("ascii")
+
+    def reveal(self, policy: str, token: str) -> str:
+        """Inverse of :meth:`protect`; raises ValueError for tokens it could not have produced."""
+        if token.isdigit() and token.isascii():
+            ks = self._keystream(policy, len(token))
+            return "".join(str((int(c) - k) % 10) for c, k in zip(token, ks))
+        if not token.startswith(TEXT_TOKEN_PREFIX):
+            raise ValueError("invalid protected data")
+        try:
+            raw = base64.urlsafe_b64decode(token[len(TEXT_TOKEN_PREFIX):].encode("ascii"))
+            ks = self._keystream(policy, len(raw))
+            return bytes(a ^ b for a, b in zip(raw, ks)).decode("utf-8")
+        except (ValueError, UnicodeError):
+            raise ValueError("invalid protected data")
+
+
+def parse_latency(spec: str) -> Callable[[], float]:
+    """Latency sampler in seconds from ``fixed:MS``, ``uniform:LO,HI``, ``exp:MEAN`` or ``lognormal:MEDIAN,SIGMA``."""
+    kind, _, args = spec.partition(":")
+    try:
+        params = [float(x) for x in args.split(",")] if args else []
+    except ValueError:
+        raise ValueError(f"invalid latency spec: {spec}")
+    if kind == "fixed" and len(params) == 1:
+        return lambda: params[0] / 1000.0
+    if kind == "uniform" and len(params) == 2:
+        return lambda: random.uniform(params[0], params[1]) / 1000.0
+    if kind == "exp" and len(params) == 1:
+        return lambda: random.expovariate(1.0 / params[0]) / 1000.0 if params[0] > 0 else 0.0
+    if kind == "lognormal" and len(params) == 2:
+        mu = math.log(params[0]) if params[0] > 0 else 0.0
+        return lambda: random.lognormvariate(mu, params[1]) / 1000.0
+    raise ValueError(f"invalid latency spec: {spec} (expected one of {', '.join(LATENCY_KINDS)})")
+
+
+class _RateCap:
+    """Async token bucket: requests wait for a slot instead of being rejected."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + 1.0 / self.rate
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+@dataclass
+class SimulatorConfig:
+    host: str = "127.0.0.1"
+    port: int = 32082
+    # serve /healthz on a second port as well (CRDP exposes it separately), None = API port only
+    healthz_port: Optional[int] = None
+    latency: str = "fixed:0"
+    # extra latency per bulk item, in milliseconds
+    per_item_latency_ms: float = 0.0
+    # fraction of protect/reveal calls answered with 500
+    error_rate: float = 0.0
+    # bulk calls with more items are rejected with 400; 0 = unlimited
+    max_items: int = 0
+    # request bodies larger than this are rejected with 413; 0 = unlimited
+    max_body_bytes: int = 0
+    # requests per second across all endpoints (excess requests queue); 0 = unlimited
+    max_rps: float = 0.0
+    # comma-separated accepted policies; empty = any
+    policies: str = ""
+    secret: str = "crdp-simulator"
+    seed: Optional[int] = None
+
+
+class _FastJSONResponse(JSONResponse):
+    # the simulator should not be the bottleneck of a benchmark
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class _Reject(Exception):
+    """Carries an error response out of request validation helpers."""
+
+    def __init__(self, response: JSONResponse):
+        super().__init__(response.status_code)
+        self.response = response
+
+
+def _error(status: int, message: str) -> JSONResponse:
+    return _FastJSONResponse({"code": status, "message": message}, status_code=status)
+
+
+def create_app(config: SimulatorConfig) -> FastAPI:
+    """Build the simulator ASGI app for ``config``."""
+    if config.seed is not None:
+        random.seed(config.seed)
+    tokenizer = Tokenizer(config.secret)
+    latency = parse_latency(config.latency)
+    cap = _RateCap(config.max_rps) if config.max_rps > 0 else None
+    policies = {p.strip() for p in config.policies.split(",") if p.strip()}
+    app = FastAPI(
+        title="CRDP simulator",
+        docs_url=None,
+        redoc_url=None,
+        openapi_url=None,
+        default_response_class=_FastJSONResponse,
+    )
+
+    async def admit(items: int = 1) -> Optional[JSONResponse]:
+        # shared throttling/fault injection for every v1 call; returns an error response or None
+        if cap is not None:
+            await cap.acquire()
+        delay = latency() + config.per_item_latency_ms * items / 1000.0
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if config.error_rate and random.random() < config.error_rate:
+            return _error(500, "simulated internal error")
+        return None
+
+    async def body(request: Request) -> Any:
+        raw = await request.body()
+        if config.max_body_bytes and len(raw) > config.max_body_bytes:
+            raise _Reject(_error(413, f"request body exceeds {config.max_body_bytes} bytes"))
+        try:
+            payload = loads(raw)
+        except ValueError:
+            raise _Reject(_error(400, "malformed JSON"))
+        if not isinstance(payload, dict):
+            raise _Reject(_error(400, "request body must be a JSON object"))
+        policy = payload.get("protection_policy_name")
+        if not isinstance(policy, str) or not policy:
+            raise _Reject(_error(400, "protection_policy_name is required"))
+        if policies and policy not in policies:
+            raise _Reject(_error(400, f"unknown protection policy: {policy}"))
+        return payload
+
+    def bulk_items(payload: dict, key: str) -> List[Any]:
+        items = payload.get(key)
+        if not isinstance(items, list):
+            raise _Reject(_error(400, f"{key} must be an array"))
+        if config.max_items and len(items) > config.max_items:
+            raise _Reject(_error(400, f"{key} exceeds {config.max_items} items"))
+        return items
+
+    @app.exception_handler(_Reject)
+    async def _reject_handler(request: Request, exc: _Reject):
+        return exc.response
+
+    @app.get("/healthz")
+    async def healthz():
+        return {"status": "UP"}
+
+    @app.post("/v1/protect")
+    async def protect(request: Request):
+        payload = await body(request)
+        data = payload.get("data")
+        if not isinstance(data, str):
+            return _error(400, "data is required")
+        failed = await admit()
+        if failed is not None:
+            return failed
+        return {"protected_data": tokenizer.protect(payload["protection_policy_name"], data)}
+
+    @app.post("/v1/reveal")
+    async def reveal(request: Request):
+        payload = await body(request)
+        token = payload.get("protected_data")
+        if not isinstance(token, str):
+            return _error(400, "protected_data is required")
+        failed = await admit()
+        if failed is not None:
+            return failed
+        try:
+            return {"data": tokenizer.reveal(payload["protection_policy_name"], token)}
+        except ValueError as e:
+            return _error(400, str(e))
+
+    @app.post("/v1/protectbulk")
+    async def protect_bulk(request: Request):
+        payload = await body(request)
+        items = bulk_items(payload, "data_array")
+        failed = await admit(len(items))
+        if failed is not None:
+            return failed
+        policy = payload["protection_policy_name"]
+        out = [{"protected_data": tokenizer.protect(policy, str(v))} for v in items]
+        return {
+            "status": "Success",
+            "total_count": len(out),
+            "success_count": len(out),
+            "error_count": 0,
+            "protected_data_array": out,
+        }
+
+    @app.post("/v1/revealbulk")
+    async def reveal_bulk(request: Request):
+        payload = await body(request)
+        items = bulk_items(payload, "protected_data_array")
+        failed = await admit(len(items))
+        if failed is not None:
+            return failed
+        policy = payload["protection_policy_name"]
+        out = []
+        errors = 0
+        for item in items:
+            token = item.get("protected_data") if isinstance(item, dict) else item
+            try:
+                out.append({"data": tokenizer.reveal(policy, str(token))})
+            except ValueError as e:
+                errors += 1
+                out.append({"error_message": str(e)})
+        return {
+            "status": "Success" if not errors else "Partial",
+            "total_count": len(out),
+            "success_count": len(out) - errors,
+            "error_count": errors,
+            "data_array": out,
+        }
+
+    return app
+
+
+async def serve(config: SimulatorConfig) -> None:
+    import uvicorn
+
+    app = create_app(config)
+    ports = [config.port]
+    if config.healthz_port and config.healthz_port != config.port:
+        ports.append(config.healthz_port)
+    servers = [
+        uvicorn.Server(uvicorn.Config(app, host=config.host, port=port, log_level="warning", access_log=False))
+        for port in ports
+    ]
+    await asyncio.gather(*(server.serve() for server in servers))
+
+
+def main(argv: Optional[list] = None) -> int:
+    defaults = SimulatorConfig()
+    parser = argparse.ArgumentParser(description="Local CRDP protect/reveal simulator")
+    parser.add_argument("--host", default=defaults.host, help="bind address (default 127.0.0.1)")
+    parser.add_argument("--port", default=defaults.port, type=int, help="protect/reveal API port (default 32082)")
+    parser.add_argument("--healthz-port", default=None, type=int, help="also serve /healthz on this port")
+    parser.add_argument(
+        "--latency",
+        default=defaults.latency,
+        help="per-call latency: fixed:MS, uniform:LO,HI, exp:MEAN or lognormal:MEDIAN,SIGMA (default fixed:0)",
+    )
+    parser.add_argument("--per-item-latency-ms", default=0.0, type=float, help="extra latency per bulk item (ms)")
+    parser.add_argument("--error-rate", default=0.0, type=float, help="fraction of calls answered with 500")
+    parser.add_argument("--max-items", default=0, type=int, help="reject bulk calls with more items (0 = unlimited)")
+    parser.add_argument("--max-body-bytes", default=0, type=int, help="reject larger request bodies with 413")
+    parser.add_argument("--max-rps", default=0.0, type=float, help="throughput cap; excess requests queue (0 = off)")
+    parser.add_argument("--policies", default="", help="comma-separated accepted policies (default any)")
+    parser.add_argument("--secret", default=defaults.secret, help="tokenization key")
+    parser.add_argument("--seed", default=None, type=int, help="random seed for latency/error sampling")
+    args = parser.parse_args(argv)
+    try:
+        parse_latency(args.latency)
+    except ValueError as e:
+        parser.error(str(e))
+    if not 0.0 <= args.error_rate <= 1.0:
+        parser.error("--error-rate must be between 0 and 1")
+    config = SimulatorConfig(**vars(args))
+    try:
+        asyncio.run(serve(config))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
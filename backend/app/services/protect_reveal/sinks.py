@@ -0,0 +1,125 @@
+"""반복/배치 결과를 생성되는 즉시 파일로 내보내는 스트리밍 sink.
+
+결과 객체를 메모리에 모아두지 않고 한 줄(JSONL) 또는 한 행(CSV)씩 바로 기록하므로
+장시간(soak) 실행에서도 메모리 사용량이 반복 횟수와 무관하게 일정합니다.
+"""
+
+import csv
+import json
+from typing import IO, Any, Dict, List, Optional
+
+from .openloop import ScheduledResult
+from .runner import BulkIterationResult
+
+ITERATION_FIELDS = [
+    "index",
+    "data",
+    "protected_token",
+    "restored",
+    "protect_status",
+    "reveal_status",
+    "success",
+    "match",
+    "time_s",
+    "protect_time_s",
+    "reveal_time_s",
+]
+BULK_FIELDS = [
+    "index",
+    "size",
+    "protect_status",
+    "reveal_status",
+    "successful",
+    "matched",
+    "time_s",
+    "protect_time_s",
+    "reveal_time_s",
+]
+SCHEDULE_FIELDS = ["scheduled_s", "lag_s", "latency_s"]
+
+
+def result_record(index: int, result: Any) -> Dict[str, Any]:
+    """Flatten an IterationResult/BulkIterationResult/ScheduledResult into a sink row."""
+    schedule: Dict[str, Any] = {}
+    if isinstance(result, ScheduledResult):
+        schedule = {"scheduled_s": result.scheduled_s, "lag_s": result.lag_s, "latency_s": result.latency_s}
+        result = result.result
+    if isinstance(result, BulkIterationResult):
+        record: Dict[str, Any] = {
+            "index": index,
+            "size": len(result.inputs),
+            "protect_status": result.protect_response.status_code,
+            "reveal_status": result.reveal_response.status_code,
+            "successful": len(result.restored_values),
+            "matched": sum(1 for m in result.matches if m),
+        }
+    else:
+        record = {
+            "index": index,
+            "data": result.data,
+            "protected_token": result.protected_token,
+            "restored": result.restored,
+            "protect_status": result.protect_response.status_code,
+            "reveal_status": result.reveal_response.status_code,
+            "success": result.success,
+            "match": result.match,
+        }
+    record["time_s"] = result.time_s
+    record["protect_time_s"] = result.protect_time_s
+    record["reveal_time_s"] = result.reveal_time_s
+    record.update(schedule)
+    return record
+
+
+class ResultSink:
+    """Base sink: ``write`` one result at a time, ``close`` when the run ends."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fh: IO[str] = open(path, "w", encoding="utf-8", newline="")
+
+    def write(self, index: int, result: Any) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+class JsonlSink(ResultSink):
+    def write(self, index: int, result: Any) -> None:
+        self._fh.write(json.dumps(result_record(index, result), ensure_ascii=False))
+        self._fh.write("\n")
+
+
+class CsvSink(ResultSink):
+    def __init__(self, path: str, fields: List[str]):
+        super().__init__(path)
+        self._writer = csv.DictWriter(self._fh, fieldnames=fields, extrasaction="ignore")
+        self._writer.writeheader()
+
+    def write(self, index: int, result: Any) -> None:
+        self._writer.writerow(result_record(index, result))
+
+
+def open_sink(path: Optional[str], fmt: str = "jsonl", bulk: bool = False, scheduled: bool = False) -> Optional[ResultSink]:
+    """Open a JSONL or CSV sink at ``path`` (None disables streaming output)."""
+    if not path:
+        return None
+    if fmt == "jsonl":
+        return JsonlSink(path)
+    if fmt == "csv":
+        fields = list(BULK_FIELDS if bulk else ITERATION_FIELDS)
+        if scheduled:
+            fields += SCHEDULE_FIELDS
+        return CsvSink(path, fields)
+    raise ValueError(f"unsupported output format: {fmt}")
+
+
+def worker_path(path: Optional[str], worker: int) -> Optional[str]:
+    """Per-process output path: results.jsonl -> results.w1.jsonl."""
+    if not path:
+        return None
+    stem, dot, ext = path.rpartition(".")
+    if not dot or "/" in ext:
+        return f"{path}.w{worker}"
+    return f"{stem}.w{worker}.{ext}"
@@ -0,0 +1,124 @@
+"""CLI 실행 결과 요약.
+
+반복/배치 결과를 하나씩 더하면서 성공/일치 건수와 단계별(protect/reveal) 지연 시간
+히스토그램을 누적합니다. 텍스트(로그)와 JSON 두 형태로 출력할 수 있습니다.
+"""
+
+import logging
+from typing import Any, Dict
+
+from .histogram import LatencyHistogram
+from .openloop import ScheduledResult
+from .runner import BulkIterationResult, IterationResult
+
+
+class RunSummary:
+    """Incremental summary of a protect/reveal run.
+
+    Non-bulk runs record per-item ``iteration``/``protect``/``reveal`` timings;
+    bulk runs record per-batch ``batch``/``protect_batch``/``reveal_batch`` timings.
+    Open-loop runs additionally record ``latency`` (from intended send) and ``lag``.
+    """
+
+    def __init__(self, mode: str = "closed-loop"):
+        self.mode = mode
+        self.attempted = 0
+        self.successful = 0
+        self.matched = 0
+        self.requests = 0
+        self.wall_time_s = 0.0
+        self.histograms: Dict[str, LatencyHistogram] = {}
+
+    def _hist(self, name: str) -> LatencyHistogram:
+        hist = self.histograms.get(name)
+        if hist is None:
+            hist = self.histograms[name] = LatencyHistogram()
+        return hist
+
+    def add_iteration(self, result: IterationResult) -> None:
+        self.requests += 1
+        self.attempted += 1
+        if result.success:
+            self.successful += 1
+        if result.match:
+            self.matched += 1
+        self._hist("iteration").record(result.time_s)
+        self._hist("protect").record(result.protect_time_s)
+        self._hist("reveal").record(result.reveal_time_s)
+
+    def add_bulk(self, result: BulkIterationResult) -> None:
+        self.requests += 1
+        n = len(result.inputs)
+        self.attempted += n
+        # Count successful items: prefer exact full-batch success, otherwise fall back to restored count
+        if (
+            getattr(result.protect_response, "is_success", False)
+            and getattr(result.reveal_response, "is_success", False)
+            and len(result.restored_values) == n
+        ):
+            self.successful += n
+        else:
+            self.successful += len(result.restored_values)
+        self.matched += sum(1 for m in result.matches if m)
+        self._hist("batch").record(result.time_s)
+        self._hist("protect_batch").record(result.protect_time_s)
+        self._hist("reveal_batch").record(result.reveal_time_s)
+
+    def add(self, result: Any) -> None:
+        if isinstance(result, ScheduledResult):
+            self._hist("latency").record(result.latency_s)
+            self._hist("lag").record(result.lag_s)
+            result = result.result
+        if isinstance(result, BulkIterationResult):
+            self.add_bulk(result)
+        else:
+            self.add_iteration(result)
+
+    def merge(self, other: "RunSummary") -> None:
+        self.attempted += other.attempted
+        self.successful += other.successful
+        self.matched += other.matched
+        self.requests += other.requests
+        for name, hist in other.histograms.items():
+            self._hist(name).merge(hist)
+
+    @property
+    def avg_item_time_s(self) -> float:
+        # bulk: batch time spread over its items, as the original summary did
+        hist = self.histograms.get("iteration") or self.histograms.get("batch")
+        return hist.total / self.attempted if hist is not None and self.attempted else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {
+            "mode": self.mode,
+            "iterations_attempted": self.attempted,
+            "successful": self.successful,
+            "matched": self.matched,
+            "requests": self.requests,
+            "total_time_s": self.wall_time_s,
+            "avg_per_iteration_s": self.avg_item_time_s,
+            "throughput_per_s": self.attempted / self.wall_time_s if self.wall_time_s > 0 else 0.0,
+            "latency": {name: hist.to_dict() for name, hist in self.histograms.items()},
+        }
+        return out
+
+    def log(self, logger: logging.Logger) -> None:
+        logger.info("\nSummary:")
+        if self.mode != "closed-loop":
+            logger.info("Mode: %s", self.mode)
+        logger.info("Iterations attempted: %d", self.attempted)
+        logger.info("Successful (both 2xx): %d", self.successful)
+        logger.info("Revealed matched original data: %d", self.matched)
+        logger.info("Total time: %.4fs", self.wall_time_s)
+        if self.attempted:
+            logger.info("Average per-iteration time: %.4fs", self.avg_item_time_s)
+        if self.wall_time_s > 0:
+            logger.info("Throughput: %.1f iterations/s", self.attempted / self.wall_time_s)
+            if "latency" in self.histograms:
+                logger.info("Achieved rate: %.1f req/s", self.requests / self.wall_time_s)
+        for name, hist in self.histograms.items():
+            if hist.count:
+                logger.info("%-14s %s", name + ":", hist.format())
+        lag = self.histograms.get("lag")
+        if lag is not None and lag.count:
+            logger.info("Requests sent >1ms behind schedule: %d", lag.count - lag.count_at_or_below(0.001))
@@ -8,3 +8,14 @@ def increment_numeric_string(s: str) -> str:
     width = len(s)
     n = int(s) + 1
     return f"{n:0{width}d}"
+
+
+def offset_numeric_string(s: str, n: int) -> str:
+    """Add ``n`` to a numeric string while preserving width (zero padding).
+
+    Raises ValueError if the input is not a digit-only string.
+    """
+    if not s.isdigit():
+        raise ValueError("data must be a numeric string")
+    width = len(s)
+    return f"{int(s) + n:0{width}d}"
@@ -0,0 +1,7 @@
+"""백엔드 성능 벤치마크 모음 (micro / runner / e2e).
+
+결과는 JSON으로 저장되며 기준선 파일과 비교해 성능 회귀를 검출합니다::
+
+    python -m benchmarks --suite all --output bench.json
+    python -m benchmarks --suite micro --compare bench.json --threshold 0.2
+"""
@@ -0,0 +1,62 @@
+"""벤치마크 CLI: 스위트 실행, JSON 결과 저장, 기준선 대비 회귀 검사."""
+
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+from . import e2e, micro, runner
+from .common import compare, environment
+
+SUITES = ("micro", "runner", "e2e")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Backend performance benchmarks")
+    parser.add_argument("--suite", choices=SUITES + ("all",), default="all", help="suite to run (default all)")
+    parser.add_argument("--quick", action="store_true", help="smaller sizes and fewer rounds (smoke run)")
+    parser.add_argument("--latency", default="fixed:0", help="simulated CRDP latency spec for runner/e2e")
+    parser.add_argument("--output", default=None, help="write results as JSON to this file")
+    parser.add_argument("--compare", default=None, help="baseline JSON file to check for regressions")
+    parser.add_argument(
+        "--threshold", default=0.2, type=float, help="relative slowdown counted as a regression (default 0.2)"
+    )
+    args = parser.parse_args(argv)
+
+    # read the baseline up front so --output may overwrite the same file
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    suites = SUITES if args.suite == "all" else (args.suite,)
+    results = []
+    for suite in suites:
+        if suite == "micro":
+            results.extend(micro.run(quick=args.quick))
+        elif suite == "runner":
+            results.extend(runner.run(quick=args.quick, latency=args.latency))
+        else:
+            results.extend(e2e.run(quick=args.quick, latency=args.latency))
+
+    report = {"environment": environment(), "results": [r.to_dict() for r in results]}
+    for r in results:
+        extra = " ".join(f"{k}={v:.3g}" for k, v in r.extra.items() if k.endswith("_ms"))
+        print(f"{r.key:<70} {r.value:>14,.1f} {r.unit:<8} {extra}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if baseline is not None:
+        regressions = compare(baseline, report, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""벤치마크 공통 도구: 결과 레코드, 시뮬레이터/백엔드 프로세스 실행, 기준선 비교."""
+
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.services.protect_reveal.histogram import LatencyHistogram
+from app.services.protect_reveal.jsoncodec import BACKEND as JSON_BACKEND
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class BenchResult:
+    suite: str
+    name: str
+    params: Dict[str, Any]
+    # primary metric used for regression checks
+    value: float
+    unit: str
+    higher_is_better: bool
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        params = ",".join(f"{k}={v}" for k, v in sorted(self.params.items()))
+        return f"{self.suite}/{self.name}[{params}]"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"key": self.key, **asdict(self)}
+
+
+def latency_extra(hist: LatencyHistogram) -> Dict[str, float]:
+    """Latency percentiles in milliseconds for a result's ``extra`` field."""
+    return {
+        "p50_ms": hist.percentile(50) * 1000.0,
+        "p90_ms": hist.percentile(90) * 1000.0,
+        "p99_ms": hist.percentile(99) * 1000.0,
+        "max_ms": hist.max * 1000.0,
+    }
+
+
+def environment() -> Dict[str, Any]:
+    commit = None
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        pass
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "json_backend": JSON_BACKEND,
+        "git_commit": commit,
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port: int, proc: subprocess.Popen, timeout: float = 15.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"process exited early with code {proc.returncode}: {proc.args}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"port {port} did not open within {timeout}s")
+
+
+@contextmanager
+def background_process(args: List[str], port: int, env: Optional[Dict[str, str]] = None) -> Iterator[None]:
+    """Run ``python <args>`` from the backend directory until the block exits."""
+    proc = subprocess.Popen(
+        [sys.executable, *args],
+        cwd=BACKEND_DIR,
+        env={**os.environ, **(env or {})},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_for_port(port, proc)
+        yield
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+@contextmanager
+def simulator(latency: str = "fixed:0") -> Iterator[int]:
+    """Start the CRDP simulator on a free port; yields the port."""
+    port = free_port()
+    args = ["-m", "app.services.protect_reveal.simulator", "--port", str(port), "--latency", latency]
+    with background_process(args, port):
+        yield port
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    """Regressions of ``current`` against ``baseline`` beyond ``threshold`` (relative), as messages."""
+    before = {r["key"]: r for r in baseline.get("results", [])}
+    out = []
+    for result in current.get("results", []):
+        old = before.get(result["key"])
+        if old is None or not old["value"]:
+            continue
+        change = (result["value"] - old["value"]) / old["value"]
+        worse = -change if result["higher_is_better"] else change
+        if worse > threshold:
+            out.append(
+                f"{result['key']}: {old['value']:.4g} -> {result['value']:.4g} {result['unit']} "
+                f"({worse * 100:.1f}% worse)"
+            )
+    return out
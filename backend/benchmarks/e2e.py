@@ -0,0 +1,125 @@
+"""종단간 벤치마크: 시뮬레이터 + uvicorn 백엔드를 띄우고 /api/crdp/* 라우트별 처리량·지연 측정."""
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import httpx
+
+from app.services.protect_reveal.histogram import LatencyHistogram
+from app.services.protect_reveal.utils import offset_numeric_string
+
+from .common import BenchResult, background_process, free_port, latency_extra, simulator
+
+START_DATA = "1234567890123"
+BULK_SIZE = 100
+FILE_ROWS = 500
+
+# route name -> (method, path, kwargs factory taking the request index and the token fixtures)
+RequestFactory = Callable[[int, Dict[str, Any]], Tuple[str, str, Dict[str, Any]]]
+
+
+def _routes() -> Dict[str, RequestFactory]:
+    return {
+        "protect": lambda i, fx: (
+            "POST", "/api/crdp/protect", {"json": {"data": offset_numeric_string(START_DATA, i)}}
+        ),
+        "reveal": lambda i, fx: (
+            "POST", "/api/crdp/reveal", {"json": {"protected_data": fx["tokens"][i % len(fx["tokens"])]}}
+        ),
+        "protect-bulk": lambda i, fx: ("POST", "/api/crdp/protect-bulk", {"json": {"data_array": fx["values"]}}),
+        "reveal-bulk": lambda i, fx: (
+            "POST", "/api/crdp/reveal-bulk", {"json": {"protected_data_array": fx["tokens"]}}
+        ),
+        "health": lambda i, fx: ("GET", "/api/crdp/health", {}),
+        "transform-file": lambda i, fx: (
+            "POST", "/api/crdp/transform-file",
+            {
+                "params": {"columns": "ssn", "operation": "protect", "format": "csv"},
+                "content": fx["csv"],
+                "headers": {"content-type": "text/csv"},
+            },
+        ),
+    }
+
+
+async def _fixtures(http: httpx.AsyncClient) -> Dict[str, Any]:
+    values = [offset_numeric_string(START_DATA, i) for i in range(BULK_SIZE)]
+    resp = await http.post("/api/crdp/protect-bulk", json={"data_array": values})
+    resp.raise_for_status()
+    rows = "".join(f"{i},{offset_numeric_string(START_DATA, i)}\n" for i in range(FILE_ROWS))
+    return {
+        "values": values,
+        "tokens": resp.json()["protected_data_array"],
+        "csv": f"id,ssn\n{rows}".encode(),
+    }
+
+
+def _failed(resp: httpx.Response) -> bool:
+    if resp.status_code >= 400:
+        return True
+    # protect/reveal routes answer 200 and carry the upstream status in the body
+    if resp.headers.get("content-type", "").startswith("application/json"):
+        body = resp.json()
+        return isinstance(body, dict) and (body.get("status_code") or 200) >= 400
+    return False
+
+
+async def _drive(
+    http: httpx.AsyncClient, factory: RequestFactory, fixtures: Dict[str, Any], concurrency: int, requests: int
+) -> Tuple[float, LatencyHistogram, int]:
+    """Send ``requests`` calls from ``concurrency`` workers; returns (elapsed, latencies, errors)."""
+    hist = LatencyHistogram()
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in counter:
+            method, path, kwargs = factory(i, fixtures)
+            t0 = time.perf_counter()
+            try:
+                resp = await http.request(method, path, **kwargs)
+                failed = _failed(resp)
+            except httpx.HTTPError:
+                failed = True
+            hist.record(time.perf_counter() - t0)
+            errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - started, hist, errors
+
+
+async def _run_routes(base_url: str, concurrencies: Tuple[int, ...], requests: int) -> List[BenchResult]:
+    results = []
+    limits = httpx.Limits(max_connections=max(concurrencies), max_keepalive_connections=max(concurrencies))
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as http:
+        fixtures = await _fixtures(http)
+        for name, factory in _routes().items():
+            # fewer rounds for the heavy routes so every route takes a comparable wall time
+            count = max(requests // 10, 10) if name in ("protect-bulk", "reveal-bulk", "transform-file") else requests
+            await _drive(http, factory, fixtures, 1, min(count, 5))  # warm up
+            for concurrency in concurrencies:
+                elapsed, hist, errors = await _drive(http, factory, fixtures, concurrency, count)
+                results.append(BenchResult(
+                    "e2e", name, {"concurrency": concurrency},
+                    count / elapsed, "req/s", True, {**latency_extra(hist), "requests": count, "errors": errors},
+                ))
+    return results
+
+
+def run(quick: bool = False, latency: str = "fixed:0") -> List[BenchResult]:
+    concurrencies = (1, 8) if quick else (1, 8, 32)
+    requests = 50 if quick else 500
+    with simulator(latency) as sim_port:
+        port = free_port()
+        env = {
+            "CRDP_API_HOST": "127.0.0.1",
+            "CRDP_API_PORT": str(sim_port),
+            "CRDP_HEALTHZ_PORT": str(sim_port),
+            "CRDP_HEALTH_PROBE_INTERVAL": "0",
+        }
+        args = ["-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"]
+        with background_process(args, port, env=env):
+            return asyncio.run(_run_routes(f"http://127.0.0.1:{port}", concurrencies, requests))
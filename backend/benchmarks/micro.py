@@ -0,0 +1,45 @@
+"""마이크로 벤치마크: 응답 파서, bulk 페이로드 생성, 숫자 문자열 증가 등 hot path 헬퍼."""
+
+import timeit
+from typing import Callable, List
+
+from app.services.protect_reveal.client import APIResponse, BaseProtectRevealClient
+from app.services.protect_reveal.jsoncodec import dumps, loads
+from app.services.protect_reveal.utils import increment_numeric_string
+
+from .common import BenchResult
+
+
+def _ns_per_op(fn: Callable[[], object], repeat: int) -> float:
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    # best of ``repeat`` runs: the least disturbed measurement
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e9
+
+
+def run(quick: bool = False) -> List[BenchResult]:
+    sizes = (100,) if quick else (100, 1000, 10000)
+    repeat = 2 if quick else 5
+    client = BaseProtectRevealClient("bench", 32082, "P03", trace=False)
+    results = []
+
+    def record(name: str, fn: Callable[[], object], **params: object) -> None:
+        ns = _ns_per_op(fn, repeat)
+        results.append(BenchResult("micro", name, dict(params), ns, "ns/op", False))
+
+    for n in sizes:
+        tokens = [f"{1234567890123 + i}" for i in range(n)]
+        protect_body = {"protected_data_array": [{"protected_data": t} for t in tokens]}
+        reveal_body = {"data_array": [{"data": t} for t in tokens]}
+        protect_resp = APIResponse(200, protect_body)
+        reveal_resp = APIResponse(200, reveal_body)
+        raw = dumps(reveal_body)
+
+        record("extract_protected_list", lambda: client.extract_protected_list_from_protect_response(protect_resp), items=n)
+        record("extract_restored_list", lambda: client.extract_restored_list_from_reveal_response(reveal_resp), items=n)
+        record("build_reveal_bulk_payload", lambda: dumps(client.build_reveal_bulk_payload(tokens)), items=n)
+        record("encode_reveal_bulk_payload", lambda: client.encode_reveal_bulk_payload(tokens), items=n)
+        record("decode_bulk_response", lambda: loads(raw), items=n)
+
+    record("increment_numeric_string", lambda: increment_numeric_string("1234567890123"))
+    return results
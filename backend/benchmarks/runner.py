@@ -0,0 +1,61 @@
+"""러너 벤치마크: 시뮬레이터를 상대로 run_iteration / run_bulk_iteration 처리량 측정."""
+
+import time
+from typing import List
+
+from app.services.protect_reveal.client import ProtectRevealClient
+from app.services.protect_reveal.histogram import LatencyHistogram
+from app.services.protect_reveal.runner import run_bulk_iteration, run_iteration
+from app.services.protect_reveal.utils import offset_numeric_string
+
+from .common import BenchResult, latency_extra, simulator
+
+START_DATA = "1234567890123"
+
+
+def _inputs(n: int) -> List[str]:
+    return [offset_numeric_string(START_DATA, i) for i in range(n)]
+
+
+def run(quick: bool = False, latency: str = "fixed:0") -> List[BenchResult]:
+    iterations = 50 if quick else 500
+    batch_sizes = (10, 100) if quick else (10, 100, 500)
+    bulk_items = 200 if quick else 5000
+    results = []
+
+    with simulator(latency) as port:
+        client = ProtectRevealClient("127.0.0.1", port, "P03", trace=False)
+        try:
+            hist = LatencyHistogram()
+            failed = 0
+            started = time.perf_counter()
+            for data in _inputs(iterations):
+                result = run_iteration(client, data)
+                hist.record(result.time_s)
+                failed += not result.match
+            elapsed = time.perf_counter() - started
+            results.append(BenchResult(
+                "runner", "run_iteration", {"iterations": iterations},
+                iterations / elapsed, "iter/s", True, {**latency_extra(hist), "mismatches": failed},
+            ))
+
+            for batch_size in batch_sizes:
+                for depth in (1, 4):
+                    hist = LatencyHistogram()
+                    started = time.perf_counter()
+                    batches = run_bulk_iteration(
+                        client, _inputs(bulk_items), batch_size=batch_size, pipeline_depth=depth
+                    )
+                    elapsed = time.perf_counter() - started
+                    mismatches = 0
+                    for batch in batches:
+                        hist.record(batch.time_s)
+                        mismatches += batch.matches.count(False)
+                    results.append(BenchResult(
+                        "runner", "run_bulk_iteration",
+                        {"batch_size": batch_size, "pipeline_depth": depth, "items": bulk_items},
+                        bulk_items / elapsed, "items/s", True, {**latency_extra(hist), "mismatches": mismatches},
+                    ))
+        finally:
+            client.close()
+    return results
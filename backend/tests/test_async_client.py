@@ -0,0 +1,89 @@
+"""Tests for AsyncProtectRevealClient against an in-process httpx transport."""
+import asyncio
+import json
+
+import httpx
+
+from app.services.protect_reveal.async_client import AsyncProtectRevealClient
+
+
+def _client(handler) -> AsyncProtectRevealClient:
+    client = AsyncProtectRevealClient(host="crdp", port=32082, policy="P03")
+    client.http = httpx.AsyncClient(transport=httpx.MockTransport(handler), headers=client.http.headers)
+    return client
+
+
+def test_protect_bulk_sends_thales_payload():
+    seen = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen["url"] = str(request.url)
+        seen["body"] = json.loads(request.content)
+        return httpx.Response(200, json={"protected_data_array": [{"protected_data": "T1"}, {"protected_data": "T2"}]})
+
+    async def scenario():
+        client = _client(handler)
+        resp = await client.protect_bulk(["1", "2"])
+        await client.aclose()
+        return client, resp
+
+    client, resp = asyncio.run(scenario())
+    assert seen["url"] == "http://crdp:32082/v1/protectbulk"
+    assert seen["body"] == {"protection_policy_name": "P03", "data_array": ["1", "2"]}
+    assert resp.is_success
+    assert client.extract_protected_list_from_protect_response(resp) == ["T1", "T2"]
+
+
+def test_reveal_bulk_includes_username():
+    seen = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen["body"] = json.loads(request.content)
+        return httpx.Response(200, json={"data_array": [{"data": "1"}]})
+
+    async def scenario():
+        client = _client(handler)
+        resp = await client.reveal_bulk(["T1"], username="alice")
+        await client.aclose()
+        return client, resp
+
+    client, resp = asyncio.run(scenario())
+    assert seen["body"]["protected_data_array"] == [{"protected_data": "T1"}]
+    assert seen["body"]["username"] == "alice"
+    assert client.extract_restored_list_from_reveal_response(resp) == ["1"]
+
+
+def test_connection_error_returns_response_without_status():
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("connection refused", request=request)
+
+    async def scenario():
+        client = _client(handler)
+        resp = await client.post_json(client.protect_url, {"data": "1"})
+        await client.aclose()
+        return resp
+
+    resp = asyncio.run(scenario())
+    assert resp.status_code is None
+    assert not resp.is_success
+    assert "connection refused" in resp.body
+
+
+def test_lean_mode_skips_request_metadata():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"protected_data_array": [{"protected_data": "T1"}]})
+
+    async def scenario():
+        client = _client(handler)
+        client.trace = False
+        lean = await client.protect_bulk(["1"])
+        traced = await client.protect_bulk(["1"], trace=True)
+        await client.aclose()
+        return client, lean, traced
+
+    client, lean, traced = asyncio.run(scenario())
+    assert lean.request_payload is None and lean.request_url is None and lean.request_headers is None
+    assert lean.elapsed_s > 0
+    assert client.extract_protected_list_from_protect_response(lean) == ["T1"]
+    assert traced.request_payload == {"protection_policy_name": "P03", "data_array": ["1"]}
+    assert traced.request_headers["content-type"] == "application/json"
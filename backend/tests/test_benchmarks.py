@@ -0,0 +1,40 @@
+"""Tests for the benchmark suite's result format and regression check."""
+import json
+
+from benchmarks import micro
+from benchmarks.__main__ import main
+from benchmarks.common import BenchResult, compare
+
+
+def _report(*results: BenchResult) -> dict:
+    return {"results": [r.to_dict() for r in results]}
+
+
+def test_compare_flags_only_regressions_beyond_threshold():
+    baseline = _report(
+        BenchResult("micro", "parse", {"items": 100}, 1000.0, "ns/op", False),
+        BenchResult("e2e", "protect", {"concurrency": 8}, 500.0, "req/s", True),
+        BenchResult("e2e", "reveal", {"concurrency": 8}, 500.0, "req/s", True),
+    )
+    current = _report(
+        BenchResult("micro", "parse", {"items": 100}, 1300.0, "ns/op", False),  # 30% slower
+        BenchResult("e2e", "protect", {"concurrency": 8}, 450.0, "req/s", True),  # 10% lower, within threshold
+        BenchResult("e2e", "reveal", {"concurrency": 8}, 800.0, "req/s", True),  # faster
+        BenchResult("e2e", "health", {"concurrency": 8}, 1.0, "req/s", True),  # no baseline
+    )
+    regressions = compare(baseline, current, threshold=0.2)
+    assert len(regressions) == 1 and regressions[0].startswith("micro/parse[items=100]")
+
+
+def test_quick_micro_run_writes_json_and_compares_against_itself(tmp_path, capsys):
+    results = micro.run(quick=True)
+    assert {r.name for r in results} >= {"extract_protected_list", "encode_reveal_bulk_payload", "increment_numeric_string"}
+    assert all(r.value > 0 and r.unit == "ns/op" for r in results)
+
+    out = tmp_path / "bench.json"
+    out.write_text(json.dumps({"results": [dict(r.to_dict(), value=r.value * 100) for r in results]}))
+    # the baseline is read before --output overwrites the same file
+    assert main(["--suite", "micro", "--quick", "--output", str(out), "--compare", str(out)]) == 0
+    report = json.loads(out.read_text())
+    assert report["environment"]["json_backend"] in ("orjson", "json")
+    assert len(report["results"]) == len(results)
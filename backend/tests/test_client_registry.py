@@ -0,0 +1,117 @@
+"""Tests for the pooled ProtectRevealClient registry."""
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+
+import httpx
+
+from app.services.protect_reveal.async_client import AsyncProtectRevealClient
+from app.services.protect_reveal.registry import AsyncClientRegistry, ClientRegistry
+
+
+def _registry(**kwargs):
+    factory = MagicMock(side_effect=lambda **kw: MagicMock(name=f"client-{kw['host']}"))
+    return ClientRegistry(factory=factory, **kwargs), factory
+
+
+def test_same_key_reuses_client():
+    registry, factory = _registry()
+    a = registry.get("h1", 32082, "P03", timeout=10)
+    b = registry.get("h1", 32082, "P03", timeout=10)
+    assert a is b
+    assert factory.call_count == 1
+
+
+def test_different_key_creates_new_client():
+    registry, factory = _registry()
+    a = registry.get("h1", 32082, "P03", timeout=10)
+    b = registry.get("h1", 32082, "P03", timeout=5)
+    assert a is not b
+    assert len(registry) == 2
+
+
+def test_max_clients_closes_least_recently_used():
+    registry, _ = _registry(max_clients=2)
+    a = registry.get("h1", 1, "P03")
+    b = registry.get("h2", 1, "P03")
+    registry.get("h1", 1, "P03")  # touch h1 so h2 becomes LRU
+    registry.get("h3", 1, "P03")
+    assert len(registry) == 2
+    a.close.assert_not_called()
+    b.close.assert_called_once()
+
+
+def test_idle_clients_are_evicted_and_closed():
+    registry, _ = _registry(idle_ttl=30.0)
+    a = registry.get("h1", 1, "P03")
+    assert registry.evict_idle(now=time.monotonic() + 60) == 1
+    a.close.assert_called_once()
+    assert len(registry) == 0
+
+
+def test_close_all():
+    registry, _ = _registry()
+    a = registry.get("h1", 1, "P03")
+    b = registry.get("h2", 1, "P03")
+    registry.close_all()
+    a.close.assert_called_once()
+    b.close.assert_called_once()
+    assert len(registry) == 0
+
+
+def _async_registry(handler, **kwargs):
+    def factory(**kw):
+        client = AsyncProtectRevealClient(**kw)
+        client.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return client
+
+    return AsyncClientRegistry(factory=factory, **kwargs)
+
+
+def test_evicted_async_client_is_closed_after_its_in_flight_call():
+    release = asyncio.Event()
+
+    async def handler(request):
+        await release.wait()
+        return httpx.Response(200, json={"protected_data": "T1"})
+
+    async def scenario():
+        registry = _async_registry(handler, max_clients=1)
+        old = registry.get("h1", 1, "P03")
+        call = asyncio.ensure_future(old.protect("1"))
+        await asyncio.sleep(0.01)
+        registry.get("h2", 1, "P03")  # evicts h1 while its call is in flight
+        await asyncio.sleep(0.01)
+        closed_early = old.http.is_closed
+        release.set()
+        response = await call
+        await asyncio.sleep(0.01)
+        await registry.aclose_all()
+        return closed_early, response, old.http.is_closed
+
+    closed_early, response, closed = asyncio.run(scenario())
+    assert not closed_early and response.is_success and closed
+
+
+def test_clients_of_a_previous_loop_are_closed_on_that_loop():
+    registry = _async_registry(lambda request: httpx.Response(200, json={}))
+    owner = asyncio.new_event_loop()
+    thread = threading.Thread(target=owner.run_forever, daemon=True)
+    thread.start()
+
+    async def get():
+        return registry.get("h1", 1, "P03")
+
+    try:
+        old = asyncio.run_coroutine_threadsafe(get(), owner).result(5)
+        new = asyncio.run(get())
+        assert new is not old
+        deadline = time.monotonic() + 5
+        while not old.http.is_closed and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert old.http.is_closed and not new.http.is_closed
+    finally:
+        owner.call_soon_threadsafe(owner.stop)
+        thread.join(5)
+        owner.close()
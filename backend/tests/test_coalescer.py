@@ -0,0 +1,125 @@
+"""Tests for micro-batching of single-item protect/reveal calls."""
+import asyncio
+
+import pytest
+
+from app.services.protect_reveal.client import APIError, APIResponse, BaseProtectRevealClient
+from app.services.protect_reveal.coalescer import BulkCoalescer
+
+
+class FakeAsyncClient(BaseProtectRevealClient):
+    """Async bulk endpoints with token = 'T' + value; records every upstream call."""
+
+    def __init__(self, policy: str = "P03", fail: int = 0):
+        super().__init__("crdp", 32082, policy)
+        self.calls = []
+        self.traces = []
+        self.fail = fail
+
+    async def protect_bulk(self, items, trace=None):
+        self.calls.append(("protect", list(items), None))
+        self.traces.append(trace)
+        await asyncio.sleep(0)
+        if self.fail:
+            return APIResponse(self.fail, {"error": "boom"})
+        return APIResponse(200, {"protected_data_array": [{"protected_data": f"T{x}"} for x in items]})
+
+    async def reveal_bulk(self, protected_items, username=None, trace=None):
+        self.calls.append(("reveal", list(protected_items), username))
+        self.traces.append(trace)
+        await asyncio.sleep(0)
+        if any(not t.startswith("T") for t in protected_items):
+            return APIResponse(400, {"error": "invalid token"})
+        return APIResponse(200, {"data_array": [{"data": t[1:]} for t in protected_items]})
+
+
+def test_concurrent_protects_share_one_bulk_call():
+    client = FakeAsyncClient()
+    coalescer = BulkCoalescer(max_batch=100, window_s=0.01)
+
+    async def scenario():
+        return await asyncio.gather(*(coalescer.protect(client, str(i)) for i in range(5)))
+
+    responses = asyncio.run(scenario())
+    assert [client.extract_protected_from_protect_response(r) for r in responses] == [f"T{i}" for i in range(5)]
+    assert client.calls == [("protect", ["0", "1", "2", "3", "4"], None)]
+    assert coalescer.stats()["avg_batch_size"] == 5
+    assert client.traces == [False]
+
+
+def test_batches_split_by_size_and_key():
+    client = FakeAsyncClient()
+    coalescer = BulkCoalescer(max_batch=2, window_s=0.01)
+
+    async def scenario():
+        return await asyncio.gather(
+            coalescer.reveal(client, "T1", username="alice"),
+            coalescer.reveal(client, "T2", username="bob"),
+            coalescer.reveal(client, "T3", username="alice"),
+            coalescer.reveal(client, "T4", username="alice"),
+        )
+
+    responses = asyncio.run(scenario())
+    assert [client.extract_restored_from_reveal_response(r) for r in responses] == ["1", "2", "3", "4"]
+    assert sorted(client.calls) == [
+        ("reveal", ["T1", "T3"], "alice"),
+        ("reveal", ["T2"], "bob"),
+        ("reveal", ["T4"], "alice"),
+    ]
+
+
+def test_unavailable_upstream_reaches_every_caller():
+    client = FakeAsyncClient(fail=503)
+    coalescer = BulkCoalescer(window_s=0.0)
+
+    async def scenario():
+        return await asyncio.gather(coalescer.protect(client, "1"), coalescer.protect(client, "2"))
+
+    responses = asyncio.run(scenario())
+    assert [r.status_code for r in responses] == [503, 503]
+    assert len(client.calls) == 1
+
+
+def test_exception_is_raised_in_callers():
+    client = FakeAsyncClient()
+
+    async def broken(items, trace=None):
+        raise RuntimeError("connection refused")
+
+    client.protect_bulk = broken
+    coalescer = BulkCoalescer(window_s=0.0)
+    with pytest.raises(RuntimeError):
+        asyncio.run(coalescer.protect(client, "1"))
+
+
+def test_bad_value_only_fails_its_own_caller():
+    client = FakeAsyncClient()
+    coalescer = BulkCoalescer(window_s=0.01)
+
+    async def scenario():
+        return await asyncio.gather(*(coalescer.reveal(client, t) for t in ["T1", "T2", "bad", "T4"]))
+
+    responses = asyncio.run(scenario())
+    assert [r.status_code for r in responses] == [200, 200, 400, 200]
+    assert client.extract_restored_from_reveal_response(responses[3]) == "4"
+    assert client.calls[0] == ("reveal", ["T1", "T2", "bad", "T4"], None)
+    assert coalescer.stats()["splits"] == 2
+
+
+def test_cancelled_send_resolves_every_caller():
+    client = FakeAsyncClient()
+    async def hang(items, trace=None):
+        await asyncio.Event().wait()
+
+    client.protect_bulk = hang
+    coalescer = BulkCoalescer(window_s=0.0)
+
+    async def scenario():
+        callers = [asyncio.ensure_future(coalescer.protect(client, str(i))) for i in range(2)]
+        await asyncio.sleep(0.01)
+        for task in list(coalescer._sending):
+            task.cancel()
+        return await asyncio.wait_for(asyncio.gather(*callers, return_exceptions=True), 1)
+
+    errors = asyncio.run(scenario())
+    assert all(isinstance(e, APIError) and "cancelled" in str(e) for e in errors)
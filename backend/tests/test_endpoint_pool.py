@@ -0,0 +1,75 @@
+"""Tests for the multi-node CRDP endpoint pool."""
+import asyncio
+import time
+
+import httpx
+
+from app.services.protect_reveal.async_client import AsyncProtectRevealClient
+from app.services.protect_reveal.endpoints import EndpointPool, parse_endpoints
+from app.services.protect_reveal.resilience import RetryPolicy
+
+
+def test_parse_endpoints_defaults_missing_ports():
+    assert parse_endpoints(["a:1", " b ", "", "c:3"], 32082) == [("a", 1), ("b", 32082), ("c", 3)]
+
+
+def test_ewma_prefers_the_faster_node():
+    pool = EndpointPool([("a", 1), ("b", 1)], strategy="ewma")
+    pool.release(pool.acquire(), 0.200, failed=False)
+    pool.release(pool.acquire(), 0.010, failed=False)
+    assert {ep.host for ep in pool.endpoints if ep.ewma_s is not None} == {"a", "b"}
+
+    picks = []
+    for _ in range(10):
+        endpoint = pool.acquire()
+        picks.append(endpoint.host)
+        pool.release(endpoint, 0.010 if endpoint.host == "b" else 0.200, failed=False)
+    assert picks.count("b") == 10
+
+
+def test_least_outstanding_spreads_concurrent_requests():
+    pool = EndpointPool([("a", 1), ("b", 1), ("c", 1)], strategy="least_outstanding")
+    held = [pool.acquire() for _ in range(6)]
+    assert sorted(ep.host for ep in held) == ["a", "a", "b", "b", "c", "c"]
+
+
+def test_failing_node_is_ejected_then_readmitted():
+    pool = EndpointPool([("a", 1), ("b", 1)], strategy="least_outstanding", eject_after=2, eject_seconds=0.05)
+    bad = pool.endpoints[0]
+    for _ in range(2):
+        bad.outstanding += 1
+        pool.release(bad, 0.001, failed=True)
+
+    assert {pool.acquire().host for _ in range(4)} == {"b"}
+    assert pool.snapshot()[0]["ejected"] and pool.snapshot()[0]["ejections"] == 1
+
+    time.sleep(0.06)
+    pool.endpoints[1].outstanding = 0
+    assert pool.acquire().host == "a"
+
+
+def test_client_rewrites_posts_to_pool_nodes_and_fails_over():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.host)
+        if request.url.host == "down":
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200, json={"protected_data": "T" + request.url.path})
+
+    async def scenario():
+        pool = EndpointPool([("down", 32082), ("up", 32082)], strategy="least_outstanding", eject_after=1)
+        client = AsyncProtectRevealClient(
+            host="crdp", port=32082, policy="P03", pool=pool, retry=RetryPolicy(max_retries=1, base_delay=0.001)
+        )
+        client.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        responses = [await client.protect(str(i)) for i in range(4)]
+        await client.aclose()
+        return responses, pool
+
+    responses, pool = asyncio.run(scenario())
+    assert all(r.is_success for r in responses)
+    assert responses[0].request_url == "http://up:32082/v1/protect"
+    # the dead node got one connection attempt before it was ejected
+    assert seen.count("down") == 1 and seen.count("up") == 4
+    assert [n["ejections"] for n in pool.snapshot()] == [1, 0]
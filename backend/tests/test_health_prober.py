@@ -0,0 +1,67 @@
+"""Tests for the cached CRDP health snapshot and the background prober."""
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.protect_reveal.health import HealthProber
+
+client = TestClient(app)
+
+
+def _result(healthy=True):
+    return {"healthy": healthy, "latency_ms": 1.5, "steps": [{"stage": "healthz", "status_code": 200}]}
+
+
+def test_health_serves_snapshot_until_refresh():
+    live = AsyncMock(side_effect=[_result(True), _result(False)])
+    with patch("app.api.routes.protect_reveal.check_health", live):
+        first = client.get("/api/crdp/health", params={"host": "probe-test", "port": 1}).json()
+        second = client.get("/api/crdp/health", params={"host": "probe-test", "port": 1}).json()
+        refreshed = client.get("/api/crdp/health", params={"host": "probe-test", "port": 1, "refresh": True}).json()
+
+    assert live.await_count == 2
+    assert (first["cached"], second["cached"], refreshed["cached"]) == (False, True, False)
+    assert second["status"] == "healthy" and refreshed["status"] == "unhealthy"
+    assert [h["healthy"] for h in refreshed["history"]] == [True, False]
+
+
+def test_prober_records_each_target_and_keeps_bounded_history():
+    target = object()
+    prober = HealthProber(lambda: [(("h", 1), target)], sample="1", interval=0.01, history=3)
+
+    async def scenario():
+        with patch("app.services.protect_reveal.health.check_health", AsyncMock(return_value=_result())):
+            prober.start()
+            await asyncio.sleep(0.1)
+            await prober.stop()
+
+    asyncio.run(scenario())
+    snap = prober.snapshot(("h", 1))
+    assert snap is not None and snap.result["healthy"]
+    assert len(snap.history) == 3
+
+
+def test_health_reports_each_pool_node(monkeypatch):
+    from app.api.routes import protect_reveal
+    from app.core.config import get_settings
+    from app.services.protect_reveal.endpoints import EndpointPool
+    from app.services.protect_reveal.registry import AsyncClientRegistry
+
+    registry = AsyncClientRegistry(endpoint_pool=EndpointPool([("n1", 1), ("n2", 1)], aliases=[("pool-test", 1)]))
+    monkeypatch.setattr(protect_reveal, "get_client_registry", lambda: registry)
+    monkeypatch.setattr(get_settings(), "CRDP_API_ENDPOINTS", ["n1:1", "n2:1"])
+    probed = []
+
+    async def check(target, sample):
+        probed.append((target.host, target.pool is None))
+        return _result(target.host != "n2")
+
+    with patch("app.api.routes.protect_reveal.check_health", AsyncMock(side_effect=check)):
+        data = client.get("/api/crdp/health", params={"host": "pool-test", "port": 1, "refresh": True}).json()
+
+    assert data["status"] == "degraded"
+    assert [(n["endpoint"], n["status"]) for n in data["nodes"]] == [("n1:1", "healthy"), ("n2:1", "unhealthy")]
+    # node probes use clients pinned to their node, not the load-balanced pool
+    assert sorted(probed) == [("n1", True), ("n2", True), ("pool-test", False)]
@@ -0,0 +1,39 @@
+"""Tests for the log-bucketed latency histogram."""
+import pytest
+
+from app.services.protect_reveal.histogram import LatencyHistogram
+
+
+def test_percentiles_within_precision():
+    hist = LatencyHistogram(precision=0.01)
+    values = [i / 1000.0 for i in range(1, 1001)]  # 1ms .. 1s
+    for v in values:
+        hist.record(v)
+    assert hist.count == 1000
+    assert hist.percentile(50) == pytest.approx(0.5, rel=0.011)
+    assert hist.percentile(99) == pytest.approx(0.99, rel=0.011)
+    assert hist.percentile(100) == hist.max == 1.0
+    assert hist.mean == pytest.approx(sum(values) / len(values))
+
+
+def test_merge_combines_counts_and_extremes():
+    a, b = LatencyHistogram(), LatencyHistogram()
+    for v in (0.001, 0.002):
+        a.record(v)
+    for v in (0.5, 2.0):
+        b.record(v)
+    a.merge(b)
+    assert a.count == 4
+    assert a.min == 0.001 and a.max == 2.0
+    assert a.percentile(50) == pytest.approx(0.002, rel=0.011)
+
+
+def test_merge_rejects_different_layout():
+    with pytest.raises(ValueError):
+        LatencyHistogram(precision=0.01).merge(LatencyHistogram(precision=0.05))
+
+
+def test_empty_histogram():
+    hist = LatencyHistogram()
+    assert hist.percentile(99) == 0.0
+    assert hist.to_dict()["count"] == 0
@@ -0,0 +1,77 @@
+"""Tests for the CLI run history store and run comparison."""
+import random
+
+import pytest
+
+from app.services.protect_reveal.cli import Config, main
+from app.services.protect_reveal.history import RunHistory, compare_runs, two_proportion_z_test, welch_t_test
+from app.services.protect_reveal.summary import RunSummary
+
+
+def _summary(mean_s: float, n: int = 400, errors: int = 0, wall_time_s: float = 10.0, seed: int = 1) -> RunSummary:
+    rng = random.Random(seed)
+    summary = RunSummary()
+    for name in ("iteration", "protect", "reveal"):
+        hist = summary._hist(name)
+        for _ in range(n):
+            hist.record(rng.gauss(mean_s, mean_s / 5))
+    summary.attempted = summary.requests = n
+    summary.successful = summary.matched = n - errors
+    summary.wall_time_s = wall_time_s
+    return summary
+
+
+def test_welch_and_proportion_tests_match_reference_values():
+    # reference values from scipy.stats.ttest_ind_from_stats(..., equal_var=False)
+    t, p = welch_t_test(30, 10.0, 2.0, 30, 11.0, 2.0)
+    assert t == pytest.approx(1.9365, abs=1e-4) and p == pytest.approx(0.05768, abs=1e-4)
+    assert welch_t_test(10, 1.0, 0.5, 15, 1.5, 1.0)[1] == pytest.approx(0.11303, abs=1e-4)
+    assert welch_t_test(1, 1.0, 0.0, 10, 2.0, 1.0) == (0.0, 1.0)
+    z, p = two_proportion_z_test(10, 1000, 30, 1000)
+    assert z > 0 and p < 0.01
+    assert two_proportion_z_test(0, 100, 0, 100)[1] == 1.0
+
+
+def test_runs_are_saved_and_looked_up_by_id_label_and_latest(tmp_path):
+    db = str(tmp_path / "runs.db")
+    with RunHistory(db) as history:
+        first = history.save(Config(host="crdp", iterations=400), _summary(0.010), label="baseline")
+        second = history.save(Config(host="crdp", iterations=400, bulk=True, batch_size=50), _summary(0.012))
+    # reopening the same file sees both runs
+    with RunHistory(db) as history:
+        assert history.get("baseline").id == first
+        latest = history.get("latest")
+        assert latest.id == second
+        assert latest.config["batch_size"] == 50 and set(latest.latency) == {"iteration", "protect", "reveal"}
+        assert latest.latency["protect"].count == 400
+        assert [row["id"] for row in history.list()] == [second, first]
+        assert history.list(host="other") == []
+        with pytest.raises(KeyError):
+            history.get("missing")
+
+
+def test_compare_flags_significant_latency_throughput_and_error_regressions():
+    with RunHistory(":memory:") as history:
+        base = history.get(str(history.save(Config(), _summary(0.010, seed=1))))
+        same = history.get(str(history.save(Config(), _summary(0.010, seed=2))))
+        slower = history.get(str(history.save(Config(), _summary(0.013, errors=20, wall_time_s=13.0, seed=3))))
+
+    assert not [f for f in compare_runs(base, same) if f.regression]
+    flagged = {f.metric for f in compare_runs(base, slower) if f.regression}
+    assert flagged == {"iteration.mean_s", "protect.mean_s", "reveal.mean_s", "throughput_per_s", "error_rate"}
+    # improvements are never regressions
+    assert not [f for f in compare_runs(slower, base) if f.regression]
+
+
+def test_compare_subcommand_exit_status(tmp_path, capsys):
+    db = str(tmp_path / "runs.db")
+    with RunHistory(db) as history:
+        history.save(Config(), _summary(0.010), label="baseline")
+        history.save(Config(concurrency=4), _summary(0.020, seed=2))
+
+    assert main(["compare", "baseline", "--history-db", db]) == 1
+    out = capsys.readouterr().out
+    assert "REGRESSION" in out and "concurrency: 1 -> 4" in out
+    assert main(["compare", "baseline", "baseline", "--history-db", db]) == 0
+    assert main(["history", "--history-db", db]) == 0
+    assert "baseline" in capsys.readouterr().out
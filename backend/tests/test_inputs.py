@@ -0,0 +1,57 @@
+"""Tests for the lazy runner input sources."""
+import pytest
+
+from app.services.protect_reveal.inputs import (
+    batched,
+    count_file_values,
+    numeric_sequence,
+    file_values,
+    read_csv_column,
+    read_lines,
+    value_positions,
+)
+
+
+def test_numeric_sequence_preserves_padding_and_stops_on_text():
+    assert list(numeric_sequence("0098", 4)) == ["0098", "0099", "0100", "0101"]
+    assert list(numeric_sequence("abc", 5)) == ["abc"]
+
+
+def test_read_lines_skips_blanks_and_handles_empty_file(tmp_path):
+    path = tmp_path / "values.txt"
+    path.write_text("111\r\n\n222\n333")
+    assert list(read_lines(str(path))) == ["111", "222", "333"]
+    empty = tmp_path / "empty.txt"
+    empty.write_text("")
+    assert list(read_lines(str(empty))) == []
+
+
+def test_read_csv_column_by_name_or_index(tmp_path):
+    path = tmp_path / "people.csv"
+    path.write_text('name,ssn\nkim,"900101-1234567"\nlee,\npark,850505-2345678\n')
+    assert list(read_csv_column(str(path), "ssn")) == ["900101-1234567", "850505-2345678"]
+    assert list(read_csv_column(str(path), "0")) == ["kim", "lee", "park"]
+    assert count_file_values(str(path), "csv", "ssn") == 2
+    with pytest.raises(ValueError):
+        list(read_csv_column(str(path), "phone"))
+
+
+@pytest.mark.parametrize(
+    "fmt, column, text",
+    [
+        ("lines", 0, "".join(f"V{i}\r\n" + ("\n" if i % 3 == 0 else "") for i in range(10))),
+        ("csv", "ssn", "id,ssn\n" + "".join(f'{i},"V{i}' + ('\nx"' if i % 4 == 0 else '"') + "\n" for i in range(10))),
+    ],
+)
+def test_value_positions_let_readers_start_mid_file(tmp_path, fmt, column, text):
+    path = tmp_path / "values"
+    path.write_bytes(text.encode("utf-8"))
+    values = list(file_values(str(path), fmt, column))
+    positions = value_positions(str(path), fmt, column, [0, 4, 7, 10])
+    for index, position in zip([0, 4, 7], positions):
+        assert list(file_values(str(path), fmt, column, position)) == values[index:]
+    assert list(file_values(str(path), fmt, column, positions[-1])) == []
+
+
+def test_batched_accepts_any_iterable():
+    assert list(batched(iter(range(5)), 2)) == [[0, 1], [2, 3], [4]]
@@ -0,0 +1,181 @@
+"""Tests for background load-test jobs and their API routes."""
+import json
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import get_settings
+from app.main import app
+from app.services.protect_reveal import jobs
+from app.services.protect_reveal.cli import Config
+from app.services.protect_reveal.client import APIResponse, BaseProtectRevealClient
+from app.services.protect_reveal.jobs import JobLimitError, JobManager
+
+client = TestClient(app)
+
+
+class FakeClient(BaseProtectRevealClient):
+    """In-memory client: token = 'T' + value; each call waits until ``gate`` is set, then ``delay``."""
+
+    def __init__(self, delay: float = 0.0):
+        super().__init__("fake", 0, "P03")
+        self.delay = delay
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def _call(self, body):
+        self.gate.wait(5)
+        time.sleep(self.delay)
+        return APIResponse(200, body)
+
+    def post_json(self, url, payload, trace=None):
+        if url == self.protect_url:
+            return self._call({"protected_data": f"T{payload['data']}"})
+        return self._call({"data": payload["protected_data"][1:]})
+
+    def protect_bulk(self, items):
+        return self._call({"protected_data_array": [{"protected_data": f"T{x}"} for x in items]})
+
+    def reveal_bulk(self, protected_items, username=None):
+        return self._call({"data_array": [{"data": t[1:]} for t in protected_items]})
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    fake = FakeClient()
+    monkeypatch.setattr(jobs, "make_client", lambda config: fake)
+    return fake
+
+
+def _wait(job, timeout=5.0):
+    job.join(timeout)
+    assert job.done
+
+
+def test_job_runs_in_background_and_reports_progress(fake_client):
+    manager = JobManager()
+    job = manager.start(Config(start_data="1000", iterations=40, bulk=True, batch_size=10, concurrency=2))
+    _wait(job)
+    snap = job.snapshot()
+    assert snap["state"] == "completed" and snap["progress"] == 1.0
+    assert snap["iterations_attempted"] == snap["matched"] == 40 and snap["errors"] == 0
+    assert snap["latency"]["batch"]["count"] == 4
+    assert snap["params"]["batch_size"] == 10
+    assert manager.list() == [job]
+
+
+def test_cancel_stops_lanes_and_running_limit_applies(fake_client):
+    fake_client.delay = 0.01
+    manager = JobManager(max_running=1)
+    job = manager.start(Config(start_data="1000", iterations=10000, concurrency=4))
+    with pytest.raises(JobLimitError):
+        manager.start(Config(iterations=1))
+    time.sleep(0.05)
+    job.cancel()
+    _wait(job)
+    assert job.state == "cancelled"
+    assert 0 < job.summary.attempted < 10000
+    # a finished job frees its slot
+    _wait(manager.start(Config(start_data="1", iterations=1)))
+
+
+def test_concurrent_snapshots_keep_rate_samples_ordered(fake_client):
+    fake_client.delay = 0.001
+    job = JobManager().start(Config(start_data="1000", iterations=300, concurrency=2))
+    errors = []
+
+    def poll():
+        try:
+            while not job.done:
+                assert job.snapshot()["current_throughput_per_s"] >= 0
+        except Exception as e:
+            errors.append(e)
+
+    pollers = [threading.Thread(target=poll) for _ in range(4)]
+    for t in pollers:
+        t.start()
+    _wait(job)
+    for t in pollers:
+        t.join(5)
+    times = [t for t, _ in job._rate_samples]
+    assert not errors and times == sorted(times)
+
+
+def test_job_fails_cleanly_when_the_client_cannot_be_built(monkeypatch):
+    def broken(config):
+        raise ValueError("bad endpoint")
+
+    monkeypatch.setattr(jobs, "make_client", broken)
+    manager = JobManager(max_running=1)
+    job = manager.start(Config(iterations=1))
+    _wait(job)
+    assert job.state == "failed" and job.error == "bad endpoint"
+    # the failed job does not hold the running slot
+    assert manager.start(Config(iterations=1)) is not None
+
+
+def test_finished_jobs_are_pruned(fake_client):
+    manager = JobManager(keep_finished=2)
+    started = []
+    for _ in range(4):
+        job = manager.start(Config(start_data="1", iterations=1))
+        _wait(job)
+        started.append(job)
+    manager.start(Config(start_data="1", iterations=1)).join(5)
+    assert started[0] not in manager.list() and started[1] not in manager.list()
+
+
+@pytest.fixture
+def jobs_enabled(monkeypatch):
+    from app.api.routes import protect_reveal
+
+    manager = JobManager()
+    monkeypatch.setattr(protect_reveal, "get_job_manager", lambda: manager)
+    monkeypatch.setattr(get_settings(), "CRDP_JOBS_ENABLED", True)
+    return manager
+
+
+def test_job_routes_are_disabled_by_default():
+    assert client.post("/api/crdp/jobs", json={"iterations": 1}).status_code == 403
+
+
+def test_jobs_only_target_configured_crdp_nodes(fake_client, jobs_enabled, monkeypatch):
+    settings = get_settings()
+    resp = client.post("/api/crdp/jobs", json={"iterations": 1, "host": "10.0.0.99", "port": 22})
+    assert resp.status_code == 403 and "not a configured CRDP endpoint" in resp.json()["detail"]
+
+    monkeypatch.setattr(settings, "CRDP_API_ENDPOINTS", ["10.0.0.7:32082"])
+    resp = client.post("/api/crdp/jobs", json={"iterations": 1, "host": "10.0.0.7", "port": 32082})
+    assert resp.status_code == 202
+    jobs_enabled.get(resp.json()["id"]).join(5)
+
+
+def test_job_routes_start_inspect_and_stream(fake_client, jobs_enabled):
+    manager = jobs_enabled
+    fake_client.gate.clear()
+
+    resp = client.post("/api/crdp/jobs", json={"iterations": 20, "concurrency": 2, "start_data": "5000"})
+    assert resp.status_code == 202
+    job_id = resp.json()["id"]
+    running = client.get(f"/api/crdp/jobs/{job_id}").json()
+    assert running["state"] == "running" and running["params"]["concurrency"] == 2
+
+    fake_client.gate.set()
+    manager.get(job_id).join(5)
+    with client.stream("GET", f"/api/crdp/jobs/{job_id}/events") as stream:
+        assert stream.headers["content-type"].startswith("text/event-stream")
+        body = "".join(stream.iter_text())
+    event, data = body.strip().split("\n")
+    assert event == "event: done"
+    assert json.loads(data[len("data: "):])["matched"] == 20
+
+    assert [j["id"] for j in client.get("/api/crdp/jobs").json()["jobs"]] == [job_id]
+    assert client.post(f"/api/crdp/jobs/{job_id}/cancel").json()["state"] == "completed"
+    assert client.get("/api/crdp/jobs/missing").status_code == 404
+    assert client.post("/api/crdp/jobs", json={"concurrency": 100000}).status_code == 422
+    assert client.post("/api/crdp/jobs", json={"start_data": "abc"}).status_code == 422
@@ -0,0 +1,63 @@
+"""Tests for the fast JSON codec and pre-encoded bulk payloads."""
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.services.protect_reveal import jsoncodec
+from app.services.protect_reveal.async_client import AsyncProtectRevealClient
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [],
+        ["T1"],
+        ["T1", "T2", "T3"],
+        ['a","b', "c"],
+        ["back\\slash", "x"],
+        ["줄\n바꿈", "유니코드"],
+        [{"protected_data": "T1", "external_version": "2"}, "T2"],
+    ],
+)
+def test_object_array_matches_per_item_dicts(values):
+    expected = [v if isinstance(v, dict) else {"protected_data": v} for v in values]
+    assert json.loads(jsoncodec.encode_object_array("protected_data", values)) == expected
+
+
+def test_stdlib_fallback_produces_the_same_bytes(monkeypatch):
+    doc = {"protection_policy_name": "P03", "data_array": ["1", "둘"], "n": 3}
+    fast = jsoncodec.dumps(doc)
+    monkeypatch.setattr(jsoncodec, "orjson", None)
+    assert jsoncodec.dumps(doc) == fast
+    assert jsoncodec.loads(fast) == doc
+    assert json.loads(jsoncodec.encode_object_array("protected_data", ["a", "b"])) == [
+        {"protected_data": "a"},
+        {"protected_data": "b"},
+    ]
+
+
+def test_lean_reveal_bulk_sends_pre_encoded_body():
+    sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(json.loads(request.content))
+        return httpx.Response(200, content=b'{"data_array":[{"data":"1"},{"data":"2"}]}')
+
+    async def scenario():
+        client = AsyncProtectRevealClient(host="crdp", port=32082, policy="P03", trace=False)
+        client.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        payload = client.reveal_bulk_payload(["T1", "T2"], "alice", trace=None)
+        response = await client.reveal_bulk(["T1", "T2"], username="alice")
+        await client.aclose()
+        return payload, response
+
+    payload, response = asyncio.run(scenario())
+    assert isinstance(payload, jsoncodec.EncodedJSON) and payload.items == 2
+    assert sent == [{
+        "protection_policy_name": "P03",
+        "protected_data_array": [{"protected_data": "T1"}, {"protected_data": "T2"}],
+        "username": "alice",
+    }]
+    assert response.body == {"data_array": [{"data": "1"}, {"data": "2"}]}
@@ -0,0 +1,67 @@
+"""Tests for queue-based logging and the per-logger rate limit."""
+import logging
+import queue
+
+from app.core.logging import RateLimitFilter, _DeferredQueueHandler
+
+
+def _record(name="app.api.routes.protect_reveal", level=logging.INFO, msg="Protect request received for data length: %d"):
+    return logging.LogRecord(name, level, __file__, 1, msg, (13,), None)
+
+
+def test_rate_limit_drops_info_over_burst_but_keeps_warnings():
+    limit = RateLimitFilter(rate=0.001, burst=3)
+    assert [limit.filter(_record()) for _ in range(5)] == [True, True, True, False, False]
+    assert limit.filter(_record(level=logging.WARNING))
+    # buckets are per logger
+    assert limit.filter(_record(name="app.main"))
+
+
+def test_trace_records_survive_a_burst():
+    limit = RateLimitFilter(rate=0.001, burst=2)
+    assert all(limit.filter(_record(name="app.trace", msg='{"path": "/api/crdp/protect", "n": %d}')) for _ in range(100))
+    # ordinary loggers are still throttled
+    assert [limit.filter(_record()) for _ in range(3)] == [True, True, False]
+
+
+def test_next_record_after_suppression_reports_the_count():
+    limit = RateLimitFilter(rate=1000.0, burst=1)
+    assert limit.filter(_record())
+    assert not limit.filter(_record())
+    limit._buckets["app.api.routes.protect_reveal"][0] = 1.0
+    record = _record()
+    assert limit.filter(record)
+    assert record.getMessage() == "Protect request received for data length: 13 [1 similar records suppressed]"
+
+
+def test_queue_handler_defers_formatting_to_the_listener():
+    q = queue.SimpleQueue()
+    handler = _DeferredQueueHandler(q)
+    record = _record()
+    handler.handle(record)
+    queued = q.get_nowait()
+    assert queued is record
+    assert queued.msg == "Protect request received for data length: %d" and queued.args == (13,)
+
+
+def test_setup_logging_twice_replaces_the_listener(monkeypatch):
+    import atexit
+    import threading
+
+    from app.core import logging as app_logging
+
+    registered = []
+    monkeypatch.setattr(atexit, "register", registered.append)
+    monkeypatch.setattr(app_logging, "_atexit_registered", False)
+
+    def listener_threads():
+        return [t for t in threading.enumerate() if "_monitor" in t.name]
+
+    app_logging.setup_logging()
+    first = app_logging._listener
+    before = len(listener_threads())
+    app_logging.setup_logging()
+
+    assert app_logging._listener is not first and first._thread is None
+    assert len(listener_threads()) == before
+    assert registered == [app_logging.shutdown_logging]
@@ -0,0 +1,88 @@
+"""Tests for the Prometheus metrics registry and /metrics endpoint."""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app.core.metrics import MetricsRegistry, UpstreamMetrics, BULK_BATCH_SIZE, UPSTREAM_IN_FLIGHT, UPSTREAM_LATENCY
+from app.main import app
+from app.services.protect_reveal.async_client import AsyncProtectRevealClient
+from app.services.protect_reveal.resilience import CircuitOpenError
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    hist = registry.histogram("demo_seconds", "Demo.", ("op",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        hist.labels("protect").observe(value)
+    registry.counter("demo_total", "Demo.").labels().inc(2)
+
+    text = registry.render()
+    assert 'demo_seconds_bucket{op="protect",le="0.1"} 2' in text
+    assert 'demo_seconds_bucket{op="protect",le="1"} 3' in text
+    assert 'demo_seconds_bucket{op="protect",le="+Inf"} 4' in text
+    assert 'demo_seconds_count{op="protect"} 4' in text
+    assert "# TYPE demo_seconds histogram" in text
+    assert "demo_total 2" in text
+
+
+def test_client_records_upstream_latency_in_flight_and_batch_size():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"protected_data_array": [{"protected_data": "T1"}, {"protected_data": "T2"}]})
+
+    before = UPSTREAM_LATENCY.labels("protectbulk", "2xx").count
+    batches = BULK_BATCH_SIZE.labels("protectbulk").count
+
+    async def scenario():
+        client = AsyncProtectRevealClient(host="crdp", port=32082, policy="P03", metrics=UpstreamMetrics())
+        client.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        await client.protect_bulk(["1", "2"])
+        await client.aclose()
+
+    asyncio.run(scenario())
+    assert UPSTREAM_LATENCY.labels("protectbulk", "2xx").count == before + 1
+    assert BULK_BATCH_SIZE.labels("protectbulk").count == batches + 1
+    assert UPSTREAM_IN_FLIGHT.labels("protectbulk").value == 0
+
+
+def test_metrics_endpoint_counts_crdp_errors():
+    with patch("app.api.routes.protect_reveal.get_client") as get_client:
+        upstream = MagicMock()
+        upstream.post_json = AsyncMock(side_effect=CircuitOpenError("http://crdp:32082", 5.0))
+        get_client.return_value = upstream
+        client = TestClient(app)
+        assert client.post("/api/crdp/protect", json={"data": "1"}).status_code == 503
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'crdp_errors_total{type="CRDPConnectionError"}' in response.text
+    assert "# TYPE crdp_upstream_request_duration_seconds histogram" in response.text
+
+
+def test_bulk_chunk_failures_are_counted_as_crdp_errors():
+    from app.core.metrics import CRDP_ERRORS
+    from app.services.protect_reveal.client import APIResponse
+
+    async def protect_bulk(items, trace=None):
+        if "bad" in items:
+            return APIResponse(500, {"error": "down"})
+        return APIResponse(200, {"protected_data_array": [{"protected_data": f"T{x}"} for x in items]})
+
+    before = CRDP_ERRORS.labels("BulkChunkError").value
+    with patch("app.api.routes.protect_reveal.get_client") as get_client, patch(
+        "app.api.routes.protect_reveal.get_settings"
+    ) as settings:
+        settings.return_value.CRDP_BULK_CHUNK_SIZE = 2
+        settings.return_value.CRDP_BULK_CONCURRENCY = 2
+        upstream = MagicMock()
+        upstream.protect_bulk = AsyncMock(side_effect=protect_bulk)
+        upstream.extract_protected_list_from_protect_response.side_effect = (
+            lambda r: [d["protected_data"] for d in r.body["protected_data_array"]]
+        )
+        get_client.return_value = upstream
+        response = TestClient(app).post("/api/crdp/protect-bulk", json={"data_array": ["1", "2", "bad", "3"]})
+
+    assert response.json()["status_code"] == 207
+    assert CRDP_ERRORS.labels("BulkChunkError").value == before + 1
@@ -0,0 +1,94 @@
+"""Tests for the HMAC-keyed protect result cache."""
+import asyncio
+
+import httpx
+
+from app.services.protect_reveal.async_client import AsyncProtectRevealClient
+from app.services.protect_reveal.cache import ProtectCache, ProtectCacheSet
+from app.services.protect_reveal.client import APIResponse, BaseProtectRevealClient
+
+
+class CountingClient(BaseProtectRevealClient):
+    """Sync client whose post_json tokenizes in memory and records the values sent."""
+
+    def __init__(self, cache):
+        super().__init__("crdp", 32082, "P03", protect_cache=cache)
+        self.sent = []
+
+    def post_json(self, url, payload, trace=None):
+        if url == self.protect_url:
+            self.sent.append([payload["data"]])
+            return APIResponse(200, {"protected_data": f"T{payload['data']}"})
+        self.sent.append(list(payload["data_array"]))
+        return APIResponse(200, {"protected_data_array": [{"protected_data": f"T{x}"} for x in payload["data_array"]]})
+
+
+def test_single_protect_is_served_from_cache():
+    cache = ProtectCache(b"k" * 32)
+    client = CountingClient(cache)
+    assert client.extract_protected_from_protect_response(client.protect("123")) == "T123"
+    assert client.extract_protected_from_protect_response(client.protect("123")) == "T123"
+    assert client.sent == [["123"]]
+    assert cache.stats()["hits"] == 1 and cache.stats()["upstream_calls_saved"] == 1
+
+
+def test_bulk_sends_only_distinct_misses():
+    cache = ProtectCache(b"k" * 32)
+    client = CountingClient(cache)
+    client.protect_bulk(["1", "2"])
+    resp = client.protect_bulk(["2", "3", "1", "3"])
+    assert client.extract_protected_list_from_protect_response(resp) == ["T2", "T3", "T1", "T3"]
+    assert client.sent == [["1", "2"], ["3"]]
+    client.protect_bulk(["3", "1"])
+    assert len(client.sent) == 2
+    assert cache.stats()["upstream_calls_saved"] == 1
+
+
+def test_keys_are_keyed_hashes_and_entries_expire():
+    cache = ProtectCache(b"secret", max_entries=2, ttl=0.0)
+    cache.put("900101-1234567", "TOKEN")
+    assert all(b"900101" not in key for key in cache._entries)
+    assert cache.get("900101-1234567") is None
+    caches = ProtectCacheSet(max_entries=2)
+    caches.get("h", 1, "P03").put_many(["a", "b", "c"], ["Ta", "Tb", "Tc"])
+    assert len(caches.get("h", 1, "P03")) == 2
+    assert caches.get("h", 1, "P04").get("c") is None
+
+
+def test_async_client_failed_bulk_is_not_cached():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(500, json={"error": "down"})
+        return httpx.Response(200, json={"protected_data_array": [{"protected_data": "T1"}]})
+
+    async def scenario():
+        client = AsyncProtectRevealClient("crdp", 32082, "P03", protect_cache=ProtectCache(b"k"))
+        client.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        first = await client.protect_bulk(["1"])
+        second = await client.protect_bulk(["1"])
+        third = await client.protect_bulk(["1"])
+        await client.aclose()
+        return first, second, third
+
+    first, second, third = asyncio.run(scenario())
+    assert first.status_code == 500
+    assert second.is_success and third.is_success
+    assert len(calls) == 2
+
+
+def test_short_bulk_reply_is_an_error_and_cache_hits_follow_trace():
+    cache = ProtectCache(b"k" * 32)
+    client = CountingClient(cache)
+    client.protect_bulk(["1"])
+    client.post_json = lambda url, payload, trace=None: APIResponse(200, {"protected_data_array": []})
+    resp = client.protect_bulk(["1", "2"])
+    assert resp.status_code == 502 and "0 values for 1 items" in resp.body
+    assert cache.get("2") is None
+
+    client.trace = False
+    assert client.protect("1").request_url is None
+    assert client.protect("1", trace=True).request_url == client.protect_url
+    assert client.protect_bulk(["1"], trace=True).request_url == client.protect_bulk_url
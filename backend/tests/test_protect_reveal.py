@@ -1,17 +1,24 @@
 """Tests for protect_reveal API routes."""
+import asyncio
+import json
+
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 
 client = TestClient(app)
 
 
 @pytest.fixture
 def mock_client():
-    """Mock ProtectRevealClient."""
+    """Mock AsyncProtectRevealClient."""
     with patch('app.api.routes.protect_reveal.get_client') as mock:
         mock_instance = MagicMock()
+        # upstream calls are coroutines on the async client
+        mock_instance.post_json = AsyncMock()
+        mock_instance.protect_bulk = AsyncMock()
+        mock_instance.reveal_bulk = AsyncMock()
         mock.return_value = mock_instance
         yield mock_instance
 
@@ -147,6 +154,125 @@ def test_reveal_bulk_success(mock_client):
     assert data["data_array"] == ["001", "002", "003"]
 
 
+def test_protect_bulk_fans_out_chunks_in_order(mock_client):
+    """Large arrays are split into chunks and the results are merged in input order."""
+    calls = []
+    _fake_bulk_tokenizer(mock_client, calls)
+
+    with patch('app.api.routes.protect_reveal.get_settings') as mock_settings:
+        mock_settings.return_value.CRDP_BULK_CHUNK_SIZE = 2
+        mock_settings.return_value.CRDP_BULK_CONCURRENCY = 2
+        response = client.post(
+            "/api/crdp/protect-bulk",
+            json={"data_array": ["1", "2", "3", "4", "5"]},
+            headers={"X-CRDP-Debug": "1"},
+        )
+
+    data = response.json()
+    assert data["status_code"] == 200
+    assert data["protected_data_array"] == ["T1", "T2", "T3", "T4", "T5"]
+    assert data["errors"] is None
+    assert sorted(calls) == [["1", "2"], ["3", "4"], ["5"]]
+    assert [c["request"]["data_array"] for c in data["debug"]["chunks"]] == [["1", "2"], ["3", "4"], ["5"]]
+
+
+def test_debug_echo_is_opt_in(mock_client):
+    """The debug echo is omitted (and the client runs lean) unless asked for."""
+    calls = []
+    _fake_bulk_tokenizer(mock_client, calls)
+
+    plain = client.post("/api/crdp/reveal-bulk", json={"protected_data_array": ["T1", "T2"]}).json()
+    assert plain["data_array"] == ["1", "2"]
+    assert plain["debug"] is None
+    assert mock_client.reveal_bulk.call_args.kwargs["trace"] is False
+
+    echoed = client.post("/api/crdp/reveal-bulk?debug=true", json={"protected_data_array": ["T1", "T2"]}).json()
+    assert echoed["debug"]["request"]["protected_data_array"] == ["T1", "T2"]
+    assert mock_client.reveal_bulk.call_args.kwargs["trace"] is True
+
+
+def test_debug_calls_bypass_the_coalescer(mock_client):
+    """A debug request gets its own traced upstream call instead of joining a coalesced batch."""
+    from app.services.protect_reveal.client import APIResponse
+
+    coalescer = MagicMock()
+    coalescer.reveal = AsyncMock(return_value=APIResponse(200, {"data": "1"}))
+    mock_client.post_json.return_value = APIResponse(200, {"data": "1"}, request_url="http://crdp/v1/reveal")
+    mock_client.extract_restored_from_reveal_response.return_value = "1"
+
+    with patch('app.api.routes.protect_reveal.get_coalescer', return_value=coalescer):
+        client.post("/api/crdp/reveal", json={"protected_data": "T1"})
+        echoed = client.post("/api/crdp/reveal?debug=true", json={"protected_data": "T1"}).json()
+
+    assert coalescer.reveal.await_count == 1
+    assert mock_client.post_json.call_args.kwargs["trace"] is True
+    assert echoed["debug"]["url"] == "http://crdp/v1/reveal"
+
+
+def test_reveal_bulk_reports_failed_chunk(mock_client):
+    """A failing chunk is reported per chunk while the other chunks still return values."""
+    from app.services.protect_reveal.client import APIResponse
+
+    calls = []
+    _fake_bulk_tokenizer(mock_client, calls)
+    reveal = mock_client.reveal_bulk.side_effect
+
+    async def flaky_reveal(values, username=None, trace=None):
+        if "TBAD" in values:
+            return APIResponse(400, {"error": "invalid token"})
+        return await reveal(values, username=username)
+
+    mock_client.reveal_bulk.side_effect = flaky_reveal
+
+    with patch('app.api.routes.protect_reveal.get_settings') as mock_settings:
+        mock_settings.return_value.CRDP_BULK_CHUNK_SIZE = 2
+        mock_settings.return_value.CRDP_BULK_CONCURRENCY = 4
+        response = client.post(
+            "/api/crdp/reveal-bulk",
+            json={"protected_data_array": ["T1", "T2", "TBAD", "T4", "T5"]},
+        )
+
+    data = response.json()
+    assert data["status_code"] == 207
+    assert data["data_array"] == ["1", "2", None, None, "5"]
+    assert data["errors"] == [
+        {"chunk": 1, "offset": 2, "count": 2, "status_code": 400, "error": "{'error': 'invalid token'}"}
+    ]
+
+
+def test_fan_out_reports_unexpected_chunk_errors_after_siblings_finish():
+    """A chunk raising a non-API error is reported as that chunk's failure once the others are done."""
+    from app.services.protect_reveal.bulk import fan_out_bulk
+    from app.services.protect_reveal.client import APIResponse
+
+    finished = []
+
+    async def call(items):
+        if items == ["2"]:
+            raise RuntimeError("boom")
+        await asyncio.sleep(0.01)
+        finished.append(items)
+        return APIResponse(200, items)
+
+    outcomes = asyncio.run(fan_out_bulk(["1", "2", "3"], call, lambda r: r.body, chunk_size=1, concurrency=3))
+    assert [o.ok for o in outcomes] == [True, False, True]
+    assert outcomes[1].error == "Unexpected error: boom" and outcomes[1].exception is None
+    assert finished == [["1"], ["3"]]
+
+
+def test_protect_fails_fast_when_circuit_open(mock_client):
+    """An open circuit breaker maps to 503 without waiting for CRDP."""
+    from app.services.protect_reveal.resilience import CircuitOpenError
+
+    mock_client.policy = "P03"
+    mock_client.post_json.side_effect = CircuitOpenError("http://crdp:32082", 12.0)
+
+    response = client.post("/api/crdp/protect", json={"data": "1234567890123"})
+
+    assert response.status_code == 503
+    assert "circuit open" in response.json()["detail"]
+
+
 def test_protect_with_custom_policy(mock_client):
     """Test protect with custom policy override."""
     mock_response = MagicMock()
@@ -170,3 +296,100 @@ def test_protect_with_custom_policy(mock_client):
         # Verify get_client was called with custom policy
         mock_get.assert_called_once_with("CUSTOM_POLICY")
         assert response.status_code == 200
+
+
+def _fake_bulk_tokenizer(mock_client, calls):
+    """Make protect_bulk/reveal_bulk reversible: token = 'T' + value."""
+    from app.services.protect_reveal.client import APIResponse
+
+    async def protect_bulk(values, trace=None):
+        calls.append(list(values))
+        return APIResponse(200, {"protected_data_array": [{"protected_data": f"T{v}"} for v in values]})
+
+    async def reveal_bulk(values, username=None, trace=None):
+        calls.append(list(values))
+        return APIResponse(200, {"data_array": [{"data": v[1:]} for v in values]})
+
+    mock_client.protect_bulk.side_effect = protect_bulk
+    mock_client.reveal_bulk.side_effect = reveal_bulk
+    mock_client.extract_protected_list_from_protect_response.side_effect = (
+        lambda r: [d["protected_data"] for d in r.body["protected_data_array"]]
+    )
+    mock_client.extract_restored_list_from_reveal_response.side_effect = (
+        lambda r: [d["data"] for d in r.body["data_array"]]
+    )
+
+
+def test_transform_file_csv_streams_in_chunks(mock_client):
+    """CSV columns are protected in CRDP-sized chunks and rows keep their order."""
+    calls = []
+    _fake_bulk_tokenizer(mock_client, calls)
+    rows = "".join(f'{i},"note\nline {i}",{1000 + i}\r\n' for i in range(7))
+    body = "id,note,ssn\r\n" + rows + "7,,\r\n"
+
+    with patch('app.api.routes.protect_reveal.get_settings') as mock_settings:
+        mock_settings.return_value.CRDP_FILE_CHUNK_SIZE = 3
+        mock_settings.return_value.CRDP_FILE_CONCURRENCY = 2
+        response = client.post(
+            "/api/crdp/transform-file?columns=ssn&filename=people.csv",
+            content=body.encode("utf-8"),
+            headers={"Content-Type": "text/csv"},
+        )
+
+    assert response.status_code == 200
+    assert 'filename="people.protected.csv"' in response.headers["content-disposition"]
+    lines = response.text.split("\r\n")
+    assert lines[0] == "id,note,ssn"
+    assert lines[1] == '0,"note\nline 0",T1000'
+    assert lines[7] == '6,"note\nline 6",T1006'
+    assert lines[-2] == "7,,"
+    assert calls == [["1000", "1001", "1002"], ["1003", "1004", "1005"], ["1006"]]
+
+
+def test_transform_file_ndjson_reveal(mock_client):
+    """NDJSON fields are revealed; other fields pass through untouched."""
+    calls = []
+    _fake_bulk_tokenizer(mock_client, calls)
+    body = '{"id": 1, "ssn": "T900"}\n{"id": 2}\n{"id": 3, "ssn": "T901"}\n'
+
+    response = client.post(
+        "/api/crdp/transform-file?columns=ssn&operation=reveal&format=ndjson&username=alice",
+        content=body.encode("utf-8"),
+    )
+
+    assert response.status_code == 200
+    assert [json.loads(line) for line in response.text.splitlines()] == [
+        {"id": 1, "ssn": "900"},
+        {"id": 2},
+        {"id": 3, "ssn": "901"},
+    ]
+    assert calls == [["T900", "T901"]]
+
+
+def test_transform_file_flushes_windows_of_rows_without_values():
+    """Rows with nothing to transform are still emitted in bounded windows."""
+    from app.services.protect_reveal.filestream import WINDOW_RECORDS_PER_VALUE, open_file_transform
+
+    async def upload():
+        for i in range(50):
+            yield b'{"id": %d}\n' % i
+
+    async def scenario():
+        stream = await open_file_transform(MagicMock(), upload(), "ndjson", ["ssn"], chunk_size=2)
+        return [part async for part in stream]
+
+    parts = asyncio.run(scenario())
+    assert all(part.count(b"\n") <= 2 * WINDOW_RECORDS_PER_VALUE for part in parts)
+    assert b"".join(parts).count(b"\n") == 50
+
+
+def test_transform_file_rejects_unknown_column(mock_client):
+    """A column missing from the CSV header is rejected before streaming starts."""
+    response = client.post(
+        "/api/crdp/transform-file?columns=phone",
+        content=b"id,ssn\n1,1000\n",
+        headers={"Content-Type": "text/csv"},
+    )
+
+    assert response.status_code == 422
+    assert "phone" in response.json()["detail"]
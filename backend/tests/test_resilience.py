@@ -0,0 +1,141 @@
+"""Tests for the circuit breaker and retry policy of the CRDP clients."""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.services.protect_reveal.async_client import AsyncProtectRevealClient
+from app.services.protect_reveal.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+
+def _client(handler, **kwargs) -> AsyncProtectRevealClient:
+    client = AsyncProtectRevealClient(host="crdp", port=32082, policy="P03", **kwargs)
+    client.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_breaker_opens_then_recovers_through_half_open_trial():
+    breaker = CircuitBreaker("http://crdp:32082", failure_threshold=2, reset_timeout=0.05)
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    time.sleep(0.06)
+    breaker.before_call()  # the single half-open trial
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.snapshot()["times_opened"] == 1 and breaker.snapshot()["rejected"] == 2
+
+
+def test_cancelled_half_open_trial_is_released():
+    breaker = CircuitBreaker("http://crdp:32082", failure_threshold=1, reset_timeout=0.05)
+    breaker.before_call()
+    breaker.record_failure()
+    hang = {"on": True}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if hang["on"]:
+            await asyncio.sleep(10)
+        return httpx.Response(200, json={"protected_data_array": [{"protected_data": "T1"}]})
+
+    async def scenario():
+        client = _client(handler, breaker=breaker)
+        await asyncio.sleep(0.06)
+        trial = asyncio.create_task(client.protect_bulk(["1"]))
+        await asyncio.sleep(0.01)
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+        hang["on"] = False
+        # the next call is admitted as the new trial instead of failing fast forever
+        response = await client.protect_bulk(["1"])
+        await client.aclose()
+        return response
+
+    assert asyncio.run(scenario()).status_code == 200
+    assert breaker.state == "closed"
+
+
+def test_stale_half_open_trial_expires_after_reset_timeout():
+    breaker = CircuitBreaker("http://crdp:32082", failure_threshold=1, reset_timeout=0.05)
+    breaker.before_call()
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.before_call() is True  # trial that never reports back
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    time.sleep(0.06)
+    assert breaker.before_call() is True
+
+
+def test_open_breaker_fails_fast_without_calling_crdp():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(503, json={"error": "down"})
+
+    async def scenario():
+        client = _client(handler, breaker=CircuitBreaker("http://crdp:32082", failure_threshold=3, reset_timeout=60))
+        statuses = [(await client.protect_bulk(["1"])).status_code for _ in range(3)]
+        t0 = time.perf_counter()
+        with pytest.raises(CircuitOpenError):
+            await client.protect_bulk(["1"])
+        elapsed = time.perf_counter() - t0
+        await client.aclose()
+        return statuses, elapsed
+
+    statuses, elapsed = asyncio.run(scenario())
+    assert statuses == [503, 503, 503]
+    assert len(calls) == 3
+    assert elapsed < 0.01
+
+
+def test_post_retries_only_connection_failures_unless_unsafe():
+    attempts = {"n": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts["n"] += 1
+        if attempts["n"] <= 2:
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200, json={"protected_data": "T1"})
+
+    async def connect_failures():
+        client = _client(handler, retry=RetryPolicy(max_retries=3, base_delay=0.001))
+        resp = await client.post_json(client.protect_url, {"data": "1"})
+        await client.aclose()
+        return resp
+
+    assert asyncio.run(connect_failures()).is_success
+    assert attempts["n"] == 3
+
+    served = []
+
+    def unavailable(request: httpx.Request) -> httpx.Response:
+        served.append(request)
+        return httpx.Response(503)
+
+    async def server_errors(policy):
+        client = _client(unavailable, retry=policy)
+        resp = await client.post_json(client.protect_url, {"data": "1"})
+        await client.aclose()
+        return resp
+
+    asyncio.run(server_errors(RetryPolicy(max_retries=2, base_delay=0.001)))
+    assert len(served) == 1
+    asyncio.run(server_errors(RetryPolicy(max_retries=2, base_delay=0.001, retry_unsafe=True)))
+    assert len(served) == 4
+
+
+def test_backoff_is_jittered_and_capped():
+    policy = RetryPolicy(max_retries=10, base_delay=0.1, max_delay=0.4)
+    delays = [policy.delay(n, None, safe=True) for n in range(10)]
+    assert all(0 <= d <= 0.4 for d in delays)
+    assert policy.delay(10, None, safe=True) is None
+    assert policy.delay(0, 500, safe=True) is None
@@ -0,0 +1,162 @@
+"""Tests for the protect/reveal runner."""
+import json
+import random
+import threading
+import time
+
+from app.services.protect_reveal.client import APIResponse, BaseProtectRevealClient
+from app.services.protect_reveal.cli import Config
+from app.services.protect_reveal.load import ResultCollector, make_client, plan_lanes, run_load
+from app.services.protect_reveal.openloop import DEFAULT_OPEN_LOOP_CONCURRENCY, run_open_loop
+from app.services.protect_reveal.runner import iter_bulk_iteration, run_bulk_iteration
+from app.services.protect_reveal.sinks import open_sink
+from app.services.protect_reveal.summary import RunSummary
+
+
+class FakeClient(BaseProtectRevealClient):
+    """In-memory client: token = 'T' + value, with a small random delay per call."""
+
+    def __init__(self, delay: float = 0.0, fixed_delay: float = 0.0):
+        super().__init__("fake", 0, "P03")
+        self.delay = delay
+        self.fixed_delay = fixed_delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def _call(self, body):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                time.sleep(random.uniform(0, self.delay))
+            if self.fixed_delay:
+                time.sleep(self.fixed_delay)
+            return APIResponse(200, body)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def post_json(self, url, payload, trace=None):
+        if url == self.protect_url:
+            return self._call({"protected_data": f"T{payload['data']}"})
+        return self._call({"data": payload["protected_data"][1:]})
+
+    def close(self):
+        pass
+
+    def protect_bulk(self, items):
+        return self._call({"protected_data_array": [{"protected_data": f"T{x}"} for x in items]})
+
+    def reveal_bulk(self, protected_items, username=None):
+        return self._call({"data_array": [{"data": t[1:]} for t in protected_items]})
+
+
+def test_sequential_bulk_iteration():
+    inputs = [str(i) for i in range(10)]
+    results = run_bulk_iteration(FakeClient(), inputs, batch_size=4)
+    assert [len(r.inputs) for r in results] == [4, 4, 2]
+    assert all(all(r.matches) for r in results)
+
+
+def test_pipelined_bulk_iteration_preserves_order():
+    client = FakeClient(delay=0.01)
+    inputs = [str(i) for i in range(40)]
+    results = run_bulk_iteration(client, inputs, batch_size=5, pipeline_depth=4)
+    assert [x for r in results for x in r.inputs] == inputs
+    assert [x for r in results for x in r.restored_values] == inputs
+    assert 1 < client.max_in_flight <= 4
+
+
+def test_bulk_iteration_consumes_generator_lazily():
+    pulled = []
+
+    def values():
+        for i in range(7):
+            pulled.append(i)
+            yield str(i)
+
+    batches = iter_bulk_iteration(FakeClient(), values(), batch_size=3)
+    first = next(batches)
+    assert first.inputs == ["0", "1", "2"] and len(pulled) == 3
+    assert [r.inputs for r in batches] == [["3", "4", "5"], ["6"]]
+
+
+def test_plan_lanes_partitions_sequence_without_overlap():
+    lanes = plan_lanes("0000000098", 10, 3)
+    assert [(lane.start_data, lane.count) for lane in lanes] == [
+        ("0000000098", 4),
+        ("0000000102", 3),
+        ("0000000105", 3),
+    ]
+
+
+def test_concurrent_load_streams_results_into_summary(tmp_path):
+    client = FakeClient(delay=0.005)
+    out = tmp_path / "results.jsonl"
+    config = Config(start_data="1000", iterations=20, concurrency=4, output=str(out))
+    summary = RunSummary()
+    collector = ResultCollector(config, summary, open_sink(config.output, "jsonl"))
+    run_load(config, collector, client=client)
+    collector.close()
+
+    assert summary.attempted == summary.successful == summary.matched == 20
+    assert summary.histograms["protect"].count == 20
+    assert client.max_in_flight > 1
+    rows = [json.loads(line) for line in out.read_text().splitlines()]
+    assert sorted((r["index"], r["data"]) for r in rows) == [(i, str(1000 + i)) for i in range(20)]
+
+
+def test_concurrent_bulk_load_replays_input_file(tmp_path):
+    src = tmp_path / "values.txt"
+    src.write_text("".join(f"V{i:04d}\n" for i in range(23)))
+    config = Config(input_file=str(src), iterations=23, bulk=True, batch_size=4, concurrency=3)
+    summary = RunSummary()
+    seen = []
+    collector = ResultCollector(config, summary)
+    run_load(config, lambda i, r: (seen.extend(r.inputs), collector(i, r)), client=FakeClient())
+
+    assert summary.attempted == summary.matched == 23
+    assert sorted(seen) == [f"V{i:04d}" for i in range(23)]
+
+
+def test_open_loop_latency_includes_queueing_behind_schedule():
+    # 2 threads, each iteration takes ~40ms (two calls), requests scheduled every 10ms:
+    # later requests queue up, and that wait must show up as lag and latency
+    client = FakeClient(fixed_delay=0.02)
+    config = Config(start_data="1000", iterations=10, concurrency=2, rate=100)
+    collected = []
+    assert run_open_loop(client, config, lambda i, r: collected.append((i, r))) == 10
+    scheduled = [r for _, r in sorted(collected, key=lambda item: item[0])]
+    assert [s.result.data for s in scheduled] == [str(1000 + i) for i in range(10)]
+    assert [round(s.scheduled_s, 2) for s in scheduled] == [round(i * 0.01, 2) for i in range(10)]
+    assert scheduled[-1].lag_s > 0.05
+    assert scheduled[-1].latency_s >= scheduled[-1].lag_s + 0.04
+
+
+def test_open_loop_counts_raising_calls_and_sizes_the_pool_for_its_threads():
+    class Flaky(FakeClient):
+        def post_json(self, url, payload, trace=None):
+            if payload.get("data") == "1003":
+                raise RuntimeError("boom")
+            return super().post_json(url, payload, trace)
+
+    config = Config(start_data="1000", iterations=6, rate=1000)
+    summary = RunSummary()
+    assert run_open_loop(Flaky(), config, ResultCollector(config, summary)) == 6
+    assert summary.attempted == 6 and summary.successful == 5
+
+    client = make_client(config)
+    try:
+        assert client.session.get_adapter("http://crdp")._pool_maxsize == DEFAULT_OPEN_LOOP_CONCURRENCY
+    finally:
+        client.close()
+
+
+def test_lean_client_releases_successful_bodies():
+    client = FakeClient()
+    client.trace = False
+    results = run_bulk_iteration(client, ["1", "2"], batch_size=2)
+    assert results[0].restored_values == ["1", "2"]
+    assert results[0].protect_response.body is None and results[0].reveal_response.body is None
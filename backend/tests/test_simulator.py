@@ -0,0 +1,83 @@
+"""Tests for the bundled CRDP simulator."""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.services.protect_reveal.async_client import AsyncProtectRevealClient
+from app.services.protect_reveal.simulator import SimulatorConfig, Tokenizer, create_app, parse_latency
+
+
+def _client(config: SimulatorConfig, **kwargs) -> AsyncProtectRevealClient:
+    client = AsyncProtectRevealClient(host="sim", port=32082, policy="P03", **kwargs)
+    client.http = httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app(config)))
+    return client
+
+
+def test_tokenizer_is_deterministic_reversible_and_format_preserving():
+    tok = Tokenizer()
+    token = tok.protect("P03", "1234567890123")
+    assert token.isdigit() and len(token) == 13 and token != "1234567890123"
+    assert tok.protect("P03", "1234567890123") == token
+    assert tok.protect("P04", "1234567890123") != token
+    assert tok.reveal("P03", token) == "1234567890123"
+    assert tok.reveal("P03", tok.protect("P03", "홍길동 abc")) == "홍길동 abc"
+    with pytest.raises(ValueError):
+        tok.reveal("P03", "not-a-token")
+
+
+def test_client_round_trips_through_the_extract_helpers():
+    async def scenario():
+        client = _client(SimulatorConfig())
+        single = await client.protect("1234567890123")
+        token = client.extract_protected_from_protect_response(single)
+        revealed = await client.post_json(client.reveal_url, {"protection_policy_name": "P03", "protected_data": token})
+        bulk = await client.protect_bulk(["1", "22", "333"])
+        tokens = client.extract_protected_list_from_protect_response(bulk)
+        restored = await client.reveal_bulk(tokens, username="alice")
+        health = await client.healthz()
+        await client.aclose()
+        return client, revealed, restored, tokens, health
+
+    client, revealed, restored, tokens, health = asyncio.run(scenario())
+    assert client.extract_restored_from_reveal_response(revealed) == "1234567890123"
+    assert len(tokens) == 3
+    assert client.extract_restored_list_from_reveal_response(restored) == ["1", "22", "333"]
+    assert health.status_code == 200
+
+
+def test_limits_and_fault_injection():
+    async def scenario():
+        client = _client(SimulatorConfig(max_items=2, max_body_bytes=200, error_rate=1.0, policies="P03"))
+        too_many = await client.protect_bulk(["1", "2", "3"])
+        too_big = await client.protect_bulk(["x" * 300])
+        failed = await client.protect_bulk(["1"])
+        client.policy = "OTHER"
+        bad_policy = await client.protect("1")
+        await client.aclose()
+        return too_many, too_big, failed, bad_policy
+
+    too_many, too_big, failed, bad_policy = asyncio.run(scenario())
+    assert too_many.status_code == 400
+    assert too_big.status_code == 413
+    assert failed.status_code == 500
+    assert bad_policy.status_code == 400 and "OTHER" in bad_policy.body["message"]
+
+
+def test_latency_specs_and_throughput_cap():
+    assert parse_latency("fixed:5")() == 0.005
+    assert 0.002 <= parse_latency("uniform:2,4")() <= 0.004
+    with pytest.raises(ValueError):
+        parse_latency("gaussian:1")
+
+    async def scenario():
+        client = _client(SimulatorConfig(max_rps=100))
+        t0 = time.perf_counter()
+        await asyncio.gather(*(client.protect(str(i)) for i in range(6)))
+        elapsed = time.perf_counter() - t0
+        await client.aclose()
+        return elapsed
+
+    # six requests at 100/s need at least five 10 ms gaps
+    assert asyncio.run(scenario()) >= 0.045
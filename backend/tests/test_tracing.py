@@ -0,0 +1,60 @@
+"""Tests for request span timing and the Server-Timing header."""
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.tracing import RequestTrace, TracingMiddleware, _current, span
+from app.main import app
+
+
+def test_nested_spans_are_exclusive():
+    trace = RequestTrace("POST", "/x")
+    token = _current.set(trace)
+    try:
+        with span("upstream"):
+            time.sleep(0.02)
+            with span("parse"):
+                time.sleep(0.02)
+    finally:
+        _current.reset(token)
+    assert 0.015 < trace.spans["parse"] < 0.04
+    assert 0.015 < trace.spans["upstream"] < 0.04
+    stages = trace.finish()
+    assert stages["total"] >= stages["upstream"] + stages["parse"]
+
+
+def test_span_is_a_noop_without_a_trace():
+    with span("upstream"):
+        pass
+    assert _current.get() is None
+
+
+def test_bulk_route_reports_stage_timings():
+    with patch("app.api.routes.protect_reveal.get_client") as get_client:
+        upstream = MagicMock()
+        response = MagicMock(is_success=True, status_code=200, body={}, request_url=None, request_headers=None)
+        upstream.reveal_bulk = AsyncMock(return_value=response)
+        upstream.extract_restored_list_from_reveal_response.return_value = ["a", "b"]
+        get_client.return_value = upstream
+        resp = TestClient(app).post("/api/crdp/reveal-bulk", json={"protected_data_array": ["Ta", "Tb"]})
+
+    assert resp.status_code == 200
+    timing = dict(
+        (part.split(";dur=")[0].strip(), float(part.split(";dur=")[1]))
+        for part in resp.headers["server-timing"].split(",")
+    )
+    assert {"validate", "upstream", "parse", "serialize", "app", "total"} <= set(timing)
+    assert timing["total"] >= timing["upstream"]
+
+
+def test_unsampled_requests_have_no_header():
+    inner = FastAPI()
+
+    @inner.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    inner.add_middleware(TracingMiddleware, sample_rate=0.0)
+    assert "server-timing" not in TestClient(inner).get("/ping").headers
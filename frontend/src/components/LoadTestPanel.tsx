@@ -0,0 +1,196 @@
+import { useEffect, useRef, useState } from 'react';
+import api, { apiUrl } from '../lib/api';
+import type { AxiosError } from 'axios';
+
+// 백엔드 /api/crdp/jobs 스냅샷 (RunSummary.to_dict + 진행 정보)
+interface LatencyStats {
+  count: number;
+  mean_s: number;
+  p50_s: number;
+  p90_s: number;
+  p99_s: number;
+  max_s: number;
+}
+
+interface JobSnapshot {
+  id: string;
+  state: 'pending' | 'running' | 'completed' | 'cancelled' | 'failed';
+  error?: string | null;
+  progress: number;
+  iterations_attempted: number;
+  successful: number;
+  matched: number;
+  errors: number;
+  total_time_s: number;
+  throughput_per_s: number;
+  current_throughput_per_s: number;
+  latency: Record<string, LatencyStats>;
+  params: { bulk: boolean; iterations: number; batch_size: number; concurrency: number };
+}
+
+interface Target {
+  host: string;
+  port: string;
+  policy: string;
+}
+
+const ms = (s: number) => (s * 1000).toFixed(2);
+
+/** 백그라운드 부하 테스트: 작업 시작/취소, SSE로 실시간 처리량·지연 표시 */
+export function LoadTestPanel({ target }: { target: Target }) {
+  const [bulk, setBulk] = useState(false);
+  const [iterations, setIterations] = useState('1000');
+  const [batchSize, setBatchSize] = useState('25');
+  const [concurrency, setConcurrency] = useState('4');
+  const [job, setJob] = useState<JobSnapshot | null>(null);
+  const [error, setError] = useState<string | null>(null);
+  const source = useRef<EventSource | null>(null);
+
+  const closeStream = () => {
+    source.current?.close();
+    source.current = null;
+  };
+
+  // stop listening when the page unmounts; the job itself keeps running on the server
+  useEffect(() => closeStream, []);
+
+  const follow = (id: string) => {
+    closeStream();
+    const es = new EventSource(apiUrl(`/api/crdp/jobs/${id}/events`));
+    const update = (e: MessageEvent) => setJob(JSON.parse(e.data));
+    es.addEventListener('progress', update);
+    es.addEventListener('done', (e) => {
+      update(e as MessageEvent);
+      closeStream();
+    });
+    es.onerror = () => {
+      // the browser would reconnect forever; fall back to the last snapshot instead
+      closeStream();
+      setError('진행 스트림 연결이 끊어졌습니다.');
+    };
+    source.current = es;
+  };
+
+  const handleStart = async () => {
+    setError(null);
+    try {
+      const res = await api.post('/api/crdp/jobs', {
+        bulk,
+        iterations: parseInt(iterations, 10),
+        batch_size: parseInt(batchSize, 10),
+        concurrency: parseInt(concurrency, 10),
+        host: target.host,
+        port: parseInt(target.port, 10),
+        policy: target.policy,
+      });
+      setJob(res.data);
+      follow(res.data.id);
+    } catch (e: unknown) {
+      const err = e as AxiosError<{ detail?: unknown }>;
+      const detail = err.response?.data?.detail;
+      setError(typeof detail === 'string' ? detail : err.message);
+    }
+  };
+
+  const handleCancel = async () => {
+    if (!job) return;
+    try {
+      const res = await api.post(`/api/crdp/jobs/${job.id}/cancel`);
+      setJob(res.data);
+    } catch (e: unknown) {
+      setError((e as Error).message);
+    }
+  };
+
+  const running = job?.state === 'running' || job?.state === 'pending';
+
+  return (
+    <div className="card">
+      <div className="card-body">
+        <h2>⏱️ Load Test (부하 테스트)</h2>
+        <div className="form-row" style={{ marginBottom: 12 }}>
+          <div className="form-group" style={{ minWidth: 120 }}>
+            <label>모드</label>
+            <select value={bulk ? 'bulk' : 'single'} onChange={(e) => setBulk(e.target.value === 'bulk')}>
+              <option value="single">단건 protect/reveal</option>
+              <option value="bulk">Bulk</option>
+            </select>
+          </div>
+          <div className="form-group" style={{ width: 130 }}>
+            <label>반복 횟수</label>
+            <input type="number" min={1} value={iterations} onChange={(e) => setIterations(e.target.value)} />
+          </div>
+          {bulk && (
+            <div className="form-group" style={{ width: 110 }}>
+              <label>배치 크기</label>
+              <input type="number" min={1} value={batchSize} onChange={(e) => setBatchSize(e.target.value)} />
+            </div>
+          )}
+          <div className="form-group" style={{ width: 110 }}>
+            <label>동시성</label>
+            <input type="number" min={1} value={concurrency} onChange={(e) => setConcurrency(e.target.value)} />
+          </div>
+          <div className="spacer" />
+          <div className="actions">
+            <button onClick={handleStart} disabled={running} className="btn btn-primary">
+              {running ? '실행 중...' : '부하 테스트 시작'}
+            </button>
+            <button onClick={handleCancel} disabled={!running} className="btn btn-danger">
+              취소
+            </button>
+          </div>
+        </div>
+
+        {error && (
+          <div className="status-box status-err">
+            <span className="tag">Error</span> {error}
+          </div>
+        )}
+
+        {job && (
+          <div className={`status-box ${job.state === 'failed' || job.errors ? 'status-err' : 'status-ok'}`}>
+            <div className="row" style={{ marginBottom: 8 }}>
+              <span className="tag">{job.state}</span>
+              <progress value={job.progress} max={1} style={{ flex: 1 }} />
+              <span className="muted">
+                {job.iterations_attempted} / {job.params.iterations}
+              </span>
+            </div>
+            <div className="row" style={{ flexWrap: 'wrap', marginBottom: 8 }}>
+              <span>처리량 {job.throughput_per_s.toFixed(1)}/s</span>
+              {running && <span className="muted">(최근 {job.current_throughput_per_s.toFixed(1)}/s)</span>}
+              <span>일치 {job.matched}</span>
+              <span style={{ color: job.errors ? '#fca5a5' : undefined }}>오류 {job.errors}</span>
+              <span className="muted">{job.total_time_s.toFixed(1)}s</span>
+            </div>
+            {job.error && <div style={{ color: '#fca5a5' }}>{job.error}</div>}
+            <table className="code-box" style={{ width: '100%', textAlign: 'right' }}>
+              <thead>
+                <tr>
+                  <th style={{ textAlign: 'left' }}>단계</th>
+                  <th>n</th>
+                  <th>p50 ms</th>
+                  <th>p90 ms</th>
+                  <th>p99 ms</th>
+                  <th>max ms</th>
+                </tr>
+              </thead>
+              <tbody>
+                {Object.entries(job.latency).map(([phase, h]) => (
+                  <tr key={phase}>
+                    <td style={{ textAlign: 'left' }}>{phase}</td>
+                    <td>{h.count}</td>
+                    <td>{ms(h.p50_s)}</td>
+                    <td>{ms(h.p90_s)}</td>
+                    <td>{ms(h.p99_s)}</td>
+                    <td>{ms(h.max_s)}</td>
+                  </tr>
+                ))}
+              </tbody>
+            </table>
+          </div>
+        )}
+      </div>
+    </div>
+  );
+}
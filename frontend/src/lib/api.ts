@@ -15,4 +15,12 @@ api.interceptors.request.use((config) => {
   return config;
 });
 
+// The backend only echoes upstream debug details (URL, payload, response, headers)
+// when asked; pass this as request config where the page shows the progress log.
+export const withDebug = { headers: { 'X-CRDP-Debug': '1' } };
+
+// Absolute URL of a backend path, for clients that bypass axios (EventSource streams)
+export const apiUrl = (path: string) =>
+  `${config.apiBaseUrl.replace(/\/$/, '')}/${path.replace(/^\//, '')}`;
+
 export default api;
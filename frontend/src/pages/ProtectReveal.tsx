@@ -1,5 +1,6 @@
 import { useState } from 'react';
-import api from '../lib/api';
+import api, { withDebug } from '../lib/api';
+import { LoadTestPanel } from '../components/LoadTestPanel';
 import type { AxiosError } from 'axios';
 
 // ============================================================================
@@ -20,12 +21,23 @@ interface RevealResponse extends ApiResponse {
   data?: string;
 }
 
+// 일부 chunk만 실패하면 해당 항목은 null, 실패 chunk 목록은 errors에 담김
+interface BulkChunkError {
+  chunk: number;
+  offset: number;
+  count: number;
+  status_code?: number;
+  error: string;
+}
+
 interface BulkProtectResponse extends ApiResponse {
-  protected_data_array?: string[];
+  protected_data_array?: (string | null)[];
+  errors?: BulkChunkError[];
 }
 
 interface BulkRevealResponse extends ApiResponse {
-  data_array?: string[];
+  data_array?: (string | null)[];
+  errors?: BulkChunkError[];
 }
 
 type ProgressEntry =
@@ -168,7 +180,7 @@ function ArrayResultBox({
   statusCode,
 }: {
   label: string;
-  array?: string[];
+  array?: (string | null)[];
   error?: string;
   statusCode?: number;
 }) {
@@ -188,9 +200,9 @@ function ArrayResultBox({
             <span className="muted">{array.length}개</span>
           </div>
           <div className="code-box" style={{ maxHeight: 220, overflow: 'auto' }}>
-            {array.map((item: string, idx: number) => (
+            {array.map((item: string | null, idx: number) => (
               <div key={idx} style={{ padding: '4px 0' }}>
-                {idx + 1}. {item}
+                {idx + 1}. {item ?? <span style={{ color: '#fca5a5' }}>(실패)</span>}
               </div>
             ))}
           </div>
@@ -288,10 +300,14 @@ export function ProtectReveal() {
         },
       });
       addProgress('health', res.data);
-      const { status, crdp_api_host, crdp_api_port, protection_policy } = res.data || {};
+      const { status, crdp_api_host, crdp_api_port, protection_policy, nodes } = res.data || {};
+      // node pool: list each node's own status (overall status is 'degraded' when one is down)
+      const nodeSummary = Array.isArray(nodes)
+        ? `, nodes=${nodes.map((n: { endpoint: string; status: string }) => `${n.endpoint} ${n.status}`).join('; ')}`
+        : '';
       setHealthStatus({
         ok: String(status).toLowerCase() === 'healthy',
-        msg: `host=${crdp_api_host}, port=${crdp_api_port}, policy=${protection_policy}`,
+        msg: `host=${crdp_api_host}, port=${crdp_api_port}, policy=${protection_policy}${nodeSummary}`,
       });
     } catch (e: unknown) {
       const err = (e as any)?.message ?? 'health check failed';
@@ -318,7 +334,7 @@ export function ProtectReveal() {
         policy: config.policy,
         host: config.host,
         port: parseInt(config.port, 10),
-      });
+      }, withDebug);
       addProgress('protect', response.data?.debug);
       setProtectResult(response.data);
       if (response.data.protected_data) {
@@ -341,7 +357,7 @@ export function ProtectReveal() {
         policy: config.policy,
         host: config.host,
         port: parseInt(config.port, 10),
-      });
+      }, withDebug);
       addProgress('reveal', response.data?.debug);
       setRevealResult(response.data);
     } catch (error: unknown) {
@@ -366,11 +382,11 @@ export function ProtectReveal() {
         policy: config.policy,
         host: config.host,
         port: parseInt(config.port, 10),
-      });
+      }, withDebug);
       addProgress('protect_bulk', response.data?.debug);
       setBulkProtectResult(response.data);
       if (response.data?.protected_data_array && Array.isArray(response.data.protected_data_array)) {
-        setBulkRevealInput(response.data.protected_data_array.join('\n'));
+        setBulkRevealInput(response.data.protected_data_array.map((t: string | null) => t ?? '').join('\n'));
       }
     } catch (error: unknown) {
       const info = parseError(error);
@@ -394,7 +410,7 @@ export function ProtectReveal() {
         policy: config.policy,
         host: config.host,
         port: parseInt(config.port, 10),
-      });
+      }, withDebug);
       addProgress('reveal_bulk', response.data?.debug);
       setBulkRevealResult(response.data);
     } catch (error: unknown) {
@@ -542,6 +558,10 @@ export function ProtectReveal() {
           </div>
         </div>
 
+        <div style={{ marginTop: 24 }}>
+          <LoadTestPanel target={config} />
+        </div>
+
         <div style={{ marginTop: 24 }}>
           <h3>진행 로그 (Progress)</h3>
           <pre